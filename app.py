@@ -316,23 +316,25 @@ async def buy_multiple(orders=10):
         {"amount": 50, "asset": "GBPJPY_otc", "direction": "put", "duration": 60},
     ]
     check_connect, message = await client.connect()
-    for i in range(0, orders):
-        print("\n/", 80 * "=", "/", end="\n")
-        print(f"OPEND ORDER: {i + 1}")
-        order = random.choice(order_list)
-        print(order)
-        if check_connect:
-            # client.change_account("REAL")
+    if check_connect:
+        # client.change_account("REAL")
+        basket = []
+        for i in range(0, orders):
+            order = dict(random.choice(order_list))
             asset_name, asset_data = await client.get_available_asset(order['asset'], force_open=True)
-            print(asset_name, asset_data)
             if asset_data[2]:
-                print("OK: Asset is open.")
-                status, buy_info = await client.buy(**order)
-                print(status, buy_info)
+                order['asset'] = asset_name
+                basket.append(order)
             else:
-                print("ERRO: Asset is closed.")
-            print("Current Balance: ", await client.get_balance())
-            await asyncio.sleep(2)
+                print(f"ERRO: Asset {asset_name} is closed.")
+
+        results = await client.buy_many(basket)
+        for i, (order, (status, buy_info)) in enumerate(zip(basket, results)):
+            print("\n/", 80 * "=", "/", end="\n")
+            print(f"OPEND ORDER: {i + 1}")
+            print(order)
+            print(status, buy_info)
+        print("Current Balance: ", await client.get_balance())
 
     print("\n/", 80 * "=", "/", end="\n")
 
@@ -560,7 +562,8 @@ async def get_candles_all_asset():
                 print(asset_name, asset_data)
                 print("OK: Asset is open.")
                 end_from_time = time.time()
-                candles = await client.get_candles(asset, end_from_time, offset, period)
+                # Only the candles missing from the local store are requested
+                candles = await client.get_stored_candles(asset, end_from_time, offset, period)
                 print(candles)
             await asyncio.sleep(1)
 
@@ -0,0 +1,148 @@
+"""Micro-benchmark for the websocket message dispatcher.
+
+Replays a recorded mix of Quotex frames (mostly quote ticks, as seen while
+following a handful of assets) through the legacy ``on_message`` routing and
+through the table-driven dispatcher, and prints frames/sec for both.
+
+    python -m benchmarks.bench_dispatcher
+"""
+import json
+import time
+from quotexapi.api import QuotexAPI
+from quotexapi.ws.client import WebsocketClient
+
+ASSETS = ["EURUSD", "EURUSD_otc", "GBPUSD", "USDJPY_otc", "AUDCAD_otc"]
+QUOTES_HEADER = '451-["quotes/stream",{"_placeholder":true,"num":0}]'
+
+
+def recorded_frames(ticks=20000):
+    frames = []
+    for n in range(ticks):
+        asset = ASSETS[n % len(ASSETS)]
+        frames.append(QUOTES_HEADER)
+        frames.append(b"\x04" + json.dumps([[asset, 1700000000.123 + n, 1.08 + n * 1e-5, 0]]).encode())
+        if n % 50 == 0:
+            frames.append('451-["depth/change",{"_placeholder":true,"num":0}]')
+            frames.append(b"\x04" + json.dumps([[asset, 57]]).encode())
+        if n % 500 == 0:
+            frames.append('451-["s_orders/open",{"_placeholder":true,"num":0}]')
+            frames.append(b"\x04" + json.dumps({
+                "id": f"order-{n}",
+                "openPrice": 1.08,
+                "closeTimestamp": 1700000060,
+                "requestId": n,
+            }).encode())
+            frames.append("3")
+    return frames
+
+
+class StubSocket(object):
+
+    def send(self, data):
+        pass
+
+
+def legacy_on_message(api, message):
+    """The string-matching routing ``WebsocketClient.on_message`` used before."""
+    current_time = time.localtime()
+    if current_time.tm_sec in [0, 5, 10, 15, 20, 30, 40, 50]:
+        pass
+    try:
+        if "authorization/reject" in str(message):
+            api.state.check_rejected_connection = 1
+        elif "s_authorization" in str(message):
+            api.state.check_accepted_connection = 1
+            api.state.check_rejected_connection = 0
+        elif "instruments/list" in str(message):
+            api.state.started_listen_instruments = True
+
+        try:
+            message = message[1:].decode()
+            message = json.loads(message)
+            api.wss_message = message
+            if "call" in str(message) or 'put' in str(message):
+                api.instruments = message
+            if isinstance(message, dict):
+                if message.get("signals"):
+                    pass
+                elif message.get("liveBalance") or message.get("demoBalance"):
+                    api.account_balance = message
+                elif message.get("position"):
+                    api.top_list_leader = message
+                elif len(message) == 1 and message.get("profit", -1) > -1:
+                    api.profit_today = message
+                elif message.get("index"):
+                    api.historical_candles = message
+                if message.get("pending"):
+                    api.pending_successful = message
+                elif message.get("id") and not message.get("ticket"):
+                    api.buy_successful = message
+                    api.buy_id = message["id"]
+                elif message.get("ticket") and not message.get("id"):
+                    api.sold_options_respond = message
+                elif message.get("isDemo") and message.get("balance"):
+                    api.training_balance_edit_request = message
+                elif not message.get("list") == []:
+                    api.wss_message = message
+        except:
+            pass
+
+        if str(message) == "41":
+            api.state.check_websocket_if_connect = 0
+        if "51-" in str(message):
+            api.bench_temp_status = str(message)
+        elif len(message[0]) == 4:
+            result = {
+                "time": message[0][1],
+                "price": message[0][2]
+            }
+            api.realtime_price[message[0][0]].append(result)
+            api.realtime_candles = message[0]
+        elif len(message[0]) == 2:
+            for i in message:
+                api.realtime_sentiment[i[0]] = {
+                    "sentiment": {
+                        "sell": 100 - int(i[1]),
+                        "buy": int(i[1])
+                    }
+                }
+    except:
+        pass
+
+
+def new_api():
+    api = QuotexAPI("market-qx.pro", "user", "password", "en")
+    api.session_data = {"user_agent": "bench"}
+    return api
+
+
+def measure(handler, frames, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for frame in frames:
+            handler(frame)
+        best = min(best, time.perf_counter() - start)
+    return len(frames) / best
+
+
+def main():
+    frames = recorded_frames()
+
+    legacy_api = new_api()
+    for asset in ASSETS:
+        legacy_api.realtime_price[asset] = []
+    legacy = measure(lambda frame: legacy_on_message(legacy_api, frame), frames)
+
+    api = new_api()
+    client = WebsocketClient(api)
+    client.wss = StubSocket()
+    current = measure(lambda frame: client.on_message(None, frame), frames)
+
+    print(f"frames:     {len(frames)}")
+    print(f"legacy:     {legacy:,.0f} frames/sec")
+    print(f"dispatcher: {current:,.0f} frames/sec ({current / legacy:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
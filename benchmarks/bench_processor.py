@@ -0,0 +1,161 @@
+"""Benchmark for the vectorized candle processing utilities.
+
+Builds candles from 1M ticks with ``process_candles`` and
+``calculate_candles``, and merges 1M candles with ``merge_candles``, using
+the per-tick implementations they replaced and the NumPy ones. Reports
+whether both produce the same output.
+
+    python -m benchmarks.bench_processor
+"""
+import time
+import random
+from quotexapi.utils import processor
+from quotexapi.utils.services import group_by_period
+
+TICKS = 1000000
+PERIOD = 60
+
+
+class LegacyProcessor:
+    """The per-tick ``processor`` functions replaced by the NumPy ones."""
+
+    @staticmethod
+    def process_candles(history, period):
+        candles = []
+        current_candle = {
+            'open': None,
+            'high': float('-inf'),
+            'low': float('inf'),
+            'close': None,
+            'start_time': None,
+            'end_time': None,
+            'ticks': 0
+        }
+
+        start_time = None
+        timestamp = None
+        price = 0
+        for entry in history:
+            if isinstance(entry, dict):
+                timestamp = entry['time']
+                price = entry['price']
+            elif isinstance(entry, list):
+                timestamp, price, _ = entry
+            if start_time is None:
+                start_time = timestamp - (timestamp % period)
+
+            end_time = start_time + period
+            if timestamp >= end_time:
+
+                # Concluir a vela atual
+                candles.append(current_candle)
+
+                # Resetar para a próxima vela
+                start_time = timestamp - (timestamp % period)
+                current_candle = {
+                    'open': price,
+                    'high': price,
+                    'low': price,
+                    'close': price,
+                    'start_time': start_time,
+                    'end_time': start_time + period,
+                    'ticks': 1
+                }
+
+            else:
+                if current_candle['open'] is None:
+                    current_candle['open'] = price
+                current_candle['close'] = price
+                current_candle['high'] = max(current_candle['high'], price)
+                current_candle['low'] = min(current_candle['low'], price)
+                current_candle['end_time'] = end_time
+                current_candle['ticks'] += 1
+
+        # Adicionar a última vela se não estiver vazia
+        if current_candle['open'] is not None:
+            candles.append(current_candle)
+
+        return candles[:-1]
+
+    @staticmethod
+    def calculate_candles(history, period):
+        grouped = group_by_period(history, period)
+        candles = []
+        for minute, ticks in grouped.items():
+            open_price = ticks[0][1]
+            close_price = ticks[-1][1]
+            high_price = max(tick[1] for tick in ticks)
+            low_price = min(tick[1] for tick in ticks)
+            num_ticks = len(ticks)
+            candle = {
+                'time': minute * period,
+                'open': open_price,
+                'close': close_price,
+                'high': high_price,
+                'low': low_price,
+                'ticks': num_ticks
+            }
+            candles.append(candle)
+        candles = candles[:-1]
+
+        return candles
+
+    @staticmethod
+    def merge_candles(candles_data):
+        seen_times = set()
+        merged_list = []
+        for candle in candles_data:
+            if isinstance(candle, dict) and candle.get('time') not in seen_times:
+                seen_times.add(candle['time'])
+                merged_list.append(candle)
+        merged_list.sort(key=lambda x: x['time'])
+
+        return merged_list
+
+
+
+def random_ticks(size, seed=7):
+    rng = random.Random(seed)
+    ticks = []
+    timestamp, price = 1700000000.0, 1.08
+    for _ in range(size):
+        timestamp += rng.expovariate(4)
+        price = round(price * (1 + rng.gauss(0, 0.0002)), 5)
+        ticks.append([round(timestamp, 3), price, rng.choice((0, 1))])
+    return ticks
+
+
+def random_candles(size, seed=11):
+    rng = random.Random(seed)
+    return [
+        {"time": rng.randrange(size) * PERIOD, "open": 1.0, "close": 1.0, "high": 1.0, "low": 1.0}
+        for _ in range(size)
+    ]
+
+
+def measure(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    ticks = random_ticks(TICKS)
+    candles = random_candles(TICKS)
+    cases = {
+        "process_candles": (ticks, PERIOD),
+        "calculate_candles": (ticks, PERIOD),
+        "merge_candles": (candles,),
+    }
+    print(f"{'function':<20}{'items':>9}{'legacy ms':>12}{'numpy ms':>12}{'speedup':>10}  output")
+    for name, args in cases.items():
+        legacy, expected = measure(getattr(LegacyProcessor, name), *args)
+        current, result = measure(getattr(processor, name), *args)
+        print(
+            f"{name:<20}{len(args[0]):>9}{legacy * 1000:>12.1f}{current * 1000:>12.1f}"
+            f"{legacy / current:>9.1f}x  {'identical' if expected == result else 'changed'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
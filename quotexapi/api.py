@@ -11,7 +11,7 @@ import certifi
 import logging
 import platform
 import threading
-from . import global_value
+from .state import ConnectionState
 from .http.login import Login
 from .http.logout import Logout
 from .http.settings import Settings
@@ -25,7 +25,12 @@ from .ws.objects.timesync import TimeSync
 from .ws.objects.candles import Candles
 from .ws.objects.profile import Profile
 from .ws.objects.listinfodata import ListInfoData
+from .ws.objects.instruments import InstrumentCatalog
+from .ws.objects.ticks import TickBuffer, DEFAULT_CAPACITY
+from .ws.objects.aggregator import CandleAggregator
 from .ws.client import WebsocketClient
+from .ws.async_client import AsyncWebsocketClient
+from .ws.pending import PendingRequests
 from collections import defaultdict
 
 urllib3.disable_warnings()
@@ -52,26 +57,6 @@ def nested_dict(n, type):
 
 class QuotexAPI(object):
     """Class for communication with Quotex API."""
-    socket_option_opened = {}
-    buy_id = None
-    pending_id = None
-    trace_ws = False
-    buy_expiration = None
-    current_asset = None
-    current_period = None
-    buy_successful = None
-    pending_successful = None
-    account_balance = None
-    account_type = None
-    instruments = None
-    training_balance_edit_request = None
-    profit_in_operation = None
-    sold_options_respond = None
-    sold_digital_options_respond = None
-    listinfodata = ListInfoData()
-    timesync = TimeSync()
-    candles = Candles()
-    profile = Profile()
 
     def __init__(
             self,
@@ -81,7 +66,8 @@ class QuotexAPI(object):
             lang,
             proxies=None,
             resource_path=None,
-            user_data_dir="."
+            user_data_dir=".",
+            transport="thread"
     ):
         """
         :param str host: The hostname or ip address of a Quotex server.
@@ -90,18 +76,45 @@ class QuotexAPI(object):
         :param str lang: The lang of a Quotex platform.
         :param proxies: The proxies of a Quotex server.
         :param user_data_dir: The path browser user data dir.
+        :param str transport: The websocket transport, ``thread`` runs
+            websocket-client on a daemon thread, ``asyncio`` runs the
+            connection on the event loop.
         """
         self.host = host
+        self.state = ConnectionState()
+        self.socket_option_opened = {}
+        self.buy_id = None
+        self.pending_id = None
+        self.trace_ws = False
+        self.buy_expiration = None
+        self.current_asset = None
+        self.current_period = None
+        self.buy_successful = None
+        self.pending_successful = None
+        self.account_balance = None
+        self.account_type = None
+        self.instruments = None
+        self.instrument_catalog = InstrumentCatalog()
+        self.tick_tracer = None
+        self.training_balance_edit_request = None
+        self.profit_in_operation = None
+        self.sold_options_respond = None
+        self.sold_digital_options_respond = None
+        self.listinfodata = ListInfoData()
+        self.timesync = TimeSync()
+        self.candles = Candles()
+        self.profile = Profile()
         self.https_url = f"https://{host}"
         self.wss_url = f"wss://ws2.{host}/socket.io/?EIO=3&transport=websocket"
         self.wss_message = None
         self.websocket_thread = None
+        self.websocket_task = None
         self.websocket_client = None
+        self.transport = transport
         self.set_ssid = None
         self.object_id = None
         self.token_login2fa = None
         self.is_logged = False
-        self._temp_status = ""
         self.username = username
         self.password = password
         self.resource_path = resource_path
@@ -114,11 +127,18 @@ class QuotexAPI(object):
         self.historical_candles = {}
         self.candle_v2_data = {}
         self.realtime_price = {}
+        self.realtime_price_capacity = DEFAULT_CAPACITY
+        self.realtime_price_max_age = None
         self.realtime_price_data = []
         self.realtime_candles = {}
+        self.candle_aggregator = CandleAggregator()
         self.realtime_sentiment = {}
         self.top_list_leader = {}
         self.session_data = {}
+        self.pending = PendingRequests()
+        self.last_history_index = 0
+        self.last_request_id = 0
+        self.event_handlers = defaultdict(list)
         self.browser = Browser()
         self.browser.set_headers()
         self.settings = Settings(self)
@@ -131,8 +151,42 @@ class QuotexAPI(object):
         """
         return self.websocket_client.wss
 
+    def add_event_handler(self, event, handler):
+        """Register a handler for a websocket event.
+
+        Handlers survive reconnections and receive the decoded payload.
+
+        :param str event: The event name, e.g. ``quotes/stream``.
+        :param handler: A callable receiving the decoded payload.
+        """
+        self.event_handlers[event].append(handler)
+        if self.websocket_client:
+            self.websocket_client.dispatcher.register(event, handler)
+
+    def remove_event_handler(self, event, handler):
+        """Remove a handler added with :meth:`add_event_handler`."""
+        if handler in self.event_handlers.get(event, ()):
+            self.event_handlers[event].remove(handler)
+        if self.websocket_client:
+            self.websocket_client.dispatcher.unregister(event, handler)
+
+    def tick_buffer(self, asset):
+        """Get the realtime tick buffer of an asset, creating it if needed.
+
+        :param str asset: The asset name.
+        :returns: The instance of :class:`TickBuffer
+            <quotexapi.ws.objects.ticks.TickBuffer>`.
+        """
+        buffer = self.realtime_price.get(asset)
+        if not isinstance(buffer, TickBuffer):
+            buffer = self.realtime_price[asset] = TickBuffer(
+                self.realtime_price_capacity,
+                self.realtime_price_max_age
+            )
+        return buffer
+
     def subscribe_realtime_candle(self, asset, period):
-        self.realtime_price[asset] = []
+        self.tick_buffer(asset)
         payload = {
             "asset": asset,
             "period": period
@@ -165,6 +219,28 @@ class QuotexAPI(object):
             deal=5,
             percent_mode=False,
             percent_deal=1
+    ):
+        self.state.chart_settings = None
+        data = self.settings_store_data(
+            asset,
+            duration,
+            is_fast_option=is_fast_option,
+            end_time=end_time,
+            deal=deal,
+            percent_mode=percent_mode,
+            percent_deal=percent_deal
+        )
+        self.send_websocket_request(data)
+
+    @staticmethod
+    def settings_store_data(
+            asset,
+            duration,
+            is_fast_option=False,
+            end_time=None,
+            deal=5,
+            percent_mode=False,
+            percent_deal=1
     ):
         payload = {
             "chartId": "graph",
@@ -192,8 +268,7 @@ class QuotexAPI(object):
                 "downColor": "#FF6251"
             }
         }
-        data = f'42["settings/store",{json.dumps(payload)}]'
-        self.send_websocket_request(data)
+        return f'42["settings/store",{json.dumps(payload)}]'
 
     def unsubscribe_realtime_candle(self, asset):
         data = f'42["subfor", {json.dumps(asset)}]'
@@ -216,6 +291,29 @@ class QuotexAPI(object):
         data = f'42["account/change",{json.dumps(payload)}]'
         self.send_websocket_request(data)
 
+    def next_request_id(self):
+        """Return a unique ``requestId`` for an order.
+
+        The server echoes it in the ``orders/open`` response, which is how
+        concurrent orders get their own confirmation. Ids keep the
+        timestamp form and count up when several orders share a second.
+        """
+        request_id = max(int(time.time()), self.last_request_id + 1)
+        self.last_request_id = request_id
+        return request_id
+
+    def next_history_index(self):
+        """Return a unique index for a history request.
+
+        The server echoes the index in its ``history/load`` response, so
+        each concurrent request needs its own. Indexes are the timestamp
+        in seconds times 100, counting up within the same second, where
+        the client used to send the bare timestamp.
+        """
+        index = max(int(time.time()) * 100, self.last_history_index + 1)
+        self.last_history_index = index
+        return index
+
     def get_history_line(self, asset_id, index, end_from_time, offset):
         payload = {
             "id": asset_id,
@@ -418,18 +516,35 @@ class QuotexAPI(object):
         self.profile.offset = user_settings.get("data").get("timeOffset")
         return self.profile
 
+    def send_ping(self, probe=None):
+        """Send an Engine.IO ping, see :meth:`WebsocketClient.send_ping
+        <quotexapi.ws.client.WebsocketClient.send_ping>`.
+        """
+        return self.websocket_client.send_ping(probe)
+
     def send_websocket_request(self, data, no_force_send=True):
         """Send websocket request to Quotex server.
+
+        The request is queued without blocking and written by the single
+        writer of the websocket client.
+
         :param str data: The websocket request data.
-        :param bool no_force_send: Default None.
+        :param bool no_force_send: Kept for compatibility, ignored.
+        :returns: The instance of :class:`concurrent.futures.Future`
+            resolved once the request is written.
+        """
+        logger.debug(data)
+        return self.websocket_client.send(data)
+
+    def send_websocket_requests(self, data):
+        """Send a burst of websocket requests with as few writes as possible.
+
+        :param list data: The websocket requests data.
+        :returns: The instance of :class:`concurrent.futures.Future`
+            resolved once the requests are written.
         """
-        while (global_value.ssl_Mutual_exclusion
-               or global_value.ssl_Mutual_exclusion_write) and no_force_send:
-            pass
-        global_value.ssl_Mutual_exclusion_write = True
-        self.websocket.send(data)
         logger.debug(data)
-        global_value.ssl_Mutual_exclusion_write = False
+        return self.websocket_client.send_many(data)
 
     async def authenticate(self):
         print("Connecting User Account ...")
@@ -445,17 +560,21 @@ class QuotexAPI(object):
         if not status:
             sys.exit(1)
 
-        global_value.SSID = self.session_data.get("token")
+        self.state.SSID = self.session_data.get("token")
 
         self.is_logged = True
 
-    async def start_websocket(self):
-        global_value.check_websocket_if_connect = None
-        global_value.check_websocket_if_error = False
-        global_value.websocket_error_reason = None
-        if not global_value.SSID:
+    async def start_websocket(self, timeout=30):
+        self.state.reset_connection()
+        if not self.state.SSID:
             await self.authenticate()
-        self.websocket_client = WebsocketClient(self)
+        if self.websocket_client is not None:
+            # Stop the previous connection and its writer before replacing them
+            self.websocket_client.close()
+        if self.transport == "asyncio":
+            self.websocket_client = AsyncWebsocketClient(self)
+        else:
+            self.websocket_client = WebsocketClient(self)
         payload = {
             "ping_interval": 24,
             "ping_timeout": 20,
@@ -472,47 +591,62 @@ class QuotexAPI(object):
         }
         if platform.system() == "Linux":
             payload["sslopt"]["ssl_version"] = ssl.PROTOCOL_TLS
-        self.websocket_thread = threading.Thread(
-            target=self.websocket.run_forever,
-            kwargs=payload
-        )
-        self.websocket_thread.daemon = True
-        self.websocket_thread.start()
+        connection = self.pending.create("connection")
+        deadline = asyncio.get_running_loop().time() + timeout
+        if self.transport == "asyncio":
+            payload["sslopt"].pop("ssl_version", None)
+            self.websocket_task = asyncio.create_task(
+                self.websocket.run_forever(**payload)
+            )
+        else:
+            self.websocket_thread = threading.Thread(
+                target=self.websocket.run_forever,
+                kwargs=payload
+            )
+            self.websocket_thread.daemon = True
+            self.websocket_thread.start()
         while True:
-            if global_value.check_websocket_if_error:
-                return False, global_value.websocket_error_reason
-            elif global_value.check_websocket_if_connect == 0:
+            if self.state.check_websocket_if_error:
+                result = False, self.state.websocket_error_reason
+            elif self.state.check_websocket_if_connect == 0:
                 logger.debug("Websocket connection closed.")
-                return False, "Websocket connection closed."
-            elif global_value.check_websocket_if_connect == 1:
+                result = False, "Websocket connection closed."
+            elif self.state.check_websocket_if_connect == 1:
                 logger.debug("Websocket connected successfully!!!")
-                return True, "Websocket connected successfully!!!"
-            elif global_value.check_rejected_connection == 1:
-                global_value.SSID = None
+                result = True, "Websocket connected successfully!!!"
+            elif self.state.check_rejected_connection == 1:
+                self.state.SSID = None
                 logger.debug("Websocket Token Rejected.")
-                return True, "Websocket Token Rejected."
-
-    def send_ssid(self, timeout=10):
+                result = True, "Websocket Token Rejected."
+            else:
+                remaining = deadline - asyncio.get_running_loop().time()
+                try:
+                    await self.pending.wait("connection", connection, max(remaining, 0))
+                except asyncio.TimeoutError:
+                    logger.debug("Websocket connection timed out.")
+                    return False, "Websocket connection timed out."
+                connection = self.pending.create("connection")
+                continue
+            self.pending.discard("connection", connection)
+            return result
+
+    async def send_ssid(self, timeout=10):
         self.wss_message = None
-        if not global_value.SSID:
+        if not self.state.SSID:
             return False
 
-        self.ssid(global_value.SSID)
-        start_time = time.time()
-
-        while self.wss_message is None:
-            if time.time() - start_time > timeout:
-                return False
-            time.sleep(0.5)
-
-        return True
+        future = self.pending.create("authorization")
+        self.ssid(self.state.SSID)
+        try:
+            # True once authorized, False when the server rejects the SSID
+            return bool(await self.pending.wait("authorization", future, timeout))
+        except asyncio.TimeoutError:
+            return False
 
     async def connect(self, is_demo):
         """Method for connection to Quotex API."""
         self.account_type = is_demo
-        global_value.ssl_Mutual_exclusion = False
-        global_value.ssl_Mutual_exclusion_write = False
-        if global_value.check_websocket_if_connect:
+        if self.state.check_websocket_if_connect:
             logger.info("Closing websocket connection...")
             await self.close()
 
@@ -520,12 +654,12 @@ class QuotexAPI(object):
 
         if not check_websocket:
             return check_websocket, websocket_reason
-        check_ssid = self.send_ssid()
+        check_ssid = await self.send_ssid()
 
         if not check_ssid:
             await self.authenticate()
             if self.is_logged:
-                self.send_ssid()
+                await self.send_ssid()
 
         return check_websocket, websocket_reason
 
@@ -536,10 +670,15 @@ class QuotexAPI(object):
 
     async def close(self):
         if self.websocket_client:
-            self.websocket.close()
-            await asyncio.sleep(1)
-            self.websocket_thread.join()
+            self.websocket_client.close()
+            if self.websocket_task:
+                await asyncio.gather(self.websocket_task, return_exceptions=True)
+            else:
+                await asyncio.sleep(1)
+                self.websocket_thread.join()
         return True
 
     def websocket_alive(self):
+        if self.websocket_task:
+            return not self.websocket_task.done()
         return self.websocket_thread.is_alive()
@@ -0,0 +1,276 @@
+"""Module for Quotex columnar candles archive."""
+import os
+import json
+import logging
+import threading
+from pathlib import Path
+from urllib.parse import quote
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = (
+    ("time", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("ticks", "<i8"),
+)
+
+
+class ArchiveSeries(object):
+    """Class for the archived candles of one asset and period.
+
+    Every column is a file of fixed-width little-endian values, appended
+    to and read through :class:`numpy.memmap`. Each append becomes a
+    segment of rows sorted by time; ``index.json`` records the segments
+    as ``[first_time, last_time, first_row, rows]``. A time is stored
+    once: appended candles already archived are skipped, while those
+    filling a gap inside a segment become a segment of their own.
+
+    Reads that fall inside one segment are zero-copy views over the
+    files. Call :meth:`compact` after out-of-order appends, such as a
+    backfill, to rewrite the series as a single segment.
+    """
+
+    def __init__(self, path, asset, period):
+        """
+        :param path: The directory of the series.
+        :param str asset: The asset name.
+        :param int period: The candle size in seconds.
+        """
+        self.path = Path(path)
+        self.asset = asset
+        self.period = period
+        self.rows = 0
+        self.segments = []
+        self.maps = {}
+        self.__lock = threading.RLock()
+        self.load()
+
+    def load(self):
+        index = self.path / "index.json"
+        if not index.is_file():
+            return
+        data = json.loads(index.read_text())
+        self.rows = data["rows"]
+        self.segments = sorted(data["segments"])
+
+    def save(self):
+        data = {
+            "asset": self.asset,
+            "period": self.period,
+            "columns": COLUMNS,
+            "rows": self.rows,
+            "segments": self.segments
+        }
+        temporary = self.path / "index.tmp"
+        temporary.write_text(json.dumps(data))
+        os.replace(temporary, self.path / "index.json")
+
+    def column_path(self, name):
+        return self.path / f"{name}.bin"
+
+    def __len__(self):
+        return self.rows
+
+    def ranges(self):
+        """The ``(first_time, last_time)`` of every segment, oldest first."""
+        return [(first, last) for first, last, _, _ in self.segments]
+
+    def append(self, columns):
+        """Append candles given as columns.
+
+        :param dict columns: Arrays for ``time``, ``open``, ``high``,
+            ``low``, ``close`` and, optionally, ``ticks``.
+        :returns: The number of candles archived.
+        """
+        times = np.asarray(columns["time"], dtype=np.int64)
+        if not len(times):
+            return 0
+        order = np.argsort(times, kind="stable")
+        times = times[order]
+        keep = np.ones(len(times), dtype=bool)
+        # One value per candle: the last repeated one wins
+        keep[:-1] = times[1:] != times[:-1]
+        with self.__lock:
+            stored = self.column("time")
+            for first, last, row, count in self.segments:
+                low = int(np.searchsorted(times, first))
+                high = int(np.searchsorted(times, last, side="right"))
+                if low == high:
+                    continue
+                # Drop only the candles already archived, not the gaps of the segment
+                segment = stored[row:row + count]
+                candidates = times[low:high]
+                positions = np.minimum(np.searchsorted(segment, candidates), count - 1)
+                keep[low:high] &= segment[positions] != candidates
+            if not keep.any():
+                return 0
+            data = {}
+            for name, dtype in COLUMNS:
+                values = columns.get(name)
+                if values is None:
+                    values = np.zeros(len(order))
+                data[name] = np.asarray(values, dtype=dtype)[order][keep]
+            self.__write(data)
+            return len(data["time"])
+
+    def __write(self, data):
+        self.path.mkdir(exist_ok=True, parents=True)
+        count = len(data["time"])
+        for name, dtype in COLUMNS:
+            with open(self.column_path(name), "ab") as file:
+                # Drop rows written by an append that never reached the index
+                file.truncate(self.rows * np.dtype(dtype).itemsize)
+                file.write(data[name].tobytes())
+        times = data["time"]
+        # One segment per run that does not overlap the archived segments
+        cuts = [0]
+        for first, _, _, _ in self.segments:
+            position = int(np.searchsorted(times, first))
+            if 0 < position < count:
+                cuts.append(position)
+        cuts = sorted(set(cuts)) + [count]
+        for start, end in zip(cuts, cuts[1:]):
+            segment = [int(times[start]), int(times[end - 1]), self.rows + start, end - start]
+            if not self.__extend(segment):
+                self.segments.append(segment)
+            self.segments.sort()
+        self.rows += count
+        self.save()
+
+    def __extend(self, segment):
+        # Appends that continue the last segment without a gap, both in time
+        # and in the file, extend it, so reads stay views
+        first, last, row, count = segment
+        for previous in self.segments:
+            if previous[2] + previous[3] == row and previous[1] + self.period == first:
+                if any(previous[1] < other[0] <= last for other in self.segments):
+                    return False
+                previous[1] = last
+                previous[3] += count
+                return True
+        return False
+
+    def column(self, name):
+        """Memory map of a whole column, reopened when the series grows."""
+        with self.__lock:
+            cached = self.maps.get(name)
+            if cached is not None and cached[0] == self.rows:
+                return cached[1]
+            dtype = dict(COLUMNS)[name]
+            if self.rows:
+                values = np.memmap(self.column_path(name), dtype=dtype, mode="r", shape=(self.rows,))
+            else:
+                values = np.empty(0, dtype=dtype)
+            self.maps[name] = (self.rows, values)
+            return values
+
+    def read(self, start=None, end=None):
+        """Return the candles with ``start <= time < end`` as columns.
+
+        :param int start: (optional) The first candle time included.
+        :param int end: (optional) The candle time where the range stops.
+        :returns: A dict of arrays, read-only views over the files when
+            the range lies in one segment.
+        """
+        with self.__lock:
+            times = self.column("time")
+            slices = []
+            for first, last, row, count in self.segments:
+                if (end is not None and first >= end) or (start is not None and last < start):
+                    continue
+                segment = times[row:row + count]
+                low = 0 if start is None else int(np.searchsorted(segment, start))
+                high = count if end is None else int(np.searchsorted(segment, end))
+                if low < high:
+                    slices.append((row + low, row + high))
+            result = {}
+            for name, dtype in COLUMNS:
+                values = self.column(name)
+                if len(slices) == 1:
+                    result[name] = values[slices[0][0]:slices[0][1]]
+                elif slices:
+                    result[name] = np.concatenate([values[low:high] for low, high in slices])
+                else:
+                    result[name] = np.empty(0, dtype=dtype)
+            if len(slices) > 1 and np.any(np.diff(result["time"]) < 0):
+                # Segments filling gaps of others: sort by time
+                order = np.argsort(result["time"], kind="stable")
+                result = {name: values[order] for name, values in result.items()}
+            return result
+
+    def compact(self):
+        """Rewrite the series as one segment sorted by time."""
+        with self.__lock:
+            if len(self.segments) <= 1:
+                return
+            data = {name: np.array(values) for name, values in self.read().items()}
+            self.maps.clear()
+            for name, _ in COLUMNS:
+                temporary = self.path / f"{name}.tmp"
+                temporary.write_bytes(data[name].tobytes())
+                os.replace(temporary, self.column_path(name))
+            self.rows = len(data["time"])
+            self.segments = [[int(data["time"][0]), int(data["time"][-1]), 0, self.rows]] if self.rows else []
+            self.save()
+
+
+class CandleArchive(object):
+    """Class for a compact on-disk archive of candles per asset and period.
+
+    Each series lives in ``root_path/<asset>_<period>/``, see
+    :class:`ArchiveSeries` for the format.
+    """
+
+    def __init__(self, root_path="archive"):
+        """
+        :param root_path: The directory of the archive.
+        """
+        self.root_path = Path(root_path)
+        self.series = {}
+        self.__lock = threading.Lock()
+
+    def get(self, asset, period):
+        """Return the :class:`ArchiveSeries` of an asset and period."""
+        with self.__lock:
+            series = self.series.get((asset, period))
+            if series is None:
+                path = self.root_path / f"{quote(asset, safe='')}_{period}"
+                series = ArchiveSeries(path, asset, period)
+                self.series[(asset, period)] = series
+            return series
+
+    def append(self, asset, period, candles):
+        """Archive candle dicts with ``time``, ``open``, ``high``, ``low``,
+        ``close`` and optionally ``ticks``.
+
+        :returns: The number of candles archived.
+        """
+        if not candles:
+            return 0
+        columns = {
+            name: [candle.get(name, 0) for candle in candles]
+            for name, _ in COLUMNS
+        }
+        return self.get(asset, period).append(columns)
+
+    def append_columns(self, asset, period, columns):
+        """Archive candles given as columns, see :meth:`ArchiveSeries.append`."""
+        return self.get(asset, period).append(columns)
+
+    def read(self, asset, period, start=None, end=None):
+        """Return the candles of ``[start, end)`` as columns, see :meth:`ArchiveSeries.read`."""
+        return self.get(asset, period).read(start, end)
+
+    def ranges(self, asset, period):
+        return self.get(asset, period).ranges()
+
+    def compact(self, asset=None, period=None):
+        """Compact the series of an asset and period, by default all of them."""
+        for key, series in list(self.series.items()):
+            if (asset is None or key[0] == asset) and (period is None or key[1] == period):
+                series.compact()
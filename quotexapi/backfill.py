@@ -0,0 +1,145 @@
+"""Module for Quotex deep history backfill."""
+import time
+import asyncio
+import logging
+from collections import deque
+from .store import CandleStore
+from .utils.processor import normalize_candles, ticks_to_candles
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 3600
+DEFAULT_CONCURRENCY = 4
+FLUSH_EVERY = 10
+
+
+def page_candles(data, period):
+    """Convert the ``data`` of a history page into candles.
+
+    Pages hold either ticks (``[time, price, ...]`` or dicts with
+    ``price``) or candles in any layout of ``normalize_candles``.
+    """
+    if not data:
+        return []
+    first = data[0]
+    if isinstance(first, dict) and "price" in first:
+        return ticks_to_candles(data, period)
+    if isinstance(first, (list, tuple)) and len(first) < 5:
+        return ticks_to_candles(data, period)
+    return normalize_candles(data)
+
+
+class Backfill(object):
+    """Class to fill the candle store backward down to a start time.
+
+    The missing ranges of ``[start_time, end_time)`` are split into pages
+    aligned to the candle period and requested newest first with
+    ``history/load/line``, ``concurrency`` pages at a time. Each answered
+    page is merged into the store together with the range it covers, so
+    overlapping pages collapse into one candle per time and a run that
+    stopped halfway resumes from what was stored. A page the server
+    answers only partially is requested again for its older remainder.
+    """
+
+    def __init__(
+            self,
+            client,
+            asset,
+            start_time,
+            period=60,
+            end_time=None,
+            page_size=DEFAULT_PAGE_SIZE,
+            concurrency=DEFAULT_CONCURRENCY
+    ):
+        """
+        :param client: The instance of :class:`Quotex <quotexapi.stable_api.Quotex>`.
+        :param str asset: The asset name.
+        :param float start_time: The oldest time to reach.
+        :param int period: The candle size in seconds.
+        :param float end_time: (optional) Where the walk starts, now by default.
+        :param int page_size: Seconds of history requested per page.
+        :param int concurrency: Pages requested at the same time.
+        """
+        self.client = client
+        self.asset = asset
+        self.period = period
+        self.start = int(start_time // period * period)
+        end_time = time.time() if end_time is None else min(end_time, time.time())
+        self.end = int(end_time // period * period)
+        self.page_size = max(period, page_size // period * period)
+        self.concurrency = concurrency
+        self.pages = 0
+        self.candles = 0
+        self.failed = 0
+
+    @property
+    def store(self):
+        if self.client.candle_store is None:
+            self.client.candle_store = CandleStore(self.client.resource_path / "candles")
+        return self.client.candle_store
+
+    def plan(self):
+        """Return the pages still missing from the store, newest first."""
+        pages = deque()
+        for gap_start, gap_end in reversed(self.store.missing(self.asset, self.period, self.start, self.end)):
+            page_end = gap_end
+            while page_end > gap_start:
+                page_start = max(gap_start, page_end - self.page_size)
+                pages.append((page_start, page_end))
+                page_end = page_start
+        return pages
+
+    async def fetch(self, page):
+        page_start, page_end = page
+        message = await self.client.get_history_line(self.asset, page_end, page_end - page_start)
+        if message is None:
+            return page, None
+        candles = [
+            candle for candle in page_candles(message.get("data"), self.period)
+            if page_start <= candle["time"] < page_end
+        ]
+        return page, candles
+
+    def store_page(self, page, candles):
+        """Merge a page and return the older part it left uncovered, if any."""
+        page_start, page_end = page
+        covered_from = page_start
+        if candles and candles[0]["time"] > page_start + self.period:
+            # Partial page: the server cut the start of the range
+            covered_from = candles[0]["time"]
+        self.store.merge(self.asset, self.period, candles, covered_from, page_end, save=False)
+        self.client.archive_candles(self.asset, self.period, candles)
+        self.pages += 1
+        self.candles += len(candles)
+        if self.pages % FLUSH_EVERY == 0:
+            self.store.flush(self.asset, self.period)
+        if covered_from > page_start:
+            return page_start, covered_from
+        return None
+
+    async def run(self):
+        """Fill the store and return the number of candles written."""
+        if self.asset not in self.client.codes_asset:
+            await self.client.get_all_assets()
+        pages = self.plan()
+        running = set()
+        try:
+            while pages or running:
+                while pages and len(running) < self.concurrency:
+                    running.add(asyncio.ensure_future(self.fetch(pages.popleft())))
+                done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    page, candles = task.result()
+                    if candles is None:
+                        self.failed += 1
+                        logger.warning(f"No history for {self.asset} between {page[0]} and {page[1]}.")
+                        continue
+                    remainder = self.store_page(page, candles)
+                    if remainder is not None:
+                        pages.appendleft(remainder)
+        finally:
+            for task in running:
+                task.cancel()
+            self.store.flush(self.asset, self.period)
+        logger.debug(f"Backfill of {self.asset}: {self.pages} pages, {self.candles} candles.")
+        return self.candles
@@ -42,11 +42,12 @@ def resource_path(relative_path: str | Path) -> Path:
     return base_dir / relative_path
 
 
-def load_session(user_agent):
+def load_session(user_agent, root_path="."):
     output_file = Path(
         resource_path(
-            "session.json"
-        )
+            root_path
+        ),
+        "session.json"
     )
     if os.path.isfile(output_file):
         with open(output_file) as file:
@@ -73,11 +74,12 @@ def load_session(user_agent):
     return session_data
 
 
-def update_session(session_data):
+def update_session(session_data, root_path="."):
     output_file = Path(
         resource_path(
-            "session.json"
-        )
+            root_path
+        ),
+        "session.json"
     )
     session_result = json.dumps(session_data, indent=4)
     output_file.write_text(
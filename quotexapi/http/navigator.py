@@ -4,6 +4,7 @@ from niquests import Session
 from niquests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
+from ..metrics import metrics
 
 retry_strategy = Retry(
     total=3,
@@ -158,12 +159,17 @@ class Browser(Session):
         if self.proxies:
             kwargs['proxies'] = self.proxies
 
-        self.response = self.request(
-            method,
-            url,
-            headers=merged_headers,
-            **kwargs
-        )
+        try:
+            self.response = self.request(
+                method,
+                url,
+                headers=merged_headers,
+                **kwargs
+            )
+        except Exception:
+            metrics.inc("http_errors_total", method=method)
+            raise
+        metrics.inc("http_requests_total", method=method, status=self.response.status_code)
 
         if self.debug:
             logger.debug(f"→ {method} {url}")
@@ -0,0 +1,187 @@
+"""Module for Quotex shared market data."""
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription(object):
+    """Class for one consumer of a :class:`MarketDataHub` asset feed.
+
+    Ticks are handed to ``callback`` when one is given, otherwise they are
+    queued for ``async for tick in subscription``. Each tick is a dict with
+    ``asset``, ``time`` and ``price`` shared by every consumer, so it must
+    not be modified.
+    """
+
+    def __init__(self, hub, asset, period, callback=None, max_queue=1000):
+        """
+        :param hub: The instance of :class:`MarketDataHub`.
+        :param str asset: The asset name.
+        :param int period: The candle period requested for the asset.
+        :param callback: (optional) A callable receiving every tick.
+        :param int max_queue: Ticks kept for a slow iterator before the
+            oldest ones are dropped.
+        """
+        self.hub = hub
+        self.asset = asset
+        self.period = period
+        self.callback = callback
+        self.closed = False
+        self.queue = None
+        self.loop = None
+        if callback is None:
+            self.loop = asyncio.get_running_loop()
+            self.queue = asyncio.Queue(max_queue)
+
+    def deliver(self, tick):
+        if self.callback is not None:
+            self.hub.delivered(self.asset)
+            self.callback(tick)
+        elif threading.get_ident() == self.hub.loop_thread:
+            self.__put(tick)
+        else:
+            self.loop.call_soon_threadsafe(self.__put, tick)
+
+    def __put(self, tick):
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(tick)
+
+    def close(self):
+        """Leave the feed. The hub unsubscribes with the last consumer."""
+        if not self.closed:
+            self.closed = True
+            self.hub.unsubscribe(self)
+            if self.queue is not None:
+                self.loop.call_soon_threadsafe(self.queue.put_nowait, None)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.queue is None:
+            raise TypeError("Subscriptions with a callback are not iterable.")
+        tick = None if self.closed and self.queue.empty() else await self.queue.get()
+        if tick is None:
+            raise StopAsyncIteration
+        self.hub.delivered(self.asset)
+        return tick
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class MarketDataHub(object):
+    """Class to share one price feed between any number of consumers.
+
+    A single connection, the feed owner, subscribes each asset once; its
+    decoded ticks are fanned out to every :class:`Subscription` of the
+    asset. Subscriptions are reference counted, so the asset is
+    unsubscribed when its last consumer leaves.
+    """
+
+    def __init__(self, client=None):
+        """
+        :param client: (optional) The instance of :class:`Quotex
+            <quotexapi.stable_api.Quotex>` owning the feed.
+        """
+        self.client = None
+        self.api = None
+        self.loop_thread = None
+        self.consumers = defaultdict(list)
+        self.__lock = threading.Lock()
+        if client is not None:
+            self.attach(client)
+
+    def attach(self, client):
+        """Make ``client`` the feed owner and replay the subscriptions on it.
+
+        Also call it after the owner reconnected, since a new connection
+        starts without subscriptions.
+
+        :param client: The instance of :class:`Quotex <quotexapi.stable_api.Quotex>`.
+        """
+        if self.api is not None:
+            self.api.remove_event_handler("quotes/stream", self.on_quotes)
+        self.client = client
+        self.api = client.api
+        self.loop_thread = threading.get_ident()
+        if self.api is None:
+            return
+        self.api.add_event_handler("quotes/stream", self.on_quotes)
+        with self.__lock:
+            feeds = {asset: consumers[0].period for asset, consumers in self.consumers.items() if consumers}
+        for asset, period in feeds.items():
+            self.__follow(asset, period)
+
+    def refresh(self):
+        """Re-attach the owner if it replaced its connection."""
+        if self.client is not None and self.client.api is not self.api:
+            self.attach(self.client)
+
+    def subscribe(self, asset, callback=None, period=60, max_queue=1000):
+        """Add a consumer for the ticks of an asset.
+
+        :param str asset: The asset name, e.g. ``EURUSD_otc``.
+        :param callback: (optional) A callable receiving every tick. Without
+            it the subscription is an async iterator of ticks.
+        :param int period: The candle period sent with the subscription.
+        :param int max_queue: Queue size of an iterator subscription.
+        :returns: The instance of :class:`Subscription`.
+        """
+        subscription = Subscription(self, asset, period, callback, max_queue)
+        with self.__lock:
+            consumers = self.consumers[asset]
+            first = not consumers
+            consumers.append(subscription)
+        if first and self.api is not None:
+            self.__follow(asset, period)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Remove a consumer added with :meth:`subscribe`."""
+        with self.__lock:
+            consumers = self.consumers.get(subscription.asset)
+            if not consumers or subscription not in consumers:
+                return
+            consumers.remove(subscription)
+            last = not consumers
+            if last:
+                del self.consumers[subscription.asset]
+        if last and self.api is not None:
+            self.__unfollow(subscription.asset)
+
+    def delivered(self, asset):
+        """Tell the tick tracer of the owner, if any, that a tick reached a consumer."""
+        tracer = getattr(self.api, "tick_tracer", None)
+        if tracer is not None:
+            tracer.delivered(asset)
+
+    def refcount(self, asset):
+        """Number of consumers of an asset."""
+        return len(self.consumers.get(asset, ()))
+
+    def on_quotes(self, payload):
+        consumers = self.consumers
+        for asset, timestamp, price, *_ in payload:
+            subscriptions = consumers.get(asset)
+            if not subscriptions:
+                continue
+            tick = {"asset": asset, "time": timestamp, "price": price}
+            for subscription in tuple(subscriptions):
+                try:
+                    subscription.deliver(tick)
+                except Exception:
+                    logger.debug(f"Consumer of '{asset}' failed.", exc_info=True)
+
+    def __follow(self, asset, period):
+        self.client.acquire_stream(asset, period)
+
+    def __unfollow(self, asset):
+        self.client.release_stream(asset)
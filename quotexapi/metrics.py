@@ -0,0 +1,212 @@
+"""Module for Quotex runtime metrics."""
+import os
+import logging
+import threading
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "quotex"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DESCRIPTIONS = {
+    "ws_frames_total": ("counter", "Websocket frames received by event."),
+    "ws_decode_errors_total": ("counter", "Websocket frames that failed to parse or dispatch."),
+    "ws_handler_errors_total": ("counter", "Handler exceptions swallowed by event."),
+    "ws_connections_total": ("counter", "Websocket connections opened."),
+    "ws_disconnections_total": ("counter", "Websocket connections closed."),
+    "ws_errors_total": ("counter", "Websocket transport errors."),
+    "ws_writes_total": ("counter", "Socket writes of the outbound queue."),
+    "ws_messages_sent_total": ("counter", "Websocket messages written."),
+    "ws_write_errors_total": ("counter", "Failed socket writes."),
+    "reconnects_total": ("counter", "Reconnections attempted by the client."),
+    "orders_sent_total": ("counter", "Orders sent."),
+    "orders_acknowledged_total": ("counter", "Orders confirmed by the server."),
+    "orders_failed_total": ("counter", "Orders rejected or left unanswered."),
+    "http_requests_total": ("counter", "HTTP requests by method and status."),
+    "http_errors_total": ("counter", "HTTP requests that raised."),
+    "ws_outbox_depth": ("gauge", "Websocket messages waiting to be written."),
+    "pending_requests": ("gauge", "Requests waiting for their response."),
+}
+
+
+def escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class MetricsRegistry(object):
+    """Class for the counters and gauges of the library.
+
+    Counters are incremented in place by the websocket client, the HTTP
+    :class:`Browser <quotexapi.http.navigator.Browser>` and :class:`Quotex
+    <quotexapi.stable_api.Quotex>`; gauges such as queue depths are read
+    from collectors when exporting. Every update returns at once while the
+    registry is disabled, the default.
+
+    The registry is shared by every client of the process, so recording is
+    reference counted: it stays on from the first :meth:`acquire` until the
+    last :meth:`release`. Likewise the HTTP endpoint runs from the first
+    :meth:`serve` until as many :meth:`stop` calls.
+
+    :meth:`render` produces the Prometheus text format, which can be served
+    with :meth:`serve` or written with :meth:`write`.
+    """
+
+    def __init__(self, prefix=PREFIX, enabled=False):
+        """
+        :param str prefix: Prefix of every metric name.
+        :param bool enabled: Start recording right away.
+        """
+        self.prefix = prefix
+        self.enabled = enabled
+        self.values = {}
+        self.collectors = []
+        self.users = 0
+        self.server = None
+        self.server_users = 0
+        self.__lock = threading.Lock()
+        self.__server_lock = threading.Lock()
+
+    def acquire(self):
+        """Start recording, for one more user."""
+        with self.__lock:
+            self.users += 1
+            self.enabled = True
+
+    def release(self):
+        """Undo one :meth:`acquire`, recording stops with the last user."""
+        with self.__lock:
+            self.users = max(0, self.users - 1)
+            if not self.users:
+                self.enabled = False
+
+    def inc(self, name, value=1, **labels):
+        """Add ``value`` to a counter."""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self.__lock:
+            self.values[key] = self.values.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        """Set a gauge."""
+        if not self.enabled:
+            return
+        with self.__lock:
+            self.values[(name, tuple(sorted(labels.items())))] = value
+
+    def add_collector(self, collector):
+        """Call ``collector()`` on every export for ``(name, labels, value)`` samples.
+
+        Samples of the same name and labels from several collectors are added up.
+        """
+        if collector not in self.collectors:
+            self.collectors.append(collector)
+
+    def remove_collector(self, collector):
+        if collector in self.collectors:
+            self.collectors.remove(collector)
+
+    def reset(self):
+        with self.__lock:
+            self.values.clear()
+
+    def samples(self):
+        """Return the current value of every metric by ``(name, labels)``."""
+        with self.__lock:
+            values = dict(self.values)
+        for collector in tuple(self.collectors):
+            try:
+                samples = list(collector())
+            except Exception:
+                logger.debug(f"Metrics collector {collector!r} failed.", exc_info=True)
+                continue
+            for name, labels, value in samples:
+                key = (name, tuple(sorted(labels.items())))
+                values[key] = values.get(key, 0) + value
+        return values
+
+    def render(self):
+        """Return every metric in the Prometheus text exposition format."""
+        series = {}
+        for (name, labels), value in self.samples().items():
+            series.setdefault(name, []).append((labels, value))
+        lines = []
+        for name in sorted(series):
+            full_name = f"{self.prefix}_{name}"
+            kind, text = DESCRIPTIONS.get(name, ("untyped", ""))
+            if text:
+                lines.append(f"# HELP {full_name} {text}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            for labels, value in sorted(series[name]):
+                if labels:
+                    label_text = ",".join(f'{key}="{escape(label)}"' for key, label in labels)
+                    lines.append(f"{full_name}{{{label_text}}} {value}")
+                else:
+                    lines.append(f"{full_name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Write the metrics to a file, e.g. for the node_exporter textfile collector."""
+        path = Path(path)
+        path.parent.mkdir(exist_ok=True, parents=True)
+        temporary = path.with_suffix(".tmp")
+        temporary.write_text(self.render())
+        os.replace(temporary, path)
+
+    def serve(self, port=9464, host="127.0.0.1"):
+        """Serve the metrics over HTTP on ``/metrics`` from a daemon thread.
+
+        Calls while the endpoint runs return the running server, whatever
+        ``port`` they ask for, and must be matched by a :meth:`stop` too.
+
+        :param int port: The port to listen on, 0 for any free port.
+        :param str host: The interface to listen on, local only by default.
+        :returns: The instance of :class:`ThreadingHTTPServer <http.server.ThreadingHTTPServer>`.
+        """
+        with self.__server_lock:
+            if self.server is None:
+                self.server = self.__start(port, host)
+            self.server_users += 1
+            return self.server
+
+    def __start(self, port, host):
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        logger.info(f"Serving metrics on http://{host}:{server.server_port}/metrics")
+        return server
+
+    def stop(self):
+        """Undo one :meth:`serve`, the HTTP endpoint stops with the last one."""
+        with self.__server_lock:
+            if self.server is None:
+                return
+            self.server_users = max(0, self.server_users - 1)
+            if self.server_users:
+                return
+            server, self.server = self.server, None
+        server.shutdown()
+        server.server_close()
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,259 @@
+"""Module for Quotex multi-account connection pool."""
+import os
+import time
+import asyncio
+import logging
+from .market import MarketDataHub
+from .stable_api import Quotex
+
+logger = logging.getLogger(__name__)
+
+
+class PoolMember(object):
+    """Class for one account of a :class:`QuotexPool`."""
+
+    def __init__(self, key, client):
+        """
+        :param str key: The key the account is routed by.
+        :param client: The instance of :class:`Quotex <quotexapi.stable_api.Quotex>`.
+        """
+        self.key = key
+        self.client = client
+        self.connected = False
+        self.connecting = False
+        self.last_error = None
+        self.latency = None
+        self.last_seen = None
+        self.last_attempt = None
+        self.reconnects = 0
+        self.failures = 0
+
+    @property
+    def alive(self):
+        """Whether the websocket is running and the session was accepted."""
+        api = self.client.api
+        if api is None or api.websocket_client is None:
+            return False
+        return (
+            api.websocket_alive()
+            and api.state.check_websocket_if_connect == 1
+            and api.state.check_accepted_connection == 1
+        )
+
+    def health(self):
+        """Return a snapshot of the account health."""
+        return {
+            "connected": self.connected,
+            "latency": self.latency,
+            "last_seen": self.last_seen,
+            "last_error": self.last_error,
+            "reconnects": self.reconnects,
+            "failures": self.failures,
+        }
+
+
+class QuotexPool(object):
+    """Class to drive several Quotex accounts from one event loop.
+
+    Every account gets its own :class:`Quotex <quotexapi.stable_api.Quotex>`
+    client, session file and connection state. Members that drop are
+    reconnected in the background while the others keep trading. Price
+    feeds are shared through :attr:`market`, owned by one connected account.
+    """
+
+    def __init__(
+            self,
+            root_path="accounts",
+            transport="asyncio",
+            health_interval=30,
+            connect_timeout=60,
+            max_backoff=300
+    ):
+        """
+        :param str root_path: The directory holding one folder per account.
+        :param str transport: The websocket transport of the members.
+        :param float health_interval: Seconds between health checks.
+        :param float connect_timeout: Seconds allowed for one connection attempt.
+        :param float max_backoff: Maximum seconds between reconnection attempts.
+        """
+        self.root_path = root_path
+        self.transport = transport
+        self.health_interval = health_interval
+        self.connect_timeout = connect_timeout
+        self.max_backoff = max_backoff
+        self.members = {}
+        self.supervisor = None
+        self.market = MarketDataHub()
+
+    def add_account(self, key, email, password, **kwargs):
+        """Register an account. It connects on :meth:`start`.
+
+        :param str key: The key the account is routed by.
+        :param str email: The account email.
+        :param str password: The account password.
+        :param kwargs: Extra arguments for :class:`Quotex <quotexapi.stable_api.Quotex>`.
+        :returns: The instance of :class:`PoolMember`.
+        """
+        if key in self.members:
+            raise KeyError(f"Account '{key}' is already in the pool.")
+        account_path = os.path.join(self.root_path, str(key))
+        kwargs.setdefault("root_path", account_path)
+        kwargs.setdefault("user_data_dir", os.path.join(account_path, "browser"))
+        kwargs.setdefault("transport", self.transport)
+        client = Quotex(email=email, password=password, **kwargs)
+        member = PoolMember(key, client)
+        self.members[key] = member
+        return member
+
+    async def remove_account(self, key):
+        member = self.members.pop(key)
+        await self.__close_member(member)
+
+    def get(self, key):
+        """Return the client of an account.
+
+        :param str key: The account key.
+        :returns: The instance of :class:`Quotex <quotexapi.stable_api.Quotex>`.
+        """
+        return self.members[key].client
+
+    def __getitem__(self, key):
+        return self.get(key)
+
+    def __len__(self):
+        return len(self.members)
+
+    async def start(self):
+        """Connect every account and start the background supervisor.
+
+        :returns: A dict with the connection result of every account.
+        """
+        keys = list(self.members)
+        results = await asyncio.gather(
+            *(self.connect_member(self.members[key]) for key in keys)
+        )
+        self.update_market_owner()
+        if self.supervisor is None or self.supervisor.done():
+            self.supervisor = asyncio.create_task(self.supervise())
+        return dict(zip(keys, results))
+
+    async def connect_member(self, member):
+        """Connect one account without letting a failed login stop the pool.
+
+        :returns: A tuple ``(status, reason)``.
+        """
+        if member.connecting:
+            return False, "Connection already in progress."
+        member.connecting = True
+        member.last_attempt = time.time()
+        try:
+            async with asyncio.timeout(self.connect_timeout):
+                check, reason = await member.client.connect()
+        except (Exception, SystemExit) as error:
+            # Login failures call sys.exit(), which must not stop the other accounts.
+            check, reason = False, str(error) or type(error).__name__
+        finally:
+            member.connecting = False
+
+        member.connected = bool(check) and member.alive
+        if member.connected:
+            member.failures = 0
+            member.last_error = None
+            member.last_seen = time.time()
+        else:
+            member.failures += 1
+            member.last_error = reason
+            logger.warning(f"Account '{member.key}' failed to connect: {reason}")
+        return member.connected, reason
+
+    async def supervise(self):
+        """Check the members periodically and reconnect the failed ones."""
+        while True:
+            await asyncio.gather(
+                *(self.check_member(member) for member in list(self.members.values()))
+            )
+            self.update_market_owner()
+            await asyncio.sleep(self.health_interval)
+
+    async def check_member(self, member):
+        if member.connecting:
+            return
+        if member.connected and member.alive:
+            latency = await member.client.ping(self.health_interval)
+            if latency is not None:
+                member.latency = latency
+                member.last_seen = time.time()
+                return
+            member.last_error = "Ping timed out."
+        member.connected = False
+        backoff = min(self.max_backoff, self.health_interval * 2 ** max(member.failures - 1, 0))
+        if member.failures and time.time() - member.last_attempt < backoff:
+            return
+        logger.info(f"Reconnecting account '{member.key}'...")
+        member.reconnects += 1
+        await self.__close_member(member)
+        await self.connect_member(member)
+
+    def update_market_owner(self):
+        """Keep :attr:`market` fed by a connected account."""
+        for member in self.members.values():
+            if member.client is self.market.client and member.connected:
+                self.market.refresh()
+                return
+        for member in self.members.values():
+            if member.connected:
+                logger.info(f"Market data now follows account '{member.key}'.")
+                self.market.attach(member.client)
+                return
+
+    def health(self):
+        """Return the health of every account, keyed by account."""
+        return {key: member.health() for key, member in self.members.items()}
+
+    def require(self, key):
+        """Return the client of a connected account.
+
+        :raises ConnectionError: If the account is waiting for a reconnection.
+        """
+        member = self.members[key]
+        if not member.connected:
+            raise ConnectionError(f"Account '{key}' is not connected: {member.last_error}")
+        return member.client
+
+    async def buy(self, key, amount, asset, direction, duration, time_mode="TIME"):
+        """Place an order with the account registered under ``key``."""
+        return await self.require(key).buy(amount, asset, direction, duration, time_mode)
+
+    async def get_balance(self, key):
+        """Return the balance of the account registered under ``key``."""
+        return await self.require(key).get_balance()
+
+    async def check_win(self, key, id_number):
+        """Wait for the result of an order of the account registered under ``key``."""
+        return await self.require(key).check_win(id_number)
+
+    async def close(self):
+        """Stop the supervisor and close every connection."""
+        if self.supervisor is not None:
+            self.supervisor.cancel()
+            await asyncio.gather(self.supervisor, return_exceptions=True)
+            self.supervisor = None
+        await asyncio.gather(
+            *(self.__close_member(member) for member in self.members.values())
+        )
+
+    @staticmethod
+    async def __close_member(member):
+        member.connected = False
+        if member.client.api is not None:
+            try:
+                await member.client.close()
+            except Exception as error:
+                logger.debug(f"Failed to close account '{member.key}': {error}")
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
@@ -1,16 +1,20 @@
 import time
 import logging
 import asyncio
+import numpy as np
+from collections import deque
 from datetime import datetime
+from pathlib import Path
 from . import expiration
-from . import global_value
 from .api import QuotexAPI
+from .ws.objects.ticks import DEFAULT_CAPACITY
+from .ws.objects.aggregator import CandleAggregator
 from .utils.services import truncate
 from .utils.processor import (
     calculate_candles,
     process_candles_v2,
     merge_candles,
-    process_tick
+    normalize_candles
 )
 from .config import (
     load_session,
@@ -18,7 +22,15 @@ from .config import (
     resource_path,
     credentials
 )
-from .utils.indicators import TechnicalIndicators
+from .utils.indicators import TechnicalIndicators, BatchIndicators, stack_candles, readonly
+from .utils.streaming import create_indicator
+from .utils.cache import IndicatorCache
+from .ws.latency import LatencyTracker
+from .ws.tracing import TickTracer
+from .metrics import metrics
+from .store import CandleStore
+from .archive import CandleArchive
+from .backfill import Backfill, DEFAULT_PAGE_SIZE, DEFAULT_CONCURRENCY, page_candles
 
 logger = logging.getLogger(__name__)
 
@@ -34,7 +46,12 @@ class Quotex:
             root_path=".",
             user_data_dir="browser",
             asset_default="EURUSD",
-            period_default=60
+            period_default=60,
+            transport="thread",
+            candle_store=None,
+            candle_archive=None,
+            max_history_requests=8,
+            latency_log_interval=300
     ):
         self.size = [
             1,
@@ -60,11 +77,20 @@ class Quotex:
         self.user_data_dir = user_data_dir
         self.asset_default = asset_default
         self.period_default = period_default
+        self.transport = transport
         self.subscribe_candle = []
         self.subscribe_candle_all_size = []
         self.subscribe_mood = []
         self.account_is_demo = 1
         self.suspend = 0.2
+        self.response_timeout = 30
+        self.realtime_price_capacity = DEFAULT_CAPACITY
+        self.realtime_price_max_age = None
+        self.candle_aggregator = CandleAggregator()
+        self.indicator_cache = IndicatorCache()
+        self.candle_aggregator.add_listener(self.indicator_cache.on_candle_close)
+        self.realtime_candles = set()
+        self.__candle_requests = {}
         self.codes_asset = {}
         self.api = None
         self.duration = None
@@ -72,7 +98,22 @@ class Quotex:
         self.websocket_thread = None
         self.debug_ws_enable = False
         self.resource_path = resource_path(root_path)
-        session = load_session(user_agent)
+        if isinstance(candle_store, (str, Path)):
+            candle_store = CandleStore(self.resource_path / candle_store)
+        self.candle_store = candle_store
+        if isinstance(candle_archive, (str, Path)):
+            candle_archive = CandleArchive(self.resource_path / candle_archive)
+        self.candle_archive = candle_archive
+        self.max_history_requests = max_history_requests
+        self.history_semaphore = asyncio.Semaphore(max_history_requests)
+        self.latency = LatencyTracker()
+        self.latency_log_interval = latency_log_interval
+        self.latency_task = None
+        self.tick_tracer = None
+        self.metrics_enabled = False
+        self.metrics_serving = False
+        self.metrics_task = None
+        session = load_session(user_agent, self.resource_path)
         self.session_data = session
         if not email or not password:
             self.email, self.password = credentials()
@@ -84,10 +125,9 @@ class Quotex:
         """
         return self.websocket_client.wss
 
-    @staticmethod
-    async def check_connect():
+    async def check_connect(self):
         await asyncio.sleep(2)
-        if global_value.check_accepted_connection == 1:
+        if self.api and self.api.state.check_accepted_connection == 1:
             return True
 
         return False
@@ -98,7 +138,158 @@ class Quotex:
             "token": ssid,
             "user_agent": user_agent
         }
-        self.session_data = update_session(session)
+        self.session_data = update_session(session, self.resource_path)
+
+    async def wait_response(self, event: str, future, timeout: float = None):
+        """Wait for the response correlated with a websocket request.
+
+        Args:
+            event (str): Event name used to create the waiter.
+            future (asyncio.Future): Waiter returned by ``api.pending.create``.
+            timeout (float, optional): Seconds to wait. Defaults to ``response_timeout``.
+
+        Returns:
+            The response, or None if it did not arrive in time.
+        """
+        try:
+            return await self.api.pending.wait(event, future, timeout or self.response_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"No response for '{event}' after {timeout or self.response_timeout}s.")
+            return None
+
+    async def ping(self, timeout: float = None):
+        """Measure the round trip of an Engine.IO ping.
+
+        Args:
+            timeout (float, optional): Seconds to wait. Defaults to ``response_timeout``.
+
+        Returns:
+            The latency in seconds, or None if the server did not answer.
+        """
+        probe = object()
+        started = time.perf_counter()
+        future = self.api.pending.create("pong", probe)
+        self.api.send_ping(probe)
+        if await self.wait_response("pong", future, timeout) is None:
+            return None
+        return time.perf_counter() - started
+
+    def get_latency_stats(self, event: str = None):
+        """Latency between writing a request to the socket and its response, per event.
+
+        Args:
+            event (str, optional): The request event, e.g. ``orders/open``.
+                Defaults to every event seen.
+
+        Returns:
+            Dicts with ``count``, ``timeouts``, ``mean``, ``max``, ``p50``,
+            ``p95`` and ``p99`` in seconds, by event when ``event`` is None.
+        """
+        return self.latency.stats(event)
+
+    def enable_tick_tracing(self):
+        """Time every stage of the incoming ticks, see :class:`TickTracer <quotexapi.ws.tracing.TickTracer>`.
+
+        Returns:
+            The tracer, kept across reconnections until disabled.
+        """
+        if self.tick_tracer is None:
+            self.tick_tracer = TickTracer()
+        if self.api is not None:
+            self.api.tick_tracer = self.tick_tracer
+        return self.tick_tracer
+
+    def disable_tick_tracing(self):
+        self.tick_tracer = None
+        if self.api is not None:
+            self.api.tick_tracer = None
+
+    def get_tick_trace(self, stage: str = None):
+        """Latency of each stage of the incoming ticks.
+
+        Args:
+            stage (str, optional): ``server``, ``decode``, ``dispatch``,
+                ``store`` or ``delivery``. Defaults to every stage.
+
+        Returns:
+            The stats as in ``get_latency_stats``, or None when tracing is off.
+        """
+        if self.tick_tracer is None:
+            return None
+        return self.tick_tracer.stats(stage)
+
+    def enable_metrics(self, port: int = None, path: str = None, interval: float = 15):
+        """Record the library metrics and export them in the Prometheus text format.
+
+        Args:
+            port (int, optional): Serve them on ``http://127.0.0.1:<port>/metrics``.
+            path (str, optional): Write them to this file every ``interval`` seconds.
+            interval (float): Seconds between file writes.
+
+        The registry and its HTTP endpoint are shared by every client of the
+        process; they stay on until every client that enabled them calls
+        ``disable_metrics``.
+
+        Returns:
+            The instance of :class:`MetricsRegistry <quotexapi.metrics.MetricsRegistry>`.
+        """
+        if not self.metrics_enabled:
+            metrics.acquire()
+            metrics.add_collector(self.collect_metrics)
+            self.metrics_enabled = True
+        if port is not None and not self.metrics_serving:
+            metrics.serve(port)
+            self.metrics_serving = True
+        if path is not None:
+            if self.metrics_task is not None:
+                self.metrics_task.cancel()
+            self.metrics_task = asyncio.create_task(self.write_metrics(self.resource_path / path, interval))
+        return metrics
+
+    def disable_metrics(self):
+        """Release the metrics taken by ``enable_metrics`` for this client."""
+        if self.metrics_enabled:
+            metrics.remove_collector(self.collect_metrics)
+            metrics.release()
+            self.metrics_enabled = False
+        if self.metrics_serving:
+            metrics.stop()
+            self.metrics_serving = False
+        if self.metrics_task is not None:
+            self.metrics_task.cancel()
+            self.metrics_task = None
+
+    def get_metrics(self):
+        """The metrics in the Prometheus text format."""
+        return metrics.render()
+
+    def collect_metrics(self):
+        """Queue depths of this client, read on every metrics export."""
+        if self.api is None:
+            return []
+        samples = [("pending_requests", {}, len(self.api.pending))]
+        outbox = getattr(self.api.websocket_client, "outbox", None)
+        if outbox is not None:
+            samples.append(("ws_outbox_depth", {}, outbox.depth))
+        return samples
+
+    async def write_metrics(self, path, interval: float):
+        while True:
+            try:
+                await asyncio.to_thread(metrics.write, path)
+            except OSError as error:
+                logger.warning(f"Could not write metrics to {path}: {error}")
+            await asyncio.sleep(interval)
+
+    async def log_latency(self, interval: float):
+        """Log the latency percentiles of every event each ``interval`` seconds."""
+        while True:
+            await asyncio.sleep(interval)
+            summary = self.latency.summary()
+            if summary:
+                logger.info(f"Request latency (ms): {summary}")
+            if self.tick_tracer is not None:
+                logger.info(f"Tick latency (ms): {self.tick_tracer.summary()}")
 
     async def re_subscribe_stream(self):
         try:
@@ -119,13 +310,17 @@ class Quotex:
             pass
 
     async def get_instruments(self):
-        while self.check_connect and self.api.instruments is None:
-            await asyncio.sleep(0.2)
+        if self.api.instruments is None:
+            future = self.api.pending.create("instruments/list")
+            if self.api.instruments is None:
+                await self.wait_response("instruments/list", future)
+            else:
+                self.api.pending.discard("instruments/list", future)
         return self.api.instruments or []
 
     def get_all_asset_name(self):
         if self.api.instruments:
-            return [[i[1], i[2].replace("\n", "")] for i in self.api.instruments]
+            return [[i.symbol, i.name] for i in self.api.instrument_catalog]
 
     async def get_available_asset(self, asset_name: str, force_open: bool = False):
         _, asset_open = await self.check_asset_open(asset_name)
@@ -138,96 +333,231 @@ class Quotex:
         return asset_name, asset_open
 
     async def check_asset_open(self, asset_name: str):
-        instruments = await self.get_instruments()
-        for i in instruments:
-            if asset_name == i[1]:
-                self.api.current_asset = asset_name
-                return i, (i[0], i[2].replace("\n", ""), i[14])
+        await self.get_instruments()
+        instrument = self.api.instrument_catalog.get(asset_name)
+        if instrument is not None:
+            self.api.current_asset = asset_name
+            return instrument.raw, (instrument.id, instrument.name, instrument.is_open)
 
         return [None, [None, None, None]]
 
     async def get_all_assets(self):
-        instruments = await self.get_instruments()
-        for i in instruments:
-            if i[0] != "":
-                self.codes_asset[i[1]] = i[0]
-
+        await self.get_instruments()
+        self.codes_asset.update(self.api.instrument_catalog.codes())
         return self.codes_asset
 
     async def get_candles(self, asset, end_from_time, offset, period, progressive=False):
+        """Get the candles of a time window.
+
+        Args:
+            asset (str): The asset name.
+            end_from_time (float): The end of the window. Defaults to now.
+            offset (int): The size of the window in seconds.
+            period (int): The candle size in seconds.
+            progressive (bool, optional): Return the raw ``data`` of the
+                ``history/load`` response. Defaults to False.
+
+        Returns:
+            list: Unless ``progressive``, the closed candles of the window as
+            dicts with ``time``, ``open``, ``close``, ``high``, ``low`` and
+            ``ticks``, oldest first and one per time, like ``prepare_candles``.
+        """
         if end_from_time is None:
             end_from_time = time.time()
-        index = expiration.get_timestamp()
-        self.api.candles.candles_data = None
-        self.start_candles_stream(asset, period)
-        self.api.get_candles(asset, index, end_from_time, offset, period)
-        while True:
-            while self.check_connect and self.api.candles.candles_data is None:
-                await asyncio.sleep(0.1)
-            if self.api.candles.candles_data is not None:
-                break
-
-        candles = self.prepare_candles(asset, period)
+        if self.candle_store is not None and not progressive:
+            return await self.get_stored_candles(asset, end_from_time, offset, period)
         if progressive:
-            return self.api.historical_candles.get("data", {})
+            self.start_candles_stream(asset, period)
+            historical_candles = await self.request_history(asset, end_from_time, offset, period)
+            candles = (historical_candles or {}).get("data", {})
+            self.archive_candles(asset, period, candles)
+            return candles
 
+        self.start_candles_stream(asset, period)
+        # Matched by index, so every call gets the response for its own window
+        message = await self.request_history(asset, end_from_time, offset, period)
+        if message is None:
+            return []
+
+        # Same candles as prepare_candles built from the ticks: closed only
+        end = int(min(end_from_time, time.time()) // period * period)
+        candles = [
+            candle for candle in merge_candles(page_candles(message.get("data"), period))
+            if candle["time"] < end
+        ]
+        self.archive_candles(asset, period, candles)
         return candles
 
+    async def get_stored_candles(self, asset, end_from_time, offset, period):
+        """Get the closed candles of a time window through the candle store.
+
+        Only the ranges of the window missing from the store are requested,
+        so repeated calls and restarts reuse the candles already fetched.
+        The candle in progress is never stored nor returned. Without a
+        ``candle_store`` one is created under ``root_path/candles``.
+
+        Args:
+            asset (str): The asset name.
+            end_from_time (float): The end of the window.
+            offset (int): The size of the window in seconds.
+            period (int): The candle size in seconds.
+
+        Returns:
+            list: The candles of the window, oldest first.
+        """
+        if self.candle_store is None:
+            self.candle_store = CandleStore(self.resource_path / "candles")
+        store = self.candle_store
+        end = int(min(end_from_time, time.time()) // period * period)
+        start = int((end_from_time - offset) // period * period)
+        missing = deque(store.missing(asset, period, start, end))
+        if missing:
+            self.start_candles_stream(asset, period)
+        while missing:
+            gap_start, gap_end = missing.popleft()
+            message = await self.request_history(asset, gap_end, gap_end - gap_start, period)
+            if message is None:
+                # No response: the range is requested again on the next call
+                continue
+            candles = [
+                candle for candle in normalize_candles(message.get("data"))
+                if gap_start <= candle["time"] < gap_end
+            ]
+            covered_from = gap_start
+            first = min((candle["time"] for candle in candles), default=gap_start)
+            if first > gap_start + period:
+                # Partial response: cover only what came back and request the rest
+                covered_from = first
+                missing.appendleft((gap_start, covered_from))
+            store.merge(asset, period, candles, covered_from, gap_end)
+            self.archive_candles(asset, period, candles)
+        return store.candles(asset, period, start, end)
+
+    async def request_history(self, asset, end_from_time, offset, period):
+        """Send a ``history/load`` request and wait for its own response.
+
+        Each request gets a unique index, so any number of them can share
+        the socket; at most ``max_history_requests`` are in flight at once.
+
+        Returns:
+            dict: The ``history/load`` response, or None if it did not arrive in time.
+        """
+        async with self.history_semaphore:
+            index = self.api.next_history_index()
+            future = self.api.pending.create("history/load", index)
+            self.api.get_candles(asset, index, end_from_time, offset, period)
+            return await self.wait_response("history/load", future)
+
+    def archive_candles(self, asset, period, candles):
+        """Write the closed candles into ``candle_archive``, when there is one.
+
+        Args:
+            asset (str): The asset name.
+            period (int): The candle size in seconds.
+            candles (list): Candles of any layout accepted by ``normalize_candles``.
+
+        Returns:
+            int: The number of candles archived.
+        """
+        if self.candle_archive is None or not candles:
+            return 0
+        closed = int(time.time() // period * period)
+        candles = [candle for candle in normalize_candles(candles) if candle["time"] < closed]
+        return self.candle_archive.append(asset, period, candles)
+
     async def get_history_line(self, asset, end_from_time, offset):
         if end_from_time is None:
             end_from_time = time.time()
-        index = expiration.get_timestamp()
         self.api.current_asset = asset
-        self.api.historical_candles = None
         self.start_candles_stream(asset)
-        self.api.get_history_line(self.codes_asset[asset], index, end_from_time, offset)
-        while True:
-            while self.check_connect and self.api.historical_candles is None:
-                await asyncio.sleep(0.2)
-            if self.api.historical_candles is not None:
-                break
-        return self.api.historical_candles
+        async with self.history_semaphore:
+            index = self.api.next_history_index()
+            future = self.api.pending.create("history/load", index)
+            self.api.get_history_line(self.codes_asset[asset], index, end_from_time, offset)
+            return await self.wait_response("history/load", future)
+
+    async def backfill(
+            self,
+            asset: str,
+            start_time: float,
+            period: int = 60,
+            end_time: float = None,
+            page_size: int = DEFAULT_PAGE_SIZE,
+            concurrency: int = DEFAULT_CONCURRENCY
+    ):
+        """Fill the candle store with the history of an asset back to ``start_time``.
+
+        Walks backward through ``history/load/line`` pages, several at a
+        time, and resumes from the ranges already stored. See
+        :class:`Backfill <quotexapi.backfill.Backfill>`.
+
+        Args:
+            asset (str): The asset name.
+            start_time (float): The oldest time to reach.
+            period (int, optional): The candle size in seconds. Defaults to 60.
+            end_time (float, optional): Where the walk starts. Defaults to now.
+            page_size (int, optional): Seconds of history per page.
+            concurrency (int, optional): Pages requested at the same time.
+
+        Returns:
+            int: The number of candles written.
+        """
+        return await Backfill(self, asset, start_time, period, end_time, page_size, concurrency).run()
 
     async def get_candle_v2(self, asset, period):
-        self.api.candle_v2_data[asset] = None
+        future = self.api.pending.create("history/list/v2", asset)
         self.start_candles_stream(asset, period)
-        while self.api.candle_v2_data[asset] is None:
-            await asyncio.sleep(0.2)
-        candles = self.prepare_candles(asset, period)
+        message = await self.wait_response("history/list/v2", future)
+        if message is None:
+            return []
+        candles = self.prepare_candles(asset, period, message["history"])
+        self.archive_candles(asset, period, candles)
         return candles
 
-    def prepare_candles(self, asset: str, period: int):
+    def prepare_candles(self, asset: str, period: int, history: list = None):
         """
         Prepare candles data for a specified asset.
 
         Args:
             asset (str): Asset name.
             period (int): Period for fetching candles.
+            history (list, optional): Tick history of the asset. Defaults to the
+                last history received for the current asset.
 
         Returns:
             list: List of prepared candles data.
         """
-        candles_data = calculate_candles(self.api.candles.candles_data, period)
+        if history is None:
+            history = self.api.candles.candles_data
+        candles_data = calculate_candles(history, period)
         candles_v2_data = process_candles_v2(self.api.candle_v2_data, asset, candles_data)
         new_candles = merge_candles(candles_v2_data)
 
         return new_candles
 
     async def connect(self):
+        if self.api is not None:
+            # Stop the previous client, or every retry leaves a socket reconnecting
+            await self.close()
         self.api = QuotexAPI(
             "market-qx.pro",
             self.email,
             self.password,
             self.lang,
             resource_path=self.resource_path,
-            user_data_dir=self.user_data_dir
+            user_data_dir=self.user_data_dir,
+            transport=self.transport
         )
-        await self.close()
         self.api.trace_ws = self.debug_ws_enable
         self.api.session_data = self.session_data
         self.api.current_asset = self.asset_default
         self.api.current_period = self.period_default
-        global_value.SSID = self.session_data.get("token")
+        self.api.realtime_price_capacity = self.realtime_price_capacity
+        self.api.realtime_price_max_age = self.realtime_price_max_age
+        self.api.candle_aggregator = self.candle_aggregator
+        self.api.pending.latency = self.latency
+        self.api.tick_tracer = self.tick_tracer
+        self.api.state.SSID = self.session_data.get("token")
 
         if not self.session_data.get("token"):
             await self.api.authenticate()
@@ -236,11 +566,16 @@ class Quotex:
 
         if not await self.check_connect():
             logger.debug("Reconnecting on websocket")
+            metrics.inc("reconnects_total")
             return await self.connect()
 
+        if self.latency_log_interval and (self.latency_task is None or self.latency_task.done()):
+            self.latency_task = asyncio.create_task(self.log_latency(self.latency_log_interval))
+
         return check, reason
 
     async def reconnect(self):
+        metrics.inc("reconnects_total")
         await self.api.authenticate()
 
     def set_account_mode(self, balance_mode="PRACTICE"):
@@ -262,15 +597,19 @@ class Quotex:
         return self.api.change_time_offset(time_offset)
 
     async def edit_practice_balance(self, amount=None):
-        self.api.training_balance_edit_request = None
+        future = self.api.pending.create("demo/refill")
         self.api.edit_training_balance(amount)
-        while self.api.training_balance_edit_request is None:
-            await asyncio.sleep(0.2)
-        return self.api.training_balance_edit_request
+        return await self.wait_response("demo/refill", future)
 
     async def get_balance(self):
-        while self.api.account_balance is None:
-            await asyncio.sleep(0.2)
+        if self.api.account_balance is None:
+            future = self.api.pending.create("balance")
+            if self.api.account_balance is None:
+                await self.wait_response("balance", future)
+            else:
+                self.api.pending.discard("balance", future)
+        if self.api.account_balance is None:
+            return None
         balance = self.api.account_balance.get("demoBalance") \
             if self.api.account_type > 0 else self.api.account_balance.get("liveBalance")
         return float(f"{truncate(balance + self.get_profit(), 2):.2f}")
@@ -282,11 +621,15 @@ class Quotex:
             indicator: str,
             params: dict = None,
             history_size: int = 3600,
-            timeframe: int = 60
+            timeframe: int = 60,
+            as_array: bool = False
     ) -> dict:
         """
         Calcula indicadores técnicos para un activo dado
 
+        Los resultados se guardan en indicator_cache hasta que cierra la vela
+        en curso; son compartidos y no deben modificarse.
+
         Args:
             asset (str): Nombre del activo (ej: "EURUSD")
             indicator (str): Nombre del indicador
@@ -301,6 +644,8 @@ class Quotex:
                 - 7200: 2 horas
                 - 14400: 4 horas
                 - 86400: 1 día
+            as_array (bool): Devuelve arrays float64 de solo lectura sin
+                redondear en lugar de listas redondeadas a 2 decimales
         """
         # Validar timeframe
         valid_timeframes = [60, 300, 900, 1800, 3600, 7200, 14400, 86400]
@@ -310,19 +655,126 @@ class Quotex:
         # Ajustar history_size para asegurar suficientes velas según el timeframe
         adjusted_history = max(history_size, timeframe * 50)  # Asegurar al menos 50 velas
 
-        candles = await self.get_candles(asset, time.time(), adjusted_history, timeframe)
+        indicator = indicator.upper()
+        params = params or {}
+        cache = self.indicator_cache
+        key = cache.key(asset, timeframe, indicator, params, (adjusted_history, as_array))
+        result = cache.get(key)
+        if result is not None:
+            return result
+
+        candles = await self.get_indicator_candles(asset, timeframe, adjusted_history)
 
         if not candles:
             return {"error": f"No hay datos disponibles para el activo {asset}"}
 
+        if as_array:
+            columns = stack_candles({asset: candles})
+            try:
+                result = BatchIndicators.calculate(
+                    indicator, [asset], columns["close"], columns["high"], columns["low"], params, as_array=True
+                )[asset]
+            except Exception as e:
+                return {"error": f"Error calculando el indicador: {str(e)}"}
+            size = max(len(values) for values in result.values() if isinstance(values, np.ndarray))
+            result["timeframe"] = timeframe
+            result["timestamps"] = readonly(columns["time"][0, columns["time"].shape[-1] - size:].astype(np.int64))
+            return cache.put(key, result)
+
         prices = [float(candle["close"]) for candle in candles]
         highs = [float(candle["high"]) for candle in candles]
         lows = [float(candle["low"]) for candle in candles]
         timestamps = [candle["time"] for candle in candles]
 
         indicators = TechnicalIndicators()
-        indicator = indicator.upper()
 
+        def ema_series(period):
+            # EMA series are shared between EMA and MACD requests
+            return cache.get_or_compute(
+                cache.key(asset, timeframe, "EMA_SERIES", period, adjusted_history),
+                lambda: indicators.calculate_ema(prices, period)
+            )
+
+        result = self.__compute_indicator(
+            indicators, indicator, params, prices, highs, lows, timestamps, timeframe, ema_series
+        )
+        if "error" not in result:
+            cache.put(key, result)
+        return result
+
+    async def calculate_indicators(
+            self, assets: list,
+            indicator: str,
+            params: dict = None,
+            history_size: int = 3600,
+            timeframe: int = 60,
+            as_array: bool = False
+    ) -> dict:
+        """
+        Calcula un indicador para varios activos en una sola pasada vectorizada
+
+        Las velas de todos los activos se piden en paralelo y se apilan en
+        matrices (activos x velas) recortadas al histórico más corto.
+
+        Args:
+            assets (list): Nombres de los activos
+            indicator (str): Nombre del indicador
+            params (dict): Parámetros específicos del indicador
+            history_size (int): Tamaño del histórico en segundos
+            timeframe (int): Temporalidad en segundos
+            as_array (bool): Devuelve filas float64 de solo lectura sin redondear
+
+        Returns:
+            dict: Resultado de cada activo con el formato de calculate_indicator
+        """
+        valid_timeframes = [60, 300, 900, 1800, 3600, 7200, 14400, 86400]
+        if timeframe not in valid_timeframes:
+            return {"error": f"Timeframe no válido. Valores permitidos: {valid_timeframes}"}
+
+        adjusted_history = max(history_size, timeframe * 50)
+        candles = await asyncio.gather(*(
+            self.get_indicator_candles(asset, timeframe, adjusted_history) for asset in assets
+        ))
+        columns = stack_candles(dict(zip(assets, candles)))
+        try:
+            results = BatchIndicators.calculate(
+                indicator, columns["assets"], columns["close"], columns["high"], columns["low"], params, as_array
+            )
+        except Exception as e:
+            return {"error": f"Error calculando el indicador: {str(e)}"}
+
+        for row, asset in enumerate(columns["assets"]):
+            result = results[asset]
+            size = max((len(values) for values in result.values() if isinstance(values, (list, np.ndarray))), default=0)
+            timestamps = columns["time"][row, columns["time"].shape[-1] - size:].astype(np.int64)
+            result["timeframe"] = timeframe
+            result["timestamps"] = readonly(timestamps) if as_array else timestamps.tolist()
+        for asset in assets:
+            results.setdefault(asset, {"error": f"No hay datos disponibles para el activo {asset}"})
+        return results
+
+    async def get_indicator_candles(self, asset: str, timeframe: int, history_size: int):
+        """
+        Obtiene las velas de calculate_indicator, compartidas entre indicadores
+        hasta que cierra la vela en curso
+        """
+        cache = self.indicator_cache
+        key = cache.key(asset, timeframe, "CANDLES", None, history_size)
+        candles = cache.get(key)
+        if candles is not None:
+            return candles
+        request = self.__candle_requests.get(key)
+        if request is None:
+            request = asyncio.ensure_future(self.get_candles(asset, time.time(), history_size, timeframe))
+            self.__candle_requests[key] = request
+            request.add_done_callback(lambda _: self.__candle_requests.pop(key, None))
+        candles = await asyncio.shield(request)
+        if candles:
+            cache.put(key, candles)
+        return candles
+
+    @staticmethod
+    def __compute_indicator(indicators, indicator, params, prices, highs, lows, timestamps, timeframe, ema_series):
         try:
             # RSI
             if indicator == "RSI":
@@ -341,7 +793,11 @@ class Quotex:
                 fast_period = params.get("fast_period", 12)
                 slow_period = params.get("slow_period", 26)
                 signal_period = params.get("signal_period", 9)
-                macd_data = indicators.calculate_macd(prices, fast_period, slow_period, signal_period)
+                macd_data = indicators.calculate_macd(
+                    prices, fast_period, slow_period, signal_period,
+                    fast_ema=ema_series(fast_period) if len(prices) >= fast_period else None,
+                    slow_ema=ema_series(slow_period) if len(prices) >= slow_period else None
+                )
                 macd_data["timeframe"] = timeframe
                 macd_data["timestamps"] = timestamps[-len(macd_data["macd"]):] if macd_data["macd"] else []
                 return macd_data
@@ -361,7 +817,7 @@ class Quotex:
             # EMA
             elif indicator == "EMA":
                 period = params.get("period", 20)
-                values = indicators.calculate_ema(prices, period)
+                values = ema_series(period)
                 return {
                     "ema": values,
                     "current": values[-1] if values else None,
@@ -435,6 +891,9 @@ class Quotex:
         """
         Suscribe a actualizaciones en tiempo real de un indicador
 
+        El indicador se siembra una vez con el histórico y luego se actualiza
+        en O(1) con cada tick: ``closed`` es True cuando la vela cerró.
+
         Args:
             asset (str): Nombre del activo
             indicator (str): Nombre del indicador
@@ -450,138 +909,89 @@ class Quotex:
         if timeframe not in valid_timeframes:
             raise ValueError(f"Timeframe no válido. Valores permitidos: {valid_timeframes}")
 
+        ind = create_indicator(indicator, params)
+        indicator = indicator.upper()
+        loop = asyncio.get_running_loop()
+        closed = deque()
+        pending = {}
+        ready = asyncio.Event()
+
+        def push(kind, candle):
+            if kind == "close":
+                closed.append(dict(candle))
+            else:
+                pending["candle"] = dict(candle)
+            ready.set()
+
+        def on_close(candle_asset, candle_timeframe, candle):
+            if candle_asset == asset and candle_timeframe == timeframe:
+                loop.call_soon_threadsafe(push, "close", candle)
+
+        def on_update(candle_asset, candle_timeframe, candle):
+            if candle_asset == asset and candle_timeframe == timeframe:
+                loop.call_soon_threadsafe(push, "update", candle)
+
+        self.candle_aggregator.subscribe(asset, timeframe)
+        self.candle_aggregator.add_listener(on_close)
+        self.candle_aggregator.add_update_listener(on_update)
         try:
-            # Iniciar stream de velas
-            self.start_candles_stream(asset, timeframe)
+            # Start the candles stream, shared with other consumers
+            self.acquire_stream(asset, timeframe)
+
+            # Seed the indicator with the closed candles of the history
+            current_start = int(time.time() // timeframe * timeframe)
+            historical_candles = await self.get_candles(
+                asset,
+                time.time(),
+                timeframe * ind.warmup * 2,  # Twice the required period
+                timeframe
+            ) or []
+            last_time = None
+            for candle in historical_candles:
+                if candle["time"] < current_start:
+                    ind.close(candle)
+                    last_time = candle["time"]
 
             while True:
+                await ready.wait()
+                ready.clear()
+                if self.api.tick_tracer is not None:
+                    self.api.tick_tracer.delivered(asset)
                 try:
-                    # Obtener velas en tiempo real
-                    real_time_candles = await self.get_realtime_candles(asset, timeframe)
-
-                    if real_time_candles:
-                        # Convertir el diccionario a lista ordenada por tiempo
-                        candles_list = sorted(real_time_candles.items(), key=lambda x: x[0])
-
-                        # Extraer datos de las velas
-                        prices = [float(candle[1]["close"]) for candle in candles_list]
-                        highs = [float(candle[1]["high"]) for candle in candles_list]
-                        lows = [float(candle[1]["low"]) for candle in candles_list]
-
-                        # Asegurar que tenemos suficientes datos
-                        min_periods = {
-                            "RSI": 14,
-                            "MACD": 26,
-                            "BOLLINGER": 20,
-                            "STOCHASTIC": 14,
-                            "ADX": 14,
-                            "ATR": 14,
-                            "SMA": 20,
-                            "EMA": 20,
-                            "ICHIMOKU": 52
-                        }
-
-                        required_periods = min_periods.get(indicator.upper(), 14)
-                        if len(prices) < required_periods:
-                            # Si no hay suficientes datos, obtener histórico
-                            historical_candles = await self.get_candles(
-                                asset,
-                                time.time(),
-                                timeframe * required_periods * 2,  # Doble del período requerido
-                                timeframe
-                            )
-                            if historical_candles:
-                                # Combinar datos históricos con tiempo real
-                                prices = [float(candle["close"]) for candle in historical_candles] + prices
-                                highs = [float(candle["high"]) for candle in historical_candles] + highs
-                                lows = [float(candle["low"]) for candle in historical_candles] + lows
-
-                        indicators = TechnicalIndicators()
-                        indicator = indicator.upper()
-
-                        # Calcular el indicador con los datos actualizados
-                        result = {
-                            "time": candles_list[-1][0],
-                            "timeframe": timeframe,
-                            "asset": asset
-                        }
-
-                        if indicator == "RSI":
-                            period = params.get("period", 14)
-                            values = indicators.calculate_rsi(prices, period)
-                            result["value"] = values[-1] if values else None
-                            result["all_values"] = values
-                            result["indicator"] = "RSI"
-
-                        elif indicator == "MACD":
-                            fast_period = params.get("fast_period", 12)
-                            slow_period = params.get("slow_period", 26)
-                            signal_period = params.get("signal_period", 9)
-                            macd_data = indicators.calculate_macd(prices, fast_period, slow_period, signal_period)
-                            result["value"] = macd_data["current"]
-                            result["all_values"] = macd_data
-                            result["indicator"] = "MACD"
-
-                        # BOLLINGER
-                        elif indicator == "BOLLINGER":
-                            period = params.get("period", 20)
-                            num_std = params.get("std", 2)
-                            bb_data = indicators.calculate_bollinger_bands(prices, period, num_std)
-                            result["value"] = bb_data["current"]
-                            result["all_values"] = bb_data
-
-                        # STOCHASTIC
-                        elif indicator == "STOCHASTIC":
-                            k_period = params.get("k_period", 14)
-                            d_period = params.get("d_period", 3)
-                            stoch_data = indicators.calculate_stochastic(prices, highs, lows, k_period, d_period)
-                            result["value"] = stoch_data["current"]
-                            result["all_values"] = stoch_data
-
-                        # ADX
-                        elif indicator == "ADX":
-                            period = params.get("period", 14)
-                            adx_data = indicators.calculate_adx(highs, lows, prices, period)
-                            result["value"] = adx_data["current"]
-                            result["all_values"] = adx_data
-
-                        # ATR
-                        elif indicator == "ATR":
-                            period = params.get("period", 14)
-                            values = indicators.calculate_atr(highs, lows, prices, period)
-                            result["value"] = values[-1] if values else None
-                            result["all_values"] = values
-
-                        # ICHIMOKU
-                        elif indicator == "ICHIMOKU":
-                            tenkan_period = params.get("tenkan_period", 9)
-                            kijun_period = params.get("kijun_period", 26)
-                            senkou_b_period = params.get("senkou_b_period", 52)
-                            ichimoku_data = indicators.calculate_ichimoku(highs, lows, tenkan_period, kijun_period,
-                                                                          senkou_b_period)
-                            result["value"] = ichimoku_data["current"]
-                            result["all_values"] = ichimoku_data
-
-                        else:
-                            result["error"] = f"Indicador '{indicator}' no soportado para tiempo real"
-
-                        # Llamar al callback con el resultado
-                        await callback(result)
-
-                    await asyncio.sleep(1)  # Esperar 1 segundo entre actualizaciones
-
+                    while closed:
+                        candle = closed.popleft()
+                        if last_time is not None and candle["timestamp"] <= last_time:
+                            continue
+                        ind.close(candle)
+                        last_time = candle["timestamp"]
+                        await callback(self.__indicator_result(asset, timeframe, indicator, candle, ind.value, True))
+                    candle = pending.pop("candle", None)
+                    if candle is not None:
+                        value = ind.update(candle)
+                        await callback(self.__indicator_result(asset, timeframe, indicator, candle, value, False))
                 except Exception as e:
-                    print(f"Error en la suscripción: {str(e)}")
-                    await asyncio.sleep(1)
-        except Exception as e:
-            logger.error(f"Error en la suscripción: {str(e)}")
+                    logger.error(f"Error en la suscripción: {str(e)}")
         finally:
             # Limpiar suscripciones al salir
+            self.candle_aggregator.remove_listener(on_close)
+            self.candle_aggregator.remove_update_listener(on_update)
+            self.candle_aggregator.release(asset, timeframe)
             try:
-                self.stop_candles_stream(asset)
-            except:
+                self.release_stream(asset)
+            except Exception:
                 pass
 
+    @staticmethod
+    def __indicator_result(asset, timeframe, indicator, candle, value, closed):
+        return {
+            "time": candle["timestamp"],
+            "timeframe": timeframe,
+            "asset": asset,
+            "indicator": indicator,
+            "value": value,
+            "closed": closed
+        }
+
     async def get_profile(self):
         return await self.api.get_profile()
 
@@ -609,28 +1019,60 @@ class Quotex:
             The buy result.
 
         """
-        self.api.buy_id = None
-        request_id = expiration.get_timestamp()
+        request_id = self.api.next_request_id()
         is_fast_option = time_mode.upper() == "TIME"
-        self.start_candles_stream(asset, duration)
+        future = self.api.pending.create("orders/open", request_id)
+        self.follow_asset(asset, duration)
         self.api.buy(amount, asset, direction, duration, request_id, is_fast_option)
+        metrics.inc("orders_sent_total")
 
-        count = 0.1
-        while self.api.buy_id is None:
-            count += 0.1
-            if count > duration:
-                status_buy = False
-                break
-            await asyncio.sleep(0.2)
-            if global_value.check_websocket_if_error:
-                return False, global_value.websocket_error_reason
-        else:
-            status_buy = True
+        buy_successful = await self.wait_response("orders/open", future)
+        if buy_successful is None:
+            metrics.inc("orders_failed_total")
+            if self.api.state.check_websocket_if_error:
+                return False, self.api.state.websocket_error_reason
+            return False, None
+
+        metrics.inc("orders_acknowledged_total")
+        return True, buy_successful
+
+    def arm_order(self, asset: str, duration: int, time_mode: str = "TIME"):
+        """
+        Prepare the connection for the next orders of an asset
+
+        Starts the asset stream and stores the chart settings ahead, so a
+        following ``buy`` with the same asset, duration and time mode only
+        writes its ``orders/open`` frame. Fast options ("TIME") resend their
+        settings with every order, so only the stream is started ahead.
+
+        Args:
+            asset (str): Asset to buy.
+            duration (int): Duration to buy.
+            time_mode (str): Time mode to buy.
+
+        """
+        self.follow_asset(asset, duration)
+        self.api.buy.arm(asset, duration, time_mode.upper() == "TIME")
+
+    async def buy_many(self, orders):
+        """
+        Buy several Binary options at once
+
+        Every order gets its own ``requestId`` and the requests are sent
+        without waiting for each other, so a basket goes out within one
+        candle tick and each confirmation reaches its own order.
+
+        Args:
+            orders (list): Dicts with the arguments of ``buy``: amount,
+                asset, direction, duration and optionally time_mode.
 
-        return status_buy, self.api.buy_successful
+        Returns:
+            The ``(status, result)`` of each order, in the same order.
+
+        """
+        return list(await asyncio.gather(*(self.buy(**order) for order in orders)))
 
     async def open_pending(self, amount: float, asset: str, direction: str, duration: int, open_time: str = None):
-        self.api.pending_id = None
         user_settings = await self.get_profile()
         offset_zone = user_settings.offset
         open_time = expiration.get_next_timeframe(
@@ -639,42 +1081,36 @@ class Quotex:
             duration,
             open_time
         )
+        future = self.api.pending.create("pending/create")
         self.api.open_pending(amount, asset, direction, duration, open_time)
-        count = 0.1
-        while self.api.pending_id is None:
-            count += 0.1
-            if count > duration:
-                status_buy = False
-                break
-            await asyncio.sleep(0.2)
-            if global_value.check_websocket_if_error:
-                return False, global_value.websocket_error_reason
-        else:
-            status_buy = True
-            self.api.instruments_follow(amount, asset, direction, duration, open_time)
+        pending_successful = await self.wait_response("pending/create", future)
+        if pending_successful is None:
+            if self.api.state.check_websocket_if_error:
+                return False, self.api.state.websocket_error_reason
+            return False, self.api.pending_successful
 
-        return status_buy, self.api.pending_successful
+        self.api.instruments_follow(amount, asset, direction, duration, open_time)
+        return True, pending_successful
 
     async def sell_option(self, options_ids):
         """Sell asset Quotex"""
+        ticket = options_ids[-1] if isinstance(options_ids, list) else options_ids
+        future = self.api.pending.create("orders/cancel", ticket)
         self.api.sell_option(options_ids)
-        self.api.sold_options_respond = None
-        while self.api.sold_options_respond is None:
-            await asyncio.sleep(0.2)
-        return self.api.sold_options_respond
+        return await self.wait_response("orders/cancel", future)
 
     def get_payment(self):
         """Payment Quotex server"""
         assets_data = {}
-        for i in self.api.instruments:
-            assets_data[i[2].replace("\n", "")] = {
-                "turbo_payment": i[18],
-                "payment": i[5],
+        for i in self.api.instrument_catalog:
+            assets_data[i.name] = {
+                "turbo_payment": i.turbo_payment,
+                "payment": i.payment,
                 "profit": {
-                    "1M": i[-9],
-                    "5M": i[-8]
+                    "1M": i.profit["1M"],
+                    "5M": i.profit["5M"]
                 },
-                "open": i[14]
+                "open": i.is_open
             }
 
         return assets_data
@@ -682,26 +1118,13 @@ class Quotex:
     # Function suggested by https://t.me/Suppor_Mk in the message on telegram https://t.me/c/2215782682/1/2990
     def get_payout_by_asset(self, asset_name: str, timeframe: str = "1"):
         """Payout Quotex server"""
-        assets_data = {}
-        for i in self.api.instruments:
-            if asset_name == i[1]:
-                assets_data[i[1].replace("\n", "")] = {
-                    "turbo_payment": i[18],
-                    "payment": i[5],
-                    "profit": {
-                        "24H": i[-10],
-                        "1M": i[-9],
-                        "5M": i[-8]
-                    },
-                    "open": i[14]
-                }
-                break
-
-        data = assets_data.get(asset_name)
+        instrument = self.api.instrument_catalog.get(asset_name)
+        if instrument is None:
+            return None
         if timeframe == "all":
-            return data.get("profit")
+            return dict(instrument.profit)
 
-        return data.get("profit").get(f"{timeframe}M")
+        return instrument.profit.get(f"{timeframe}M")
 
     async def start_remaing_time(self):
         now_stamp = datetime.fromtimestamp(expiration.get_timestamp())
@@ -712,31 +1135,101 @@ class Quotex:
             print(f"\rRestando {remaing_time if remaing_time > 0 else 0} segundos ...", end="")
             await asyncio.sleep(1)
 
-    async def check_win(self, id_number: int):
-        """Check win based id"""
+    async def check_win(self, id_number: int, timeout: float = None):
+        """Check win based id
+
+        Args:
+            id_number (int): Id of the order.
+            timeout (float, optional): Seconds to wait for the result. Defaults
+                to the time left until the order closes plus ``response_timeout``.
+
+        Returns:
+            bool: Whether the order won, or None if its result did not arrive in time.
+        """
+        if timeout is None:
+            close_time = self.api.timesync.server_timestamp or 0
+            timeout = max(close_time - expiration.get_timestamp(), 0) + self.response_timeout
         task = asyncio.create_task(
             self.start_remaing_time()
         )
-        while True:
+        future = self.api.pending.create("deals", id_number)
+        data_dict = self.api.listinfodata.get(id_number)
+        if data_dict and data_dict.get("game_state") == 1:
+            self.api.pending.discard("deals", future)
+        else:
+            await self.wait_response("deals", future, timeout)
             data_dict = self.api.listinfodata.get(id_number)
-            if data_dict and data_dict.get("game_state") == 1:
-                break
-            await asyncio.sleep(0.2)
         task.cancel()
+        if not data_dict:
+            return None
         self.api.listinfodata.delete(id_number)
         return data_dict["win"]
 
     def start_candles_stream(self, asset: str = "EURUSD", period: int = 0):
         """Start streaming candle data for a specified asset.
 
+        Args:
+            asset (str): The asset to stream data for.
+            period (int, optional): The period for the candles. Defaults to 0.
+        """
+        self.api.state.owned_streams.add(asset)
+        self.__open_stream(asset, period)
+
+    def follow_asset(self, asset: str, period: int = 0):
+        """Start the candles stream of an asset unless this connection already has it.
+
         Args:
             asset (str): The asset to stream data for.
             period (int, optional): The period for the candles. Defaults to 0.
         """
+        self.api.current_asset = asset
+        self.api.state.owned_streams.add(asset)
+        if (asset, period) not in self.api.state.subscriptions:
+            self.__open_stream(asset, period)
+
+    def acquire_stream(self, asset: str, period: int = 0):
+        """Start the candles stream of an asset for a consumer that releases it later.
+
+        Streams are reference counted: ``release_stream`` only stops the
+        stream once every consumer released it and the client itself does
+        not use it through ``start_candles_stream`` or ``follow_asset``.
+
+        Args:
+            asset (str): The asset to stream data for.
+            period (int, optional): The period for the candles. Defaults to 0.
+        """
+        users = self.api.state.stream_users
+        users[asset] = users.get(asset, 0) + 1
+        if (asset, period) not in self.api.state.subscriptions:
+            self.__open_stream(asset, period)
+
+    def release_stream(self, asset: str):
+        """Release a stream taken with ``acquire_stream``."""
+        users = self.api.state.stream_users
+        if asset not in users:
+            # Acquired on a previous connection, nothing left to release
+            return
+        users[asset] -= 1
+        if users[asset] > 0:
+            return
+        del users[asset]
+        if asset not in self.api.state.owned_streams:
+            self.__close_stream(asset)
+
+    def __open_stream(self, asset, period):
         self.api.current_asset = asset
         self.api.subscribe_realtime_candle(asset, period)
         self.api.chart_notification(asset)
         self.api.follow_candle(asset)
+        self.api.state.subscriptions.add((asset, period))
+
+    def __close_stream(self, asset):
+        self.api.unsubscribe_realtime_candle(asset)
+        self.api.unfollow_candle(asset)
+        self.api.state.subscriptions = {
+            subscription for subscription in self.api.state.subscriptions
+            if subscription[0] != asset
+        }
 
     async def store_settings_apply(
             self,
@@ -793,8 +1286,14 @@ class Quotex:
         return investments_settings
 
     def stop_candles_stream(self, asset):
-        self.api.unsubscribe_realtime_candle(asset)
-        self.api.unfollow_candle(asset)
+        """Stop the candles stream of an asset, unless consumers that took it
+        with ``acquire_stream`` still use it."""
+        self.api.state.owned_streams.discard(asset)
+        for key in [key for key in self.realtime_candles if key[0] == asset]:
+            self.realtime_candles.discard(key)
+            self.candle_aggregator.release(*key)
+        if not self.api.state.stream_users.get(asset):
+            self.__close_stream(asset)
 
     def start_signals_data(self):
         self.api.signals_subscribe()
@@ -807,33 +1306,40 @@ class Quotex:
             period (int, optional): The period for the candles. Defaults to 0.
 
         Returns:
-            dict: A dictionary of real-time candle data.
+            dict: The candles built since the subscription, keyed by start time.
         """
-        data = {}
+        period = period or self.period_default
+        # Polled in a loop: the aggregator is subscribed once per series and
+        # released by stop_candles_stream
+        if (asset, period) not in self.realtime_candles:
+            self.realtime_candles.add((asset, period))
+            self.candle_aggregator.subscribe(asset, period)
+        future = self.api.pending.create("quotes/stream", asset)
         self.start_candles_stream(asset, period)
-        while True:
-            if self.api.realtime_price.get(asset):
-                tick = self.api.realtime_candles
-                return process_tick(tick, period, data)
-
-            await asyncio.sleep(0.1)
+        await self.wait_response("quotes/stream", future)
+        return {
+            candle["timestamp"]: candle
+            for candle in self.candle_aggregator.candles(asset, period)
+        }
 
     async def start_realtime_price(self, asset: str, period: int = 0):
+        future = self.api.pending.create("quotes/stream", asset)
         self.start_candles_stream(asset, period)
-        while True:
-            if self.api.realtime_price.get(asset):
-                return self.api.realtime_price
-            await asyncio.sleep(0.2)
+        await self.wait_response("quotes/stream", future)
+        return self.api.realtime_price
 
     async def get_realtime_price(self, asset: str):
+        if self.api.tick_tracer is not None:
+            self.api.tick_tracer.delivered(asset)
         return self.api.realtime_price.get(asset, {})
 
     async def start_realtime_sentiment(self, asset: str, period: int = 0):
+        if self.api.realtime_sentiment.get(asset):
+            self.start_candles_stream(asset, period)
+            return self.api.realtime_sentiment[asset]
+        future = self.api.pending.create("sentiment", asset)
         self.start_candles_stream(asset, period)
-        while True:
-            if self.api.realtime_sentiment.get(asset):
-                return self.api.realtime_sentiment[asset]
-            await asyncio.sleep(0.2)
+        return await self.wait_response("sentiment", future) or {}
 
     async def get_realtime_sentiment(self, asset: str):
         return self.api.realtime_sentiment.get(asset, {})
@@ -919,4 +1425,7 @@ class Quotex:
                 await asyncio.sleep(0.2)
 
     async def close(self):
+        if self.latency_task is not None:
+            self.latency_task.cancel()
+            self.latency_task = None
         return await self.api.close()
@@ -0,0 +1,37 @@
+"""Module for Quotex per-connection state."""
+
+
+class ConnectionState(object):
+    """Class for the state of a single Quotex connection.
+
+    Each :class:`QuotexAPI <quotexapi.api.QuotexAPI>` owns one instance, so
+    several accounts can run side by side in the same process.
+    """
+
+    def __init__(self):
+        self.SSID = None
+        self.check_websocket_if_connect = None
+        self.started_listen_instruments = True
+        self.check_rejected_connection = False
+        self.check_accepted_connection = False
+        self.check_websocket_if_error = False
+        self.websocket_error_reason = None
+        self.balance_id = None
+        self.subscriptions = set()
+        self.chart_settings = None
+        self.owned_streams = set()
+        self.stream_users = {}
+
+    def reset_connection(self):
+        """Clear the flags of a previous websocket connection."""
+        self.check_websocket_if_connect = None
+        self.check_websocket_if_error = False
+        self.websocket_error_reason = None
+        self.reset_subscriptions()
+
+    def reset_subscriptions(self):
+        """Forget the streams and chart settings sent on this connection."""
+        self.subscriptions = set()
+        self.chart_settings = None
+        self.owned_streams = set()
+        self.stream_users = {}
@@ -0,0 +1,172 @@
+"""Module for Quotex persistent candles store."""
+import os
+import json
+import logging
+import threading
+from bisect import bisect_left
+from pathlib import Path
+from urllib.parse import quote
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ("open", "close", "high", "low", "ticks")
+
+
+def merge_ranges(ranges):
+    """Sort and join overlapping or touching ``[start, end)`` ranges."""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def subtract_ranges(start, end, ranges):
+    """Return the parts of ``[start, end)`` not covered by the sorted ``ranges``."""
+    missing = []
+    cursor = start
+    for range_start, range_end in ranges:
+        if range_end <= cursor:
+            continue
+        if range_start >= end:
+            break
+        if range_start > cursor:
+            missing.append((cursor, range_start))
+        cursor = max(cursor, range_end)
+    if cursor < end:
+        missing.append((cursor, end))
+    return missing
+
+
+class CandleSeriesFile(object):
+    """Class for the stored candles of one asset and period.
+
+    Keeps the candles by start time and the ``[start, end)`` time ranges
+    already fetched, so a range known to have no candles is not requested
+    again either.
+    """
+
+    def __init__(self, path, asset, period):
+        """
+        :param path: The JSON file of the series.
+        :param str asset: The asset name.
+        :param int period: The candle size in seconds.
+        """
+        self.path = Path(path)
+        self.asset = asset
+        self.period = period
+        self.ranges = []
+        self.times = []
+        self.rows = {}
+        self.load()
+
+    def load(self):
+        if not self.path.is_file():
+            return
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            logger.warning(f"Ignoring unreadable candles file {self.path}.")
+            return
+        self.ranges = merge_ranges(data.get("ranges", []))
+        self.rows = {int(row[0]): list(row[1:]) for row in data.get("candles", [])}
+        self.times = sorted(self.rows)
+
+    def save(self):
+        self.path.parent.mkdir(exist_ok=True, parents=True)
+        data = {
+            "asset": self.asset,
+            "period": self.period,
+            "ranges": self.ranges,
+            "candles": [[timestamp] + self.rows[timestamp] for timestamp in self.times]
+        }
+        temporary = self.path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(data, separators=(",", ":")))
+        os.replace(temporary, self.path)
+
+    def missing(self, start, end):
+        return subtract_ranges(start, end, self.ranges)
+
+    def merge(self, candles, start=None, end=None):
+        """Store normalized candles and mark ``[start, end)`` as covered."""
+        for candle in candles:
+            timestamp = candle["time"]
+            if timestamp not in self.rows:
+                self.times.insert(bisect_left(self.times, timestamp), timestamp)
+            self.rows[timestamp] = [candle[field] for field in FIELDS]
+        if start is not None and end is not None and start < end:
+            self.ranges = merge_ranges(self.ranges + [[start, end]])
+
+    def candles(self, start, end):
+        first = bisect_left(self.times, start)
+        last = bisect_left(self.times, end)
+        return [
+            dict(zip(("time",) + FIELDS, [timestamp] + self.rows[timestamp]))
+            for timestamp in self.times[first:last]
+        ]
+
+
+class CandleStore(object):
+    """Class for an on-disk cache of closed candles per asset and period.
+
+    Each series is a JSON file under ``root_path`` holding the candles and
+    the time ranges already fetched from the server. :meth:`missing` tells
+    which ranges of a request still have to be fetched, :meth:`merge`
+    stores them and :meth:`candles` reads a range back.
+    """
+
+    def __init__(self, root_path="candles"):
+        """
+        :param root_path: The directory of the series files.
+        """
+        self.root_path = Path(root_path)
+        self.series = {}
+        self.__lock = threading.Lock()
+
+    def path(self, asset, period):
+        return self.root_path / f"{quote(asset, safe='')}_{period}.json"
+
+    def get(self, asset, period):
+        """Return the :class:`CandleSeriesFile` of an asset and period."""
+        with self.__lock:
+            series = self.series.get((asset, period))
+            if series is None:
+                series = CandleSeriesFile(self.path(asset, period), asset, period)
+                self.series[(asset, period)] = series
+            return series
+
+    def missing(self, asset, period, start, end):
+        """Return the ``(start, end)`` ranges of ``[start, end)`` not stored yet."""
+        return self.get(asset, period).missing(start, end)
+
+    def merge(self, asset, period, candles, start=None, end=None, save=True):
+        """Store candles and mark ``[start, end)`` as fetched.
+
+        :param candles: Normalized candle dicts, see
+            :func:`normalize_candles <quotexapi.utils.processor.normalize_candles>`.
+        :param bool save: Write the series file now, otherwise on :meth:`flush`.
+        """
+        series = self.get(asset, period)
+        series.merge(candles, start, end)
+        if save:
+            series.save()
+
+    def flush(self, asset, period):
+        """Write the series file of an asset and period."""
+        self.get(asset, period).save()
+
+    def candles(self, asset, period, start, end):
+        """Return the stored candles starting in ``[start, end)``, oldest first."""
+        return self.get(asset, period).candles(start, end)
+
+    def clear(self, asset=None, period=None):
+        """Forget the stored series of an asset and period, by default all of them."""
+        with self.__lock:
+            for key in list(self.series):
+                if (asset is None or key[0] == asset) and (period is None or key[1] == period):
+                    self.series.pop(key)
+        name = "*" if asset is None else quote(asset, safe="")
+        for path in self.root_path.glob(f"{name}_{'*' if period is None else period}.json"):
+            path.unlink(missing_ok=True)
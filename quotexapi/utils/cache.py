@@ -0,0 +1,162 @@
+"""Module for the technical indicators results cache."""
+import sys
+import time
+import threading
+from collections import OrderedDict, defaultdict
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+FLOAT_SIZE = sys.getsizeof(0.0)
+
+
+def sizeof(value):
+    """Approximate memory used by a result made of dicts, lists and numbers."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += sys.getsizeof(key) + sizeof(item)
+    elif isinstance(value, (list, tuple)):
+        if value and isinstance(value[0], float):
+            # Lists of floats dominate the results, skip the per item walk
+            size += FLOAT_SIZE * len(value)
+        else:
+            for item in value:
+                size += sizeof(item)
+    elif hasattr(value, "nbytes"):
+        size += value.nbytes
+    return size
+
+
+def freeze(params):
+    """Hashable, order independent form of the indicator parameters."""
+    if isinstance(params, dict):
+        return tuple(sorted((key, freeze(value)) for key, value in params.items()))
+    if isinstance(params, (list, tuple)):
+        return tuple(freeze(value) for value in params)
+    return params
+
+
+class IndicatorCache(object):
+    """Class for a LRU cache of indicator results.
+
+    Entries are keyed by ``(asset, timeframe, name, params, size)`` and stay
+    valid until a candle of their asset and timeframe closes: either
+    :meth:`on_candle_close` is called, usually as a
+    :class:`CandleAggregator <quotexapi.ws.objects.aggregator.CandleAggregator>`
+    listener, or the clock crosses the timeframe boundary. The least recently
+    used entries are evicted once the cache goes over ``max_bytes``.
+
+    Cached values are shared between callers and must not be modified.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, max_entries=None):
+        """
+        :param int max_bytes: Approximate memory cap of the cached values.
+        :param int max_entries: (optional) Maximum number of entries.
+        """
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.keys = defaultdict(set)
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def key(asset, timeframe, name, params=None, size=None):
+        """Build the cache key of a result.
+
+        :param str asset: The asset name.
+        :param int timeframe: The candle size in seconds.
+        :param str name: The indicator or series name.
+        :param params: (optional) The parameters the result depends on.
+        :param size: (optional) The amount of history the result was built from.
+        """
+        return asset, timeframe, name, freeze(params), size
+
+    @staticmethod
+    def boundary(timeframe, now=None):
+        """Start of the candle in progress."""
+        now = time.time() if now is None else now
+        return int(now // timeframe * timeframe)
+
+    def get(self, key, now=None):
+        """Return the cached value of ``key``, or None when missing or stale."""
+        boundary = self.boundary(key[1], now)
+        with self.__lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] != boundary:
+                if entry is not None:
+                    self.__remove(key)
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value, now=None):
+        """Store the value of ``key`` for the candle in progress."""
+        size = sizeof(value)
+        if size > self.max_bytes:
+            return value
+        boundary = self.boundary(key[1], now)
+        with self.__lock:
+            if key in self.entries:
+                self.__remove(key)
+            self.entries[key] = (boundary, value, size)
+            self.keys[key[:2]].add(key)
+            self.size += size
+            while self.entries and (
+                    self.size > self.max_bytes or
+                    (self.max_entries is not None and len(self.entries) > self.max_entries)
+            ):
+                self.__remove(next(iter(self.entries)))
+        return value
+
+    def get_or_compute(self, key, compute, now=None):
+        """Return the cached value of ``key``, computing and storing it when missing."""
+        value = self.get(key, now)
+        if value is None:
+            value = self.put(key, compute(), now)
+        return value
+
+    def invalidate(self, asset, timeframe=None):
+        """Drop the entries of an asset, of one timeframe or all of them."""
+        with self.__lock:
+            series = [
+                pair for pair in self.keys
+                if pair[0] == asset and (timeframe is None or pair[1] == timeframe)
+            ]
+            for pair in series:
+                for key in tuple(self.keys.get(pair, ())):
+                    self.__remove(key)
+
+    def on_candle_close(self, asset, timeframe, candle):
+        self.invalidate(asset, timeframe)
+
+    def clear(self):
+        with self.__lock:
+            self.entries.clear()
+            self.keys.clear()
+            self.size = 0
+
+    def __remove(self, key):
+        _, _, size = self.entries.pop(key)
+        self.size -= size
+        pair = key[:2]
+        keys = self.keys.get(pair)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.keys[pair]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "bytes": self.size,
+            "hits": self.hits,
+            "misses": self.misses
+        }
@@ -1,19 +1,298 @@
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import List, Dict, Union, Tuple
 
+# Tamaño de bloque para resolver las recurrencias (EMA/Wilder) por bloques
+FILTER_BLOCK = 64
+
+
+def as_array(values) -> np.ndarray:
+    """Convierte la entrada en un array float64"""
+    return np.asarray(values, dtype=np.float64)
+
+
+def round_list(values, decimals: int = 2) -> List[float]:
+    """Redondea a `decimals` decimales igual que round() de Python"""
+    values = as_array(values)
+    rounded = np.round(values, decimals)
+    # np.round escala por 10 ** decimals antes de redondear: los valores cercanos
+    # a un empate se redondean con round() para obtener exactamente su resultado
+    scaled = values * 10 ** decimals
+    ties = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+    for i in ties.tolist():
+        rounded.flat[i] = round(values.flat[i].item(), decimals)
+    return rounded.tolist()
+
+
+def readonly(values) -> np.ndarray:
+    """Vista de solo lectura de un resultado"""
+    view = as_array(values).view()
+    view.flags.writeable = False
+    return view
+
+
+def present(result, decimals: int = 2):
+    """Redondea un resultado en arrays a listas para mostrarlo (el borde de presentación)"""
+    if isinstance(result, dict):
+        return {name: present(value, decimals) for name, value in result.items()}
+    if isinstance(result, np.ndarray):
+        return round_list(result, decimals)
+    if isinstance(result, float):
+        return round(result, decimals)
+    return result
+
+
+def rolling_sum(values, period: int) -> np.ndarray:
+    """Suma de cada ventana de `period` valores sobre el último eje (sumas acumuladas)"""
+    values = as_array(values)
+    # Restar el primer valor mantiene la precisión de la suma acumulada
+    base = values[..., :1]
+    cumsum = np.cumsum(values - base, axis=-1)
+    cumsum = np.concatenate((np.zeros_like(base), cumsum), axis=-1)
+    return cumsum[..., period:] - cumsum[..., :-period] + base * period
+
+
+def rolling_mean(values, period: int) -> np.ndarray:
+    """Media de cada ventana de `period` valores sobre el último eje"""
+    return rolling_sum(values, period) / period
+
+
+def rolling_std(values, period: int) -> np.ndarray:
+    """Desviación estándar poblacional de cada ventana sobre el último eje"""
+    return sliding_window_view(as_array(values), period, axis=-1).std(axis=-1)
+
+
+def _rolling_extreme(values, period: int, ufunc) -> np.ndarray:
+    # Algoritmo de van Herk/Gil-Werman: máximos prefijo y sufijo por bloques
+    values = as_array(values)
+    length = values.shape[-1]
+    blocks = -(-length // period)
+    fill = -np.inf if ufunc is np.maximum else np.inf
+    padding = np.full(values.shape[:-1] + (blocks * period - length,), fill)
+    padded = np.concatenate((values, padding), axis=-1)
+    shaped = padded.reshape(values.shape[:-1] + (blocks, period))
+    prefix = ufunc.accumulate(shaped, axis=-1).reshape(padded.shape)
+    suffix = ufunc.accumulate(shaped[..., ::-1], axis=-1)[..., ::-1].reshape(padded.shape)
+    return ufunc(suffix[..., :length - period + 1], prefix[..., period - 1:length])
+
+
+def rolling_max(values, period: int) -> np.ndarray:
+    """Máximo de cada ventana de `period` valores sobre el último eje"""
+    return _rolling_extreme(values, period, np.maximum)
+
+
+def rolling_min(values, period: int) -> np.ndarray:
+    """Mínimo de cada ventana de `period` valores sobre el último eje"""
+    return _rolling_extreme(values, period, np.minimum)
+
+
+def linear_filter(values, alpha: float, beta: float, initial) -> np.ndarray:
+    """Resuelve y[k] = alpha * y[k - 1] + beta * x[k] sobre el último eje, con y[-1] = initial"""
+    values = as_array(values)
+    initial = np.broadcast_to(as_array(initial), values.shape[:-1])
+    length = values.shape[-1]
+    if length == 0:
+        return values.copy()
+
+    size = min(FILTER_BLOCK, length)
+    blocks = -(-length // size)
+    padding = np.zeros(values.shape[:-1] + (blocks * size - length,))
+    shaped = np.concatenate((values, padding), axis=-1).reshape(values.shape[:-1] + (blocks, size)) * beta
+
+    # kernel[k, j] = alpha ** (k - j) para j <= k: cada bloque es un producto matricial
+    steps = np.arange(size)
+    lags = steps[:, None] - steps[None, :]
+    kernel = np.where(lags >= 0, alpha ** np.maximum(lags, 0), 0.0)
+    partial = shaped @ kernel.T
+
+    # Estado al final de cada bloque anterior: la misma recurrencia sobre los bloques
+    if blocks == 1:
+        incoming = initial[..., None]
+    else:
+        carries = linear_filter(partial[..., :-1, -1], alpha ** size, 1.0, initial)
+        incoming = np.concatenate((initial[..., None], carries), axis=-1)
+
+    result = partial + incoming[..., None] * alpha ** (steps + 1)
+    return result.reshape(values.shape[:-1] + (blocks * size,))[..., :length]
+
+
+def ema(values, period: int) -> np.ndarray:
+    """EMA sembrada con la SMA de los primeros `period` valores, sobre el último eje"""
+    values = as_array(values)
+    multiplier = 2 / (period + 1)
+    seed = values[..., :period].sum(axis=-1) / period
+    rest = linear_filter(values[..., period:], 1 - multiplier, multiplier, seed)
+    return np.concatenate((seed[..., None], rest), axis=-1)
+
+
+def wilder(values, period: int, seed) -> np.ndarray:
+    """Suavizado de Wilder de `values` a partir de `seed`, sin incluir la semilla"""
+    return linear_filter(values, (period - 1) / period, 1 / period, seed)
+
+
+def ratio(numerator: float, denominator: float) -> float:
+    """Cociente que vale 0 donde el código original dividía por cero"""
+    return numerator / denominator if denominator else 0.0
+
+
+def rounded_ema(prices, period: int) -> List[float]:
+    """EMA de TechnicalIndicators: cada valor se redondea antes de calcular el siguiente
+
+    El redondeo dentro de la recurrencia la hace secuencial; se recorre con
+    floats de Python para dar exactamente los valores de siempre.
+    """
+    if isinstance(prices, np.ndarray):
+        prices = prices.tolist()
+    multiplier = 2 / (period + 1)
+    keep = 1 - multiplier
+    value = sum(prices[:period]) / period
+    values = [value]
+    append = values.append
+    for price in prices[period:]:
+        value = round(price * multiplier + value * keep, 2)
+        append(value)
+    return values
+
+
+def rounded_wilder(values: List[float], period: int, seed: float) -> List[float]:
+    """Suavizado de Wilder de TechnicalIndicators, redondeando cada valor, sin la semilla"""
+    result = []
+    append = result.append
+    value = seed
+    for item in values:
+        value = round((value * (period - 1) + item) / period, 2)
+        append(value)
+    return result
+
+
+def true_range(highs, lows, closes) -> np.ndarray:
+    """True Range desde la segunda vela"""
+    highs, lows, closes = as_array(highs), as_array(lows), as_array(closes)
+    prev_close = closes[..., :-1]
+    return np.maximum.reduce((
+        highs[..., 1:] - lows[..., 1:],
+        np.abs(highs[..., 1:] - prev_close),
+        np.abs(lows[..., 1:] - prev_close)
+    ))
+
+
+
+# Indicadores sobre arrays: operan sobre el último eje, así una matriz
+# (activos x velas) se calcula de una vez. Devuelven float64 sin redondear.
+
+def rsi(closes, period: int = 14) -> np.ndarray:
+    """RSI con el suavizado de Wilder"""
+    deltas = np.diff(as_array(closes), axis=-1)
+    gain = np.where(deltas > 0, deltas, 0.0)
+    loss = np.where(deltas < 0, -deltas, 0.0)
+
+    def smooth(values):
+        seed = values[..., :period].mean(axis=-1)
+        return np.concatenate((seed[..., None], wilder(values[..., period:], period, seed)), axis=-1)
+
+    avg_gain, avg_loss = smooth(gain), smooth(loss)
+    rs = avg_gain / np.where(avg_loss == 0, 0.00001, avg_loss)
+    return 100 - (100 / (1 + rs))
+
+
+def macd(closes, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9) -> Dict[str, np.ndarray]:
+    """Líneas MACD, señal e histograma"""
+    closes = as_array(closes)
+    fast = ema(closes, fast_period)
+    slow = ema(closes, slow_period)
+    line = fast[..., slow_period - fast_period:] - slow
+    if line.shape[-1] < signal_period:
+        signal = line[..., :0]
+    else:
+        signal = ema(line, signal_period)
+    return {"macd": line, "signal": signal, "histogram": line[..., line.shape[-1] - signal.shape[-1]:] - signal}
+
+
+def bollinger_bands(closes, period: int = 20, num_std: float = 2) -> Dict[str, np.ndarray]:
+    """Bandas de Bollinger con la desviación estándar poblacional"""
+    middle = rolling_mean(closes, period)
+    width = rolling_std(closes, period) * num_std
+    return {"upper": middle + width, "middle": middle, "lower": middle - width}
+
+
+def stochastic(closes, highs, lows, k_period: int = 14, d_period: int = 3) -> Dict[str, np.ndarray]:
+    """%K y %D del Oscilador Estocástico"""
+    closes = as_array(closes)
+    size = closes.shape[-1]
+    window_high = rolling_max(as_array(highs)[..., :size], k_period)
+    window_low = rolling_min(as_array(lows)[..., :size], k_period)
+    spread = window_high - window_low
+    with np.errstate(divide="ignore", invalid="ignore"):
+        k = np.where(spread == 0, 100.0, (closes[..., k_period - 1:] - window_low) / spread * 100)
+    d = rolling_mean(k, d_period) if k.shape[-1] >= d_period else k[..., :0]
+    return {"k": k, "d": d}
+
+
+def atr(highs, lows, closes, period: int = 14) -> np.ndarray:
+    """Average True Range con el suavizado de Wilder"""
+    true_ranges = true_range(highs, lows, closes)
+    seed = true_ranges[..., :period].sum(axis=-1) / period
+    return np.concatenate((seed[..., None], wilder(true_ranges[..., period:], period, seed)), axis=-1)
+
+
+def adx(highs, lows, closes, period: int = 14) -> Dict[str, np.ndarray]:
+    """ADX, +DI y -DI con el suavizado de Wilder"""
+    highs, lows = as_array(highs), as_array(lows)
+
+    # Calcular True Range y movimientos direccionales
+    tr = true_range(highs, lows, closes)
+    up_move = highs[..., 1:] - highs[..., :-1]
+    down_move = lows[..., :-1] - lows[..., 1:]
+    plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+    minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+
+    # Promedios suavizados (Wilder) de TR y de los movimientos direccionales
+    def smooth(values):
+        seed = values[..., :period].sum(axis=-1) / period
+        return np.concatenate((seed[..., None], wilder(values[..., period:], period, seed)), axis=-1)
+
+    tr_avg = smooth(tr)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        plus_di = smooth(plus_dm) * 100 / tr_avg
+        minus_di = smooth(minus_dm) * 100 / tr_avg
+        di_sum = plus_di + minus_di
+        dx = np.where(di_sum == 0, 0.0, np.abs(plus_di - minus_di) / di_sum * 100)
+
+    return {"adx": smooth(dx), "plus_di": plus_di, "minus_di": minus_di}
+
+
+def ichimoku(highs, lows, tenkan_period: int = 9, kijun_period: int = 26,
+             senkou_b_period: int = 52) -> Dict[str, np.ndarray]:
+    """Líneas del Ichimoku Cloud, alineadas como en TechnicalIndicators.calculate_ichimoku"""
+    chikou_source = as_array(lows)
+    highs = as_array(highs)
+    lows = chikou_source[..., :highs.shape[-1]]
+
+    def donchian(period):
+        return (rolling_max(highs, period) + rolling_min(lows, period)) / 2
+
+    tenkan, kijun = donchian(tenkan_period), donchian(kijun_period)
+    # Emparejamiento heredado: cada kijun se promedia con un tenkan anterior
+    size = min(tenkan.shape[-1], kijun.shape[-1])
+    return {
+        "tenkan": tenkan,
+        "kijun": kijun,
+        "senkou_a": (tenkan[..., :size] + kijun[..., :size]) / 2,
+        "senkou_b": donchian(senkou_b_period),
+        "chikou": chikou_source[..., kijun_period:]
+    }
+
 
 class TechnicalIndicators:
+    """Indicadores como listas redondeadas a 2 decimales (ver ArrayIndicators para arrays)"""
+
     @staticmethod
     def calculate_sma(prices: List[float], period: int) -> List[float]:
         """Calcula la Media Móvil Simple (SMA)"""
         if len(prices) < period:
             return []
 
-        sma_values = []
-        for i in range(len(prices) - period + 1):
-            sma = sum(prices[i:(i + period)]) / period
-            sma_values.append(round(sma, 2))
-        return sma_values
+        return round_list(rolling_mean(prices, period))
 
     @staticmethod
     def calculate_ema(prices: List[float], period: int) -> List[float]:
@@ -21,13 +300,7 @@ class TechnicalIndicators:
         if len(prices) < period:
             return []
 
-        multiplier = 2 / (period + 1)
-        ema_values = [sum(prices[:period]) / period]
-
-        for price in prices[period:]:
-            ema = (price * multiplier) + (ema_values[-1] * (1 - multiplier))
-            ema_values.append(round(ema, 2))
-        return ema_values
+        return rounded_ema(prices, period)
 
     @staticmethod
     def calculate_rsi(prices: List[float], period: int = 14) -> List[float]:
@@ -35,42 +308,29 @@ class TechnicalIndicators:
         if len(prices) < period + 1:
             return []
 
-        deltas = np.diff(prices)
-        gain = np.where(deltas > 0, deltas, 0)
-        loss = np.where(deltas < 0, -deltas, 0)
-
-        avg_gain = np.concatenate(([np.mean(gain[:period])], gain[period:]))
-        avg_loss = np.concatenate(([np.mean(loss[:period])], loss[period:]))
-
-        for i in range(1, len(avg_gain)):
-            avg_gain[i] = (avg_gain[i - 1] * (period - 1) + gain[period + i - 1]) / period
-            avg_loss[i] = (avg_loss[i - 1] * (period - 1) + loss[period + i - 1]) / period
-
-        rs = avg_gain / np.where(avg_loss == 0, 0.00001, avg_loss)
-        rsi = 100 - (100 / (1 + rs))
-        return [round(x, 2) for x in rsi.tolist()]
+        return round_list(rsi(prices, period))
 
     @staticmethod
-    def calculate_macd(prices: List[float], fast_period: int = 12, slow_period: int = 26, signal_period: int = 9) -> \
-    Dict[str, List[float]]:
-        """Calcula el MACD (Moving Average Convergence Divergence)"""
+    def calculate_macd(prices: List[float], fast_period: int = 12, slow_period: int = 26, signal_period: int = 9,
+                       fast_ema: List[float] = None, slow_ema: List[float] = None) -> Dict[str, List[float]]:
+        """Calcula el MACD (Moving Average Convergence Divergence)
+
+        Acepta las EMA de calculate_ema ya calculadas para reutilizarlas.
+        """
         if len(prices) < slow_period:
             return {"macd": [], "signal": [], "histogram": []}
 
-        fast_ema = TechnicalIndicators.calculate_ema(prices, fast_period)
-        slow_ema = TechnicalIndicators.calculate_ema(prices, slow_period)
-
-        macd_line = []
-        for i in range(len(slow_ema)):
-            macd = fast_ema[i + (len(fast_ema) - len(slow_ema))] - slow_ema[i]
-            macd_line.append(round(macd, 2))
+        if fast_ema is None:
+            fast_ema = TechnicalIndicators.calculate_ema(prices, fast_period)
+        if slow_ema is None:
+            slow_ema = TechnicalIndicators.calculate_ema(prices, slow_period)
+        fast_ema, slow_ema = np.asarray(fast_ema), np.asarray(slow_ema)
 
+        macd_line = round_list(fast_ema[len(fast_ema) - len(slow_ema):] - slow_ema)
         signal_line = TechnicalIndicators.calculate_ema(macd_line, signal_period)
-
-        histogram = []
-        for i in range(len(signal_line)):
-            hist = macd_line[i + (len(macd_line) - len(signal_line))] - signal_line[i]
-            histogram.append(round(hist, 2))
+        histogram = round_list(
+            np.asarray(macd_line[len(macd_line) - len(signal_line):]) - np.asarray(signal_line)
+        )
 
         return {
             "macd": macd_line,
@@ -90,23 +350,20 @@ class TechnicalIndicators:
             return {"upper": [], "middle": [], "lower": []}
 
         sma = TechnicalIndicators.calculate_sma(prices, period)
-        std = []
-
-        for i in range(len(prices) - period + 1):
-            window = prices[i:(i + period)]
-            std.append(np.std(window))
+        std = rolling_std(prices, period)
 
-        upper_band = [sma[i] + (std[i] * num_std) for i in range(len(sma))]
-        lower_band = [sma[i] - (std[i] * num_std) for i in range(len(sma))]
+        middle = np.asarray(sma)
+        upper_band = middle + std * num_std
+        lower_band = middle - std * num_std
 
         return {
-            "upper": [round(x, 2) for x in upper_band],
-            "middle": [round(x, 2) for x in sma],
-            "lower": [round(x, 2) for x in lower_band],
+            "upper": round_list(upper_band),
+            "middle": round_list(middle),
+            "lower": round_list(lower_band),
             "current": {
-                "upper": upper_band[-1] if upper_band else None,
+                "upper": upper_band[-1].item() if len(upper_band) else None,
                 "middle": sma[-1] if sma else None,
-                "lower": lower_band[-1] if lower_band else None
+                "lower": lower_band[-1].item() if len(lower_band) else None
             }
         }
 
@@ -117,18 +374,14 @@ class TechnicalIndicators:
         if len(prices) < k_period:
             return {"k": [], "d": []}
 
-        k_values = []
-
-        for i in range(len(prices) - k_period + 1):
-            window_high = max(highs[i:i + k_period])
-            window_low = min(lows[i:i + k_period])
-
-            if window_high == window_low:
-                k = 100
-            else:
-                k = ((prices[i + k_period - 1] - window_low) / (window_high - window_low)) * 100
-            k_values.append(round(k, 2))
+        window_high = rolling_max(highs[:len(prices)], k_period)
+        window_low = rolling_min(lows[:len(prices)], k_period)
+        closes = as_array(prices)[k_period - 1:]
+        spread = window_high - window_low
 
+        with np.errstate(divide="ignore", invalid="ignore"):
+            k = np.where(spread == 0, 100, (closes - window_low) / spread * 100)
+        k_values = round_list(k)
         d_values = TechnicalIndicators.calculate_sma(k_values, d_period)
 
         return {
@@ -146,26 +399,9 @@ class TechnicalIndicators:
         if len(highs) < period:
             return []
 
-        true_ranges = []
-        for i in range(1, len(highs)):
-            high = highs[i]
-            low = lows[i]
-            prev_close = closes[i - 1]
-
-            tr1 = high - low
-            tr2 = abs(high - prev_close)
-            tr3 = abs(low - prev_close)
-
-            true_range = max(tr1, tr2, tr3)
-            true_ranges.append(true_range)
-
-        atr_values = [sum(true_ranges[:period]) / period]
-
-        for i in range(period, len(true_ranges)):
-            atr = (atr_values[-1] * (period - 1) + true_ranges[i]) / period
-            atr_values.append(round(atr, 2))
-
-        return atr_values
+        true_ranges = true_range(highs, lows, closes[:len(highs)]).tolist()
+        seed = sum(true_ranges[:period]) / period
+        return [seed] + rounded_wilder(true_ranges[period:], period, seed)
 
     @staticmethod
     def calculate_adx(highs: List[float], lows: List[float], closes: List[float], period: int = 14) -> Dict[
@@ -174,59 +410,34 @@ class TechnicalIndicators:
         if len(highs) < period + 1:
             return {"adx": [], "plus_di": [], "minus_di": []}
 
-        # Calcular True Range
-        tr = []
-        plus_dm = []
-        minus_dm = []
-
-        for i in range(1, len(highs)):
-            high = highs[i]
-            low = lows[i]
-            prev_high = highs[i - 1]
-            prev_low = lows[i - 1]
-            prev_close = closes[i - 1]
-
-            tr1 = high - low
-            tr2 = abs(high - prev_close)
-            tr3 = abs(low - prev_close)
-            tr.append(max(tr1, tr2, tr3))
-
-            plus_dm1 = high - prev_high
-            minus_dm1 = prev_low - low
-
-            if plus_dm1 > minus_dm1 and plus_dm1 > 0:
-                plus_dm.append(plus_dm1)
-            else:
-                plus_dm.append(0)
-
-            if minus_dm1 > plus_dm1 and minus_dm1 > 0:
-                minus_dm.append(minus_dm1)
-            else:
-                minus_dm.append(0)
-
-        # Calcular los promedios
-        tr_avg = [sum(tr[:period]) / period]
-        plus_di_avg = [sum(plus_dm[:period]) / period * 100 / tr_avg[0]]
-        minus_di_avg = [sum(minus_dm[:period]) / period * 100 / tr_avg[0]]
-
+        # True Range y movimientos direccionales, vectorizados
+        highs, lows = as_array(highs), as_array(lows)
+        tr = true_range(highs, lows, as_array(closes)[:len(highs)]).tolist()
+        up_move = highs[1:] - highs[:-1]
+        down_move = lows[:-1] - lows[1:]
+        plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0).tolist()
+        minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0).tolist()
+
+        # Promedios de Wilder de TR y de los movimientos direccionales; el DI
+        # se calcula de ellos en cada vela sin realimentarse
+        tr_avg = sum(tr[:period]) / period
+        plus_avg = sum(plus_dm[:period]) / period
+        minus_avg = sum(minus_dm[:period]) / period
+        plus_di_avg = [ratio(plus_avg * 100, tr_avg)]
+        minus_di_avg = [ratio(minus_avg * 100, tr_avg)]
         for i in range(period, len(tr)):
-            tr_avg.append((tr_avg[-1] * (period - 1) + tr[i]) / period)
-            plus_di = (plus_di_avg[-1] * (period - 1) + plus_dm[i]) / period
-            minus_di = (minus_di_avg[-1] * (period - 1) + minus_dm[i]) / period
-
-            plus_di_avg.append(plus_di * 100 / tr_avg[-1])
-            minus_di_avg.append(minus_di * 100 / tr_avg[-1])
-
-        # Calcular ADX
-        dx_values = []
-        for i in range(len(plus_di_avg)):
-            dx = abs(plus_di_avg[i] - minus_di_avg[i]) / (plus_di_avg[i] + minus_di_avg[i]) * 100
-            dx_values.append(dx)
-
-        adx_values = [sum(dx_values[:period]) / period]
-        for i in range(period, len(dx_values)):
-            adx = (adx_values[-1] * (period - 1) + dx_values[i]) / period
-            adx_values.append(round(adx, 2))
+            tr_avg = (tr_avg * (period - 1) + tr[i]) / period
+            plus_avg = (plus_avg * (period - 1) + plus_dm[i]) / period
+            minus_avg = (minus_avg * (period - 1) + minus_dm[i]) / period
+            plus_di_avg.append(ratio(plus_avg * 100, tr_avg))
+            minus_di_avg.append(ratio(minus_avg * 100, tr_avg))
+
+        dx_values = [
+            ratio(abs(plus - minus), plus + minus) * 100
+            for plus, minus in zip(plus_di_avg, minus_di_avg)
+        ]
+        seed = sum(dx_values[:period]) / period
+        adx_values = [seed] + rounded_wilder(dx_values[period:], period, seed)
 
         return {
             "adx": adx_values,
@@ -254,38 +465,194 @@ class TechnicalIndicators:
                 "chikou": []
             }
 
-        def donchian(high_prices: List[float], low_prices: List[float], period: int) -> List[float]:
-            result = []
-            for i in range(len(high_prices) - period + 1):
-                highest = max(high_prices[i:i + period])
-                lowest = min(low_prices[i:i + period])
-                result.append((highest + lowest) / 2)
-            return result
+        lines = ichimoku(highs, lows, tenkan_period, kijun_period, senkou_b_period)
+        tenkan, kijun, senkou_a = lines["tenkan"], lines["kijun"], lines["senkou_a"]
+        senkou_b, chikou = lines["senkou_b"], lines["chikou"]
 
-        # Cálculo de las líneas
-        tenkan = donchian(highs, lows, tenkan_period)
-        kijun = donchian(highs, lows, kijun_period)
-        senkou_b = donchian(highs, lows, senkou_b_period)
+        return {
+            "tenkan": round_list(tenkan),
+            "kijun": round_list(kijun),
+            "senkou_a": round_list(senkou_a),
+            "senkou_b": round_list(senkou_b),
+            "chikou": round_list(chikou),
+            "current": {
+                "tenkan": tenkan[-1].item() if len(tenkan) else None,
+                "kijun": kijun[-1].item() if len(kijun) else None,
+                "senkou_a": senkou_a[-1].item() if len(senkou_a) else None,
+                "senkou_b": senkou_b[-1].item() if len(senkou_b) else None,
+                "chikou": chikou[-1].item() if len(chikou) else None
+            }
+        }
 
-        # Senkou Span A (Promedio de Tenkan y Kijun)
-        senkou_a = []
-        for i in range(min(len(tenkan), len(kijun))):
-            senkou_a.append((tenkan[i] + kijun[i]) / 2)
 
-        # Chikou Span (Precio de cierre desplazado 26 períodos hacia atrás)
-        chikou = lows[kijun_period:]
+def stack_candles(candles_by_asset: Dict[str, List[dict]], size: int = None) -> Dict[str, np.ndarray]:
+    """Apila las últimas `size` velas de cada activo en matrices (activos x velas)
 
-        return {
-            "tenkan": [round(x, 2) for x in tenkan],
-            "kijun": [round(x, 2) for x in kijun],
-            "senkou_a": [round(x, 2) for x in senkou_a],
-            "senkou_b": [round(x, 2) for x in senkou_b],
-            "chikou": [round(x, 2) for x in chikou],
-            "current": {
-                "tenkan": tenkan[-1] if tenkan else None,
-                "kijun": kijun[-1] if kijun else None,
-                "senkou_a": senkou_a[-1] if senkou_a else None,
-                "senkou_b": senkou_b[-1] if senkou_b else None,
-                "chikou": chikou[-1] if chikou else None
+    Sin `size` se usa el histórico más corto; los activos con menos velas se descartan.
+    """
+    lengths = [len(candles) for candles in candles_by_asset.values() if candles]
+    if size is None:
+        size = min(lengths) if lengths else 0
+    assets = [asset for asset, candles in candles_by_asset.items() if candles and len(candles) >= size]
+    columns = {}
+    for column in ("close", "high", "low", "time"):
+        columns[column] = np.array(
+            [[candle[column] for candle in candles_by_asset[asset][-size:]] for asset in assets],
+            dtype=np.float64
+        ).reshape(len(assets), size)
+    columns["assets"] = assets
+    return columns
+
+
+class ArrayIndicators:
+    """Los indicadores de TechnicalIndicators como arrays float64 de solo lectura
+
+    No se redondea ni se convierte a listas: los indicadores encadenados usan
+    los valores exactos y el redondeo queda para la presentación (present).
+    Aceptan matrices (activos x velas) igual que las funciones del módulo.
+    """
+
+    @staticmethod
+    def calculate_sma(prices, period: int) -> np.ndarray:
+        """Calcula la Media Móvil Simple (SMA)"""
+        prices = as_array(prices)
+        return readonly(rolling_mean(prices, period) if prices.shape[-1] >= period else prices[..., :0])
+
+    @staticmethod
+    def calculate_ema(prices, period: int) -> np.ndarray:
+        """Calcula la Media Móvil Exponencial (EMA)"""
+        prices = as_array(prices)
+        return readonly(ema(prices, period) if prices.shape[-1] >= period else prices[..., :0])
+
+    @staticmethod
+    def calculate_rsi(prices, period: int = 14) -> np.ndarray:
+        """Calcula el Índice de Fuerza Relativa (RSI)"""
+        prices = as_array(prices)
+        return readonly(rsi(prices, period) if prices.shape[-1] >= period + 1 else prices[..., :0])
+
+    @staticmethod
+    def calculate_macd(prices, fast_period: int = 12, slow_period: int = 26,
+                       signal_period: int = 9) -> Dict[str, np.ndarray]:
+        """Calcula el MACD (Moving Average Convergence Divergence)"""
+        prices = as_array(prices)
+        if prices.shape[-1] < slow_period:
+            return ArrayIndicators.__empty(prices, "macd", "signal", "histogram")
+        return ArrayIndicators.__readonly(macd(prices, fast_period, slow_period, signal_period))
+
+    @staticmethod
+    def calculate_bollinger_bands(prices, period: int = 20, num_std: float = 2) -> Dict[str, np.ndarray]:
+        """Calcula las Bandas de Bollinger"""
+        prices = as_array(prices)
+        if prices.shape[-1] < period:
+            return ArrayIndicators.__empty(prices, "upper", "middle", "lower")
+        return ArrayIndicators.__readonly(bollinger_bands(prices, period, num_std))
+
+    @staticmethod
+    def calculate_stochastic(prices, highs, lows, k_period: int = 14, d_period: int = 3) -> Dict[str, np.ndarray]:
+        """Calcula el Oscilador Estocástico"""
+        prices = as_array(prices)
+        if prices.shape[-1] < k_period:
+            return ArrayIndicators.__empty(prices, "k", "d")
+        return ArrayIndicators.__readonly(stochastic(prices, highs, lows, k_period, d_period))
+
+    @staticmethod
+    def calculate_atr(highs, lows, closes, period: int = 14) -> np.ndarray:
+        """Calcula el Average True Range (ATR)"""
+        closes = as_array(closes)
+        return readonly(atr(highs, lows, closes, period) if closes.shape[-1] >= period else closes[..., :0])
+
+    @staticmethod
+    def calculate_adx(highs, lows, closes, period: int = 14) -> Dict[str, np.ndarray]:
+        """Calcula el Average Directional Index (ADX)"""
+        closes = as_array(closes)
+        if closes.shape[-1] < period + 1:
+            return ArrayIndicators.__empty(closes, "adx", "plus_di", "minus_di")
+        return ArrayIndicators.__readonly(adx(highs, lows, closes, period))
+
+    @staticmethod
+    def calculate_ichimoku(highs, lows, tenkan_period: int = 9, kijun_period: int = 26,
+                           senkou_b_period: int = 52) -> Dict[str, np.ndarray]:
+        """Calcula el Ichimoku Cloud"""
+        highs = as_array(highs)
+        if highs.shape[-1] < senkou_b_period:
+            return ArrayIndicators.__empty(highs, "tenkan", "kijun", "senkou_a", "senkou_b", "chikou")
+        return ArrayIndicators.__readonly(ichimoku(highs, lows, tenkan_period, kijun_period, senkou_b_period))
+
+    @staticmethod
+    def series(indicator: str, closes, highs=None, lows=None, params: dict = None) -> Dict[str, np.ndarray]:
+        """Calcula el indicador por nombre, con los parámetros de calculate_indicator"""
+        params = params or {}
+        indicator = indicator.upper()
+        if indicator == "RSI":
+            return {"rsi": ArrayIndicators.calculate_rsi(closes, params.get("period", 14))}
+        if indicator == "SMA":
+            return {"sma": ArrayIndicators.calculate_sma(closes, params.get("period", 20))}
+        if indicator == "EMA":
+            return {"ema": ArrayIndicators.calculate_ema(closes, params.get("period", 20))}
+        if indicator == "MACD":
+            return ArrayIndicators.calculate_macd(
+                closes, params.get("fast_period", 12), params.get("slow_period", 26), params.get("signal_period", 9)
+            )
+        if indicator == "BOLLINGER":
+            return ArrayIndicators.calculate_bollinger_bands(closes, params.get("period", 20), params.get("std", 2))
+        if indicator == "STOCHASTIC":
+            return ArrayIndicators.calculate_stochastic(
+                closes, highs, lows, params.get("k_period", 14), params.get("d_period", 3)
+            )
+        if indicator == "ATR":
+            return {"atr": ArrayIndicators.calculate_atr(highs, lows, closes, params.get("period", 14))}
+        if indicator == "ADX":
+            return ArrayIndicators.calculate_adx(highs, lows, closes, params.get("period", 14))
+        if indicator == "ICHIMOKU":
+            return ArrayIndicators.calculate_ichimoku(
+                highs, lows, params.get("tenkan_period", 9), params.get("kijun_period", 26),
+                params.get("senkou_b_period", 52)
+            )
+        raise ValueError(f"Indicador '{indicator}' no soportado")
+
+    @staticmethod
+    def __empty(values, *names):
+        return {name: readonly(values[..., :0]) for name in names}
+
+    @staticmethod
+    def __readonly(series):
+        return {name: readonly(values) for name, values in series.items()}
+
+
+class BatchIndicators:
+    """Calcula un indicador para muchos activos a la vez sobre matrices (activos x velas)
+
+    Los resultados por activo tienen el formato de TechnicalIndicators. Los
+    valores intermedios no se redondean, así que MACD, Bollinger y el %D del
+    Estocástico pueden diferir en el último decimal de los de
+    TechnicalIndicators; EMA, ATR y ADX, que allí redondean dentro de la
+    recurrencia, difieren algo más, y su primer valor sale redondeado.
+    Con `as_array` cada activo recibe filas de solo lectura sin redondear.
+    """
+
+    @staticmethod
+    def compute(indicator: str, closes, highs=None, lows=None, params: dict = None) -> Dict[str, np.ndarray]:
+        """Calcula las series del indicador como matrices float64 sin redondear"""
+        return ArrayIndicators.series(indicator, closes, highs, lows, params)
+
+    @staticmethod
+    def calculate(indicator: str, assets: List[str], closes, highs=None, lows=None,
+                  params: dict = None, as_array: bool = False) -> Dict[str, dict]:
+        """Calcula el indicador para cada fila y devuelve los resultados por activo"""
+        series = BatchIndicators.compute(indicator, closes, highs, lows, params)
+        output = series if as_array else {name: round_list(values) for name, values in series.items()}
+        results = {}
+        for row, asset in enumerate(assets):
+            result = {name: values[row] for name, values in output.items()}
+            current = {
+                name: values[row, -1].item() if values.shape[-1] else None
+                for name, values in series.items()
             }
-        }
\ No newline at end of file
+            if len(series) == 1:
+                name = next(iter(series))
+                result["current"] = current[name]
+                result["history_size"] = len(result[name])
+            else:
+                result["current"] = current
+            results[asset] = result
+        return results
@@ -1,5 +1,5 @@
 import time
-from quotexapi.utils.services import group_by_period
+import numpy as np
 
 
 def get_color(candle):
@@ -53,60 +53,87 @@ def get_last_n_candles(pair, candles, n=3):
     return last_n_candles
 
 
-def process_candles(history, period):
-    candles = []
-    current_candle = {
-        'open': None,
-        'high': float('-inf'),
-        'low': float('inf'),
-        'close': None,
-        'start_time': None,
-        'end_time': None,
-        'ticks': 0
+def tick_columns(history):
+    """Split a tick list into ``(times, prices)`` arrays.
+
+    Ticks are ``[time, price, ...]`` lists or dicts with ``time`` and
+    ``price``; a ``(n, 2+)`` array is split into its first two columns.
+    """
+    if isinstance(history, np.ndarray):
+        return history[:, 0], history[:, 1]
+    if len(history) and isinstance(history[0], dict):
+        return np.array([tick['time'] for tick in history]), np.array([tick['price'] for tick in history])
+    return np.array([tick[0] for tick in history]), np.array([tick[1] for tick in history])
+
+
+def candle_columns(times, prices, period, running=False):
+    """Group ticks by ``time // period`` and reduce every group to a candle.
+
+    :param times: The tick times.
+    :param prices: The tick prices.
+    :param period: The candle size in seconds.
+    :param bool running: Group by the running maximum of ``time // period``
+        in arrival order, so a late tick joins the candle in progress the
+        way :func:`process_candles` does. Otherwise ticks are grouped by
+        their own key.
+    :returns: A dict of arrays, one item per candle ordered by key:
+        ``key``, ``open``, ``close``, ``high``, ``low``, ``ticks`` and
+        ``first``, the index of the first tick of the candle.
+    """
+    times, prices = np.asarray(times), np.asarray(prices)
+    keys = np.floor_divide(times, period)
+    if running:
+        order = np.arange(len(keys))
+        keys = np.maximum.accumulate(keys)
+    else:
+        order = np.argsort(keys, kind='stable')
+        keys, prices = keys[order], prices[order]
+    if not len(keys):
+        empty = keys[:0]
+        return {'key': empty, 'open': prices[:0], 'close': prices[:0], 'high': prices[:0],
+                'low': prices[:0], 'ticks': order[:0], 'first': order[:0]}
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    ends = np.append(starts[1:], len(keys))
+    return {
+        'key': keys[starts],
+        'open': prices[starts],
+        'close': prices[ends - 1],
+        'high': np.maximum.reduceat(prices, starts),
+        'low': np.minimum.reduceat(prices, starts),
+        'ticks': ends - starts,
+        'first': order[starts]
     }
 
-    start_time = None
-    timestamp = None
-    price = 0
-    for entry in history:
-        if isinstance(entry, dict):
-            timestamp = entry['time']
-            price = entry['price']
-        elif isinstance(entry, list):
-            timestamp, price, _ = entry
-        if start_time is None:
-            start_time = timestamp - (timestamp % period)
-
-        end_time = start_time + period
-        if timestamp >= end_time:
-
-            # Concluir a vela atual
-            candles.append(current_candle)
-
-            # Resetar para a próxima vela
-            start_time = timestamp - (timestamp % period)
-            current_candle = {
-                'open': price,
-                'high': price,
-                'low': price,
-                'close': price,
-                'start_time': start_time,
-                'end_time': start_time + period,
-                'ticks': 1
-            }
 
-        else:
-            if current_candle['open'] is None:
-                current_candle['open'] = price
-            current_candle['close'] = price
-            current_candle['high'] = max(current_candle['high'], price)
-            current_candle['low'] = min(current_candle['low'], price)
-            current_candle['end_time'] = end_time
-            current_candle['ticks'] += 1
-
-    # Adicionar a última vela se não estiver vazia
-    if current_candle['open'] is not None:
-        candles.append(current_candle)
+def process_candles(history, period):
+    times, prices = tick_columns(history)
+    if not len(times):
+        return []
+    columns = candle_columns(times, prices, period, running=True)
+    # Como en el bucle original, la vela se abre en el primer tick que supera la anterior
+    opened = times[columns['first']]
+    start_times = (opened - opened % period).tolist()
+    candles = [
+        {
+            'open': open_price,
+            'high': high,
+            'low': low,
+            'close': close,
+            'start_time': start_time,
+            'end_time': start_time + period,
+            'ticks': ticks
+        }
+        for open_price, high, low, close, start_time, ticks in zip(
+            columns['open'].tolist(),
+            columns['high'].tolist(),
+            columns['low'].tolist(),
+            columns['close'].tolist(),
+            start_times,
+            columns['ticks'].tolist()
+        )
+    ]
+    # La primera vela nunca recibía start_time
+    candles[0]['start_time'] = None
 
     return candles[:-1]
 
@@ -119,36 +146,74 @@ def process_candles_v2(history, asset, data):
 
 
 def calculate_candles(history, period):
-    grouped = group_by_period(history, period)
-    candles = []
-    for minute, ticks in grouped.items():
-        open_price = ticks[0][1]
-        close_price = ticks[-1][1]
-        high_price = max(tick[1] for tick in ticks)
-        low_price = min(tick[1] for tick in ticks)
-        num_ticks = len(ticks)
-        candle = {
+    times, prices = tick_columns(history)
+    columns = candle_columns(times, prices, period)
+    # Velas en el orden en que aparece su primer tick
+    order = np.argsort(columns['first'], kind='stable')
+    minutes = columns['key'][order].astype(np.int64).tolist()
+    candles = [
+        {
             'time': minute * period,
             'open': open_price,
-            'close': close_price,
-            'high': high_price,
-            'low': low_price,
-            'ticks': num_ticks
+            'close': close,
+            'high': high,
+            'low': low,
+            'ticks': ticks
         }
-        candles.append(candle)
+        for minute, open_price, close, high, low, ticks in zip(
+            minutes,
+            columns['open'][order].tolist(),
+            columns['close'][order].tolist(),
+            columns['high'][order].tolist(),
+            columns['low'][order].tolist(),
+            columns['ticks'][order].tolist()
+        )
+    ]
     candles = candles[:-1]
 
     return candles
 
 
+def ticks_to_candles(ticks, period):
+    """Build every candle of a tick list, the last one included.
+
+    Ticks are ``[time, price, ...]`` lists or dicts with ``time`` and ``price``.
+    """
+    candles = {}
+    for tick in ticks:
+        if isinstance(tick, dict):
+            timestamp, price = tick['time'], tick['price']
+        else:
+            timestamp, price = tick[0], tick[1]
+        start = int(timestamp // period * period)
+        candle = candles.get(start)
+        if candle is None:
+            candles[start] = {
+                'time': start,
+                'open': price,
+                'close': price,
+                'high': price,
+                'low': price,
+                'ticks': 1
+            }
+            continue
+        candle['close'] = price
+        candle['high'] = max(candle['high'], price)
+        candle['low'] = min(candle['low'], price)
+        candle['ticks'] += 1
+    return [candles[start] for start in sorted(candles)]
+
+
 def merge_candles(candles_data):
-    seen_times = set()
-    merged_list = []
-    for candle in candles_data:
-        if isinstance(candle, dict) and candle.get('time') not in seen_times:
-            seen_times.add(candle['time'])
-            merged_list.append(candle)
-    merged_list.sort(key=lambda x: x['time'])
+    candles = [
+        candle for candle in candles_data
+        if isinstance(candle, dict) and candle.get('time') is not None
+    ]
+    if not candles:
+        return []
+    # np.unique ordena por tiempo y devuelve la primera vela de cada tiempo
+    _, first = np.unique(np.array([candle['time'] for candle in candles]), return_index=True)
+    merged_list = [candles[i] for i in first.tolist()]
 
     return merged_list
 
@@ -167,4 +232,39 @@ def aggregate_candle(tick, candles):
         candle['high'] = max(candle['high'], data['high'])
         candle['low'] = min(candle['low'], data['low'])
 
-    return candles
\ No newline at end of file
+    return candles
+
+
+def normalize_candle(candle):
+    """Convert a candle of history/load or history/list/v2 into a dict.
+
+    Accepts dicts with ``time`` (or ``timestamp``) and ``[time, open, close,
+    high, low, ticks]`` lists. Returns None for anything else.
+    """
+    if isinstance(candle, dict):
+        timestamp = candle.get('time', candle.get('timestamp'))
+        if timestamp is None or candle.get('open') is None:
+            return None
+        return {
+            'time': int(timestamp),
+            'open': candle['open'],
+            'close': candle['close'],
+            'high': candle['high'],
+            'low': candle['low'],
+            'ticks': candle.get('ticks', 0)
+        }
+    if isinstance(candle, (list, tuple)) and len(candle) >= 5:
+        return {
+            'time': int(candle[0]),
+            'open': candle[1],
+            'close': candle[2],
+            'high': candle[3],
+            'low': candle[4],
+            'ticks': candle[5] if len(candle) > 5 else 0
+        }
+    return None
+
+
+def normalize_candles(candles):
+    normalized = (normalize_candle(candle) for candle in candles or [])
+    return [candle for candle in normalized if candle is not None]
@@ -0,0 +1,425 @@
+"""Module for streaming technical indicators.
+
+Each indicator keeps the state of the candles closed so far, so folding a
+new candle in costs O(1). :meth:`StreamingIndicator.update` evaluates the
+candle in progress without committing it, :meth:`StreamingIndicator.close`
+commits a closed candle. Values follow the ``current`` entries of
+:class:`TechnicalIndicators <quotexapi.utils.indicators.TechnicalIndicators>`
+without rounding, except the Ichimoku ``senkou_a`` (see :class:`Ichimoku`).
+"""
+import math
+from collections import deque
+
+
+class RollingExtreme(object):
+    """Max (or min) of the last ``size`` committed values, with a monotonic deque."""
+
+    def __init__(self, size, greater=True):
+        self.size = size
+        self.greater = greater
+        self.items = deque()
+        self.count = 0
+
+    def push(self, value):
+        if self.size <= 0:
+            return
+        items = self.items
+        if self.greater:
+            while items and items[-1][1] <= value:
+                items.pop()
+        else:
+            while items and items[-1][1] >= value:
+                items.pop()
+        items.append((self.count, value))
+        self.count += 1
+        if items[0][0] <= self.count - 1 - self.size:
+            items.popleft()
+
+    def peek(self, value):
+        """The extreme of the committed window together with ``value``."""
+        if not self.items:
+            return value
+        extreme = self.items[0][1]
+        return max(extreme, value) if self.greater else min(extreme, value)
+
+
+class StreamingIndicator(object):
+    """Base class of the streaming indicators."""
+
+    #: Number of closed candles needed before the first value.
+    warmup = 1
+
+    def __init__(self):
+        self.value = None
+
+    def seed(self, candles):
+        """Fold historical candles, oldest first.
+
+        :param candles: An iterable of candle dicts with ``close``, ``high`` and ``low``.
+        :returns: The value after the last candle.
+        """
+        for candle in candles:
+            self.close(candle)
+        return self.value
+
+    def update(self, candle):
+        """Evaluate the candle in progress without committing it."""
+        return self.step(candle, False)
+
+    def close(self, candle):
+        """Commit a closed candle."""
+        self.value = self.step(candle, True)
+        return self.value
+
+    def step(self, candle, commit):
+        raise NotImplementedError
+
+
+class SMA(StreamingIndicator):
+
+    def __init__(self, period=20):
+        super().__init__()
+        self.period = self.warmup = period
+        self.window = deque()
+        self.total = 0.0
+
+    def step(self, candle, commit, price=None):
+        price = float(candle["close"]) if price is None else price
+        total = self.total + price
+        size = len(self.window) + 1
+        if size > self.period:
+            total -= self.window[0]
+            size -= 1
+        if commit:
+            self.window.append(price)
+            if len(self.window) > self.period:
+                self.window.popleft()
+            self.total = total
+        return total / size if size == self.period else None
+
+    def push(self, price, commit=True):
+        """Fold a raw value instead of a candle close."""
+        value = self.step(None, commit, price)
+        if commit:
+            self.value = value
+        return value
+
+
+class EMA(StreamingIndicator):
+
+    def __init__(self, period=20):
+        super().__init__()
+        self.period = self.warmup = period
+        self.multiplier = 2 / (period + 1)
+        self.count = 0
+        self.total = 0.0
+        self.ema = None
+
+    def step(self, candle, commit, price=None):
+        price = float(candle["close"]) if price is None else price
+        if self.ema is None:
+            count = self.count + 1
+            total = self.total + price
+            ema = total / count if count == self.period else None
+            if commit:
+                self.count, self.total, self.ema = count, total, ema
+            return ema
+        ema = price * self.multiplier + self.ema * (1 - self.multiplier)
+        if commit:
+            self.ema = ema
+        return ema
+
+    def push(self, price, commit=True):
+        """Fold a raw value instead of a candle close."""
+        value = self.step(None, commit, price)
+        if commit:
+            self.value = value
+        return value
+
+
+class RSI(StreamingIndicator):
+
+    def __init__(self, period=14):
+        super().__init__()
+        self.period = period
+        self.warmup = period + 1
+        self.previous = None
+        self.count = 0
+        self.gain = 0.0
+        self.loss = 0.0
+
+    def step(self, candle, commit):
+        price = float(candle["close"])
+        if self.previous is None:
+            if commit:
+                self.previous = price
+            return None
+        delta = price - self.previous
+        gain, loss = max(delta, 0.0), max(-delta, 0.0)
+        period = self.period
+        count = self.count + 1
+        if count <= period:
+            avg_gain = (self.gain * (count - 1) + gain) / count
+            avg_loss = (self.loss * (count - 1) + loss) / count
+        else:
+            avg_gain = (self.gain * (period - 1) + gain) / period
+            avg_loss = (self.loss * (period - 1) + loss) / period
+        if commit:
+            self.previous, self.count, self.gain, self.loss = price, count, avg_gain, avg_loss
+        if count < period:
+            return None
+        rs = avg_gain / (avg_loss if avg_loss != 0 else 0.00001)
+        return 100 - (100 / (1 + rs))
+
+
+class MACD(StreamingIndicator):
+
+    def __init__(self, fast_period=12, slow_period=26, signal_period=9):
+        super().__init__()
+        self.warmup = slow_period + signal_period - 1
+        self.fast = EMA(fast_period)
+        self.slow = EMA(slow_period)
+        self.signal = EMA(signal_period)
+
+    def step(self, candle, commit):
+        price = float(candle["close"])
+        fast = self.fast.push(price, commit)
+        slow = self.slow.push(price, commit)
+        if fast is None or slow is None:
+            return None
+        macd = fast - slow
+        signal = self.signal.push(macd, commit)
+        return {
+            "macd": macd,
+            "signal": signal,
+            "histogram": None if signal is None else macd - signal
+        }
+
+
+class BollingerBands(StreamingIndicator):
+
+    def __init__(self, period=20, num_std=2):
+        super().__init__()
+        self.period = self.warmup = period
+        self.num_std = num_std
+        self.window = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def step(self, candle, commit):
+        price = float(candle["close"])
+        size, mean, m2 = len(self.window), self.mean, self.m2
+        # Welford add/remove keeps the window variance stable
+        size += 1
+        delta = price - mean
+        mean += delta / size
+        m2 += delta * (price - mean)
+        if size > self.period:
+            oldest = self.window[0]
+            size -= 1
+            delta = oldest - mean
+            mean -= delta / size
+            m2 -= delta * (oldest - mean)
+        if commit:
+            self.window.append(price)
+            if len(self.window) > self.period:
+                self.window.popleft()
+            self.mean, self.m2 = mean, m2
+        if size < self.period:
+            return None
+        width = math.sqrt(max(m2, 0.0) / size) * self.num_std
+        return {"upper": mean + width, "middle": mean, "lower": mean - width}
+
+
+class Stochastic(StreamingIndicator):
+
+    def __init__(self, k_period=14, d_period=3):
+        super().__init__()
+        self.k_period = k_period
+        self.warmup = k_period + d_period - 1
+        self.highs = RollingExtreme(k_period - 1, True)
+        self.lows = RollingExtreme(k_period - 1, False)
+        self.count = 0
+        self.d = SMA(d_period)
+
+    def step(self, candle, commit):
+        high, low, close = float(candle["high"]), float(candle["low"]), float(candle["close"])
+        window_high = self.highs.peek(high)
+        window_low = self.lows.peek(low)
+        count = self.count + 1
+        if commit:
+            self.highs.push(high)
+            self.lows.push(low)
+            self.count = count
+        if count < self.k_period:
+            return None
+        if window_high == window_low:
+            k = 100
+        else:
+            k = (close - window_low) / (window_high - window_low) * 100
+        return {"k": k, "d": self.d.push(k, commit)}
+
+
+class ATR(StreamingIndicator):
+
+    def __init__(self, period=14):
+        super().__init__()
+        self.period = period
+        self.warmup = period + 1
+        self.previous = None
+        self.count = 0
+        self.atr = 0.0
+
+    def step(self, candle, commit):
+        high, low, close = float(candle["high"]), float(candle["low"]), float(candle["close"])
+        if self.previous is None:
+            if commit:
+                self.previous = close
+            return None
+        true_range = max(high - low, abs(high - self.previous), abs(low - self.previous))
+        count = self.count + 1
+        if count <= self.period:
+            atr = (self.atr * (count - 1) + true_range) / count
+        else:
+            atr = (self.atr * (self.period - 1) + true_range) / self.period
+        if commit:
+            self.previous, self.count, self.atr = close, count, atr
+        return atr if count >= self.period else None
+
+
+class ADX(StreamingIndicator):
+
+    def __init__(self, period=14):
+        super().__init__()
+        self.period = period
+        self.warmup = 2 * period
+        self.previous = None
+        self.count = 0
+        self.tr = 0.0
+        self.plus_dm = 0.0
+        self.minus_dm = 0.0
+        self.dx_count = 0
+        self.adx = 0.0
+
+    def __smooth(self, average, value, count):
+        if count <= self.period:
+            return (average * (count - 1) + value) / count
+        return (average * (self.period - 1) + value) / self.period
+
+    def step(self, candle, commit):
+        high, low, close = float(candle["high"]), float(candle["low"]), float(candle["close"])
+        if self.previous is None:
+            if commit:
+                self.previous = high, low, close
+            return None
+        prev_high, prev_low, prev_close = self.previous
+        true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        up_move, down_move = high - prev_high, prev_low - low
+        plus_dm = up_move if up_move > down_move and up_move > 0 else 0.0
+        minus_dm = down_move if down_move > up_move and down_move > 0 else 0.0
+
+        count = self.count + 1
+        tr = self.__smooth(self.tr, true_range, count)
+        plus = self.__smooth(self.plus_dm, plus_dm, count)
+        minus = self.__smooth(self.minus_dm, minus_dm, count)
+        value = None
+        dx_count, adx = self.dx_count, self.adx
+        if count >= self.period:
+            plus_di = plus * 100 / tr if tr else 0.0
+            minus_di = minus * 100 / tr if tr else 0.0
+            di_sum = plus_di + minus_di
+            dx = abs(plus_di - minus_di) / di_sum * 100 if di_sum else 0.0
+            dx_count += 1
+            adx = self.__smooth(adx, dx, dx_count)
+            value = {
+                "adx": adx if dx_count >= self.period else None,
+                "plus_di": plus_di,
+                "minus_di": minus_di
+            }
+        if commit:
+            self.previous = high, low, close
+            self.count, self.tr, self.plus_dm, self.minus_dm = count, tr, plus, minus
+            self.dx_count, self.adx = dx_count, adx
+        return value
+
+
+class Ichimoku(StreamingIndicator):
+    """Ichimoku Cloud lines of the last candle.
+
+    ``senkou_a`` averages the tenkan and kijun of that same candle. The batch
+    ``calculate_ichimoku`` keeps the legacy pairing, which averages the last
+    kijun with the tenkan of ``kijun_period - tenkan_period`` candles earlier,
+    so its ``current`` senkou_a differs; every other line matches.
+    """
+
+    def __init__(self, tenkan_period=9, kijun_period=26, senkou_b_period=52):
+        super().__init__()
+        self.warmup = senkou_b_period
+        self.periods = (tenkan_period, kijun_period, senkou_b_period)
+        self.windows = [
+            (RollingExtreme(period - 1, True), RollingExtreme(period - 1, False))
+            for period in self.periods
+        ]
+        self.count = 0
+
+    def step(self, candle, commit):
+        high, low = float(candle["high"]), float(candle["low"])
+        count = self.count + 1
+        lines = []
+        for period, (highs, lows) in zip(self.periods, self.windows):
+            lines.append((highs.peek(high) + lows.peek(low)) / 2 if count >= period else None)
+            if commit:
+                highs.push(high)
+                lows.push(low)
+        if commit:
+            self.count = count
+        tenkan, kijun, senkou_b = lines
+        if senkou_b is None:
+            return None
+        return {
+            "tenkan": tenkan,
+            "kijun": kijun,
+            "senkou_a": (tenkan + kijun) / 2,
+            "senkou_b": senkou_b,
+            "chikou": low
+        }
+
+
+def create_indicator(indicator, params=None):
+    """Build a streaming indicator from the names and parameters of
+    :meth:`Quotex.calculate_indicator <quotexapi.stable_api.Quotex.calculate_indicator>`.
+
+    :param str indicator: The indicator name, e.g. ``RSI``.
+    :param dict params: (optional) The indicator parameters.
+    :returns: The instance of :class:`StreamingIndicator`.
+    :raises ValueError: If the indicator is not supported.
+    """
+    params = params or {}
+    indicator = indicator.upper()
+    if indicator == "RSI":
+        return RSI(params.get("period", 14))
+    if indicator == "SMA":
+        return SMA(params.get("period", 20))
+    if indicator == "EMA":
+        return EMA(params.get("period", 20))
+    if indicator == "MACD":
+        return MACD(
+            params.get("fast_period", 12),
+            params.get("slow_period", 26),
+            params.get("signal_period", 9)
+        )
+    if indicator == "BOLLINGER":
+        return BollingerBands(params.get("period", 20), params.get("std", 2))
+    if indicator == "STOCHASTIC":
+        return Stochastic(params.get("k_period", 14), params.get("d_period", 3))
+    if indicator == "ATR":
+        return ATR(params.get("period", 14))
+    if indicator == "ADX":
+        return ADX(params.get("period", 14))
+    if indicator == "ICHIMOKU":
+        return Ichimoku(
+            params.get("tenkan_period", 9),
+            params.get("kijun_period", 26),
+            params.get("senkou_b_period", 52)
+        )
+    raise ValueError(f"Indicador '{indicator}' no soportado para tiempo real")
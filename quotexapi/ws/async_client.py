@@ -0,0 +1,302 @@
+"""Module for Quotex websocket over asyncio streams."""
+import os
+import ssl
+import base64
+import struct
+import asyncio
+import hashlib
+import logging
+import threading
+from urllib.parse import urlparse
+from .client import WebsocketClient
+from .sender import AsyncSendQueue
+
+logger = logging.getLogger(__name__)
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+OPCODE_CONTINUATION = 0x0
+OPCODE_TEXT = 0x1
+OPCODE_BINARY = 0x2
+OPCODE_CLOSE = 0x8
+OPCODE_PING = 0x9
+OPCODE_PONG = 0xA
+
+
+def mask_payload(mask, data):
+    """Apply the RFC 6455 client mask to a payload."""
+    length = len(data)
+    if not length:
+        return data
+    key = (mask * (length // 4 + 1))[:length]
+    masked = int.from_bytes(data, "big") ^ int.from_bytes(key, "big")
+    return masked.to_bytes(length, "big")
+
+
+def encode_frame(data, opcode=OPCODE_TEXT):
+    """Build a masked client frame.
+
+    :param data: The payload, ``str`` or ``bytes``.
+    :param int opcode: The frame opcode.
+    :returns: The frame bytes.
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    length = len(data)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, 0x80 | length)
+    elif length < 65536:
+        header = struct.pack("!BBH", 0x80 | opcode, 0x80 | 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 0x80 | 127, length)
+    mask = os.urandom(4)
+    return header + mask + mask_payload(mask, data)
+
+
+class AsyncWebSocketApp(object):
+    """Minimal websocket application running on the asyncio event loop.
+
+    Mirrors the callbacks of :class:`websocket.WebSocketApp` so the message
+    handling of :class:`WebsocketClient` is shared by both transports.
+    """
+
+    def __init__(
+            self,
+            url,
+            on_message=None,
+            on_error=None,
+            on_close=None,
+            on_open=None,
+            on_ping=None,
+            on_pong=None,
+            on_keepalive=None,
+            header=None
+    ):
+        self.url = url
+        self.on_message = on_message
+        self.on_error = on_error
+        self.on_close = on_close
+        self.on_open = on_open
+        self.on_ping = on_ping
+        self.on_pong = on_pong
+        self.on_keepalive = on_keepalive
+        self.header = header or {}
+        self.loop = None
+        self.reader = None
+        self.writer = None
+        self.keep_running = False
+        self.__thread_id = None
+
+    def send(self, data, opcode=OPCODE_TEXT):
+        """Send a message. Safe to call from any thread.
+
+        :param data: The message, ``str`` or ``bytes``.
+        :param int opcode: The frame opcode.
+        """
+        if self.writer is None:
+            raise ConnectionError("Websocket is not connected.")
+        frame = encode_frame(data, opcode)
+        if threading.get_ident() == self.__thread_id:
+            self.writer.write(frame)
+        else:
+            self.loop.call_soon_threadsafe(self.writer.write, frame)
+
+    def send_many(self, messages):
+        """Write text messages with a single transport write.
+
+        Must be called from the event loop thread.
+
+        :param list messages: The websocket messages.
+        """
+        if self.writer is None or self.writer.is_closing():
+            raise ConnectionError("Websocket is not connected.")
+        self.writer.write(b"".join(encode_frame(message) for message in messages))
+
+    def close(self):
+        """Stop the connection. Safe to call from any thread."""
+        self.keep_running = False
+        if self.writer is None:
+            return
+        if threading.get_ident() == self.__thread_id:
+            self.__close()
+        else:
+            self.loop.call_soon_threadsafe(self.__close)
+
+    def __close(self):
+        if self.writer is not None and not self.writer.is_closing():
+            try:
+                self.writer.write(encode_frame(struct.pack("!H", 1000), OPCODE_CLOSE))
+            finally:
+                self.writer.close()
+
+    async def run_forever(
+            self,
+            sslopt=None,
+            ping_interval=0,
+            ping_timeout=None,
+            ping_payload="",
+            host=None,
+            origin=None,
+            reconnect=None
+    ):
+        """Connect and read messages until :meth:`close` is called.
+
+        Accepts the same keyword arguments as
+        :meth:`websocket.WebSocketApp.run_forever` that Quotex uses.
+        """
+        self.loop = asyncio.get_running_loop()
+        self.__thread_id = threading.get_ident()
+        self.keep_running = True
+        sslopt = sslopt or {}
+        while self.keep_running:
+            ping_task = None
+            try:
+                await self.__connect(sslopt, host, origin)
+                self.__callback(self.on_open)
+                if ping_interval:
+                    ping_task = asyncio.create_task(
+                        self.__ping_forever(ping_interval, ping_payload)
+                    )
+                await self.__read_forever(ping_timeout and ping_interval + ping_timeout)
+            except asyncio.CancelledError:
+                self.keep_running = False
+                raise
+            except Exception as error:
+                if self.keep_running:
+                    self.__callback(self.on_error, error)
+            finally:
+                if ping_task:
+                    ping_task.cancel()
+                if self.writer is not None:
+                    self.writer.close()
+                    self.writer = None
+                self.__callback(self.on_close, None, None)
+
+            if not self.keep_running or not reconnect:
+                break
+            await asyncio.sleep(reconnect)
+        return False
+
+    async def __connect(self, sslopt, host, origin):
+        url = urlparse(self.url)
+        secure = url.scheme == "wss"
+        port = url.port or (443 if secure else 80)
+        context = None
+        if secure:
+            context = sslopt.get("context") or ssl.create_default_context()
+            if sslopt.get("check_hostname") is False:
+                context.check_hostname = False
+            if sslopt.get("cert_reqs") is not None:
+                context.verify_mode = sslopt["cert_reqs"]
+        self.reader, self.writer = await asyncio.open_connection(
+            url.hostname,
+            port,
+            ssl=context,
+            server_hostname=url.hostname if secure else None
+        )
+        key = base64.b64encode(os.urandom(16)).decode()
+        path = url.path + (f"?{url.query}" if url.query else "")
+        headers = {
+            "Host": host or url.hostname,
+            "Upgrade": "websocket",
+            "Connection": "Upgrade",
+            "Sec-WebSocket-Key": key,
+            "Sec-WebSocket-Version": "13",
+        }
+        if origin:
+            headers["Origin"] = origin
+        headers.update({k: v for k, v in self.header.items() if v is not None})
+        request = f"GET {path} HTTP/1.1\r\n" + "".join(
+            f"{name}: {value}\r\n" for name, value in headers.items()
+        ) + "\r\n"
+        self.writer.write(request.encode())
+        response = await self.reader.readuntil(b"\r\n\r\n")
+        status_line, *lines = response.decode("latin-1").split("\r\n")
+        if " 101 " not in f"{status_line} ":
+            raise ConnectionError(f"Handshake status {status_line}")
+        received = {}
+        for line in lines:
+            name, _, value = line.partition(":")
+            received[name.strip().lower()] = value.strip()
+        digest = hashlib.sha1((key + WEBSOCKET_GUID).encode()).digest()
+        if received.get("sec-websocket-accept") != base64.b64encode(digest).decode():
+            raise ConnectionError("Invalid Sec-WebSocket-Accept header.")
+
+    async def __read_forever(self, timeout):
+        fragments = []
+        fragment_opcode = None
+        while self.keep_running:
+            first, second = await asyncio.wait_for(self.reader.readexactly(2), timeout)
+            fin = first & 0x80
+            opcode = first & 0x0F
+            length = second & 0x7F
+            if length == 126:
+                length, = struct.unpack("!H", await self.reader.readexactly(2))
+            elif length == 127:
+                length, = struct.unpack("!Q", await self.reader.readexactly(8))
+            mask = await self.reader.readexactly(4) if second & 0x80 else None
+            data = await self.reader.readexactly(length) if length else b""
+            if mask:
+                data = mask_payload(mask, data)
+
+            if opcode == OPCODE_CLOSE:
+                self.__close()
+                return
+            if opcode == OPCODE_PING:
+                self.writer.write(encode_frame(data, OPCODE_PONG))
+                self.__callback(self.on_ping, data)
+                continue
+            if opcode == OPCODE_PONG:
+                self.__callback(self.on_pong, data)
+                continue
+
+            if opcode != OPCODE_CONTINUATION:
+                fragment_opcode = opcode
+            fragments.append(data)
+            if not fin:
+                continue
+            data = b"".join(fragments)
+            fragments.clear()
+            message = data.decode() if fragment_opcode == OPCODE_TEXT else data
+            self.__callback(self.on_message, message)
+
+    async def __ping_forever(self, interval, payload):
+        while self.writer is not None and not self.writer.is_closing():
+            await asyncio.sleep(interval)
+            if self.on_keepalive:
+                self.__callback(self.on_keepalive)
+            else:
+                self.send(payload)
+
+    def __callback(self, callback, *args):
+        if callback:
+            try:
+                callback(self, *args)
+            except Exception as error:
+                logger.error(f"Error from callback {callback}: {error}")
+
+
+class AsyncWebsocketClient(WebsocketClient):
+    """Class for work with Quotex API websocket on the asyncio event loop."""
+
+    def create_app(self):
+        return AsyncWebSocketApp(
+            self.api.wss_url,
+            on_message=self.on_message,
+            on_error=self.on_error,
+            on_close=self.on_close,
+            on_open=self.on_open,
+            on_ping=self.on_ping,
+            on_pong=self.on_pong,
+            on_keepalive=self.on_keepalive,
+            header=self.headers
+        )
+
+    def create_outbox(self):
+        return AsyncSendQueue(self.wss.send_many, asyncio.get_running_loop(), self.api.pending.latency)
+
+    def on_pong(self, wss, pong_msg):
+        pass
+
+    def on_keepalive(self, wss):
+        self.send_ping()
@@ -14,3 +14,10 @@ class Base(object):
         :returns: The instance of :class:`requests.Response`.
         """
         return self.api.send_websocket_request(data)
+
+    def send_websocket_requests(self, data):
+        """Send a burst of requests to Quotex server websocket.
+        :param list data: The websocket channel data.
+        :returns: The instance of :class:`concurrent.futures.Future`.
+        """
+        return self.api.send_websocket_requests(data)
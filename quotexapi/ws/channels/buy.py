@@ -1,9 +1,23 @@
 import json
 import time
+from functools import lru_cache
 from quotexapi.ws.channels.base import Base
 from quotexapi.expiration import get_expiration_time_quotex
 
 
+@lru_cache(maxsize=1024)
+def order_template(asset, direction, account_type, option_type):
+    """Serialize once the ``orders/open`` fields that repeat between orders.
+
+    :returns: A %-format string expecting the JSON of the amount, the
+        expiration and the request id.
+    """
+    return (
+        '42["orders/open",{"asset":%s,"amount":%%s,"time":%%s,"action":%s,'
+        '"isDemo":%s,"tournamentId":0,"requestId":%%s,"optionType":%d}]'
+    ) % (json.dumps(asset), json.dumps(direction), json.dumps(account_type), option_type)
+
+
 class Buy(Base):
     """Class for Quotex buy websocket channel."""
 
@@ -16,6 +30,55 @@ class Buy(Base):
         If is_fast_option is True, it places a trade with a fixed duration (e.g., 60 seconds).
         If False, it places a trade that expires at a specific candle close time.
         """
+        option_type, expiration, end_time_for_settings = self.expiration(duration, is_fast_option)
+
+        # تحديث إعدادات الواجهة (مهم لتجنب الأخطاء من السيرفر)
+        settings_data = self.settings(asset, expiration, is_fast_option, end_time_for_settings)
+
+        # إعداد بيانات الطلب لإرسالها
+        order = order_template(asset, direction, self.api.account_type, option_type) % (
+            json.dumps(price),
+            json.dumps(expiration),
+            json.dumps(request_id)
+        )
+
+        # إرسال الطلبات إلى السيرفر
+        return self.send_websocket_requests(settings_data + [order])
+
+    def settings(self, asset, expiration, is_fast_option, end_time):
+        """Return the chart settings requests an order needs.
+
+        Nothing when the settings of the connection already match, so
+        repeated orders of the same asset and expiration are one write.
+        Fast options are never cached: their chart expiration is the order
+        time plus the duration, different for every order.
+        """
+        key = None if is_fast_option else (asset, expiration, is_fast_option)
+        if key is not None and self.api.state.chart_settings == key:
+            return []
+        self.api.state.chart_settings = key
+        return [
+            self.api.settings_store_data(
+                asset,
+                expiration,
+                is_fast_option=is_fast_option,
+                end_time=end_time,
+            ),
+            '42["tick"]'
+        ]
+
+    def arm(self, asset, duration, is_fast_option):
+        """Send ahead the chart settings of the next orders of an asset."""
+        if is_fast_option:
+            return None
+        _, expiration, end_time = self.expiration(duration, is_fast_option)
+        settings_data = self.settings(asset, expiration, is_fast_option, end_time)
+        if settings_data:
+            return self.send_websocket_requests(settings_data)
+
+    @staticmethod
+    def expiration(duration, is_fast_option):
+        """Return the option type, the order time and the chart expiration."""
         # --- بداية التعديل ---
 
         if is_fast_option:
@@ -33,32 +96,7 @@ class Buy(Base):
             expiration = expiration_time
             end_time_for_settings = expiration_time
 
-        # --- نهاية التعديل ---
-
-
-        # تحديث إعدادات الواجهة (مهم لتجنب الأخطاء من السيرفر)
-        self.api.settings_apply(
-            asset,
-            expiration,
-            is_fast_option=is_fast_option,
-            end_time=end_time_for_settings,
-        )
-
-        # إعداد بيانات الطلب لإرسالها
-        payload = {
-            "asset": asset,
-            "amount": price,
-            "time": expiration,  # هذا هو الحقل الأهم، سيحتوي على مدة الصفقة بالثواني
-            "action": direction,
-            "isDemo": self.api.account_type,
-            "tournamentId": 0,
-            "requestId": request_id,
-            "optionType": option_type # النوع 100 للصفقات السريعة
-        }
 
-        # إرسال الطلبات إلى السيرفر
-        data = f'42["tick"]'
-        self.send_websocket_request(data)
+        # --- نهاية التعديل ---
 
-        data = f'42["orders/open",{json.dumps(payload)}]'
-        self.send_websocket_request(data)
\ No newline at end of file
+        return option_type, expiration, end_time_for_settings
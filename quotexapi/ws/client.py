@@ -1,12 +1,18 @@
 """Module for Quotex websocket."""
-import json
 import time
 import logging
+import threading
+from collections import deque
 import websocket
-from .. import global_value
+from websocket import WebSocketConnectionClosedException
+from .sender import SendQueue
+from .dispatcher import Dispatcher, DISCONNECT, PING, PONG
+from ..metrics import metrics
 
 logger = logging.getLogger(__name__)
 
+TICK_SECONDS = frozenset((0, 5, 10, 15, 20, 30, 40, 50))
+
 
 class WebsocketClient(object):
     """Class for work with Quotex API websocket."""
@@ -23,9 +29,21 @@ class WebsocketClient(object):
             "Origin": self.api.https_url,
             "Host": f"ws2.{self.api.host}",
         }
+        self.last_second = None
+        self.pings = deque()
+        self.pings_lock = threading.Lock()
+        self.dispatcher = Dispatcher(self.api.pending.latency)
+        self.register_handlers()
+        self.wss = self.create_app()
+        self.outbox = self.create_outbox()
+
+    def create_app(self):
+        """Create the websocket application driving this client.
 
+        :returns: The instance of :class:`WebSocketApp <websocket.WebSocketApp>`.
+        """
         websocket.enableTrace(self.api.trace_ws)
-        self.wss = websocket.WebSocketApp(
+        return websocket.WebSocketApp(
             self.api.wss_url,
             on_message=self.on_message,
             on_error=self.on_error,
@@ -37,152 +55,292 @@ class WebsocketClient(object):
             # cookie=self.api.cookies
         )
 
+    def create_outbox(self):
+        """Create the single-writer queue for outbound messages."""
+        return SendQueue(self.write, latency=self.api.pending.latency)
+
+    def write(self, messages):
+        """Write a batch of messages, one text frame each, in order.
+
+        Runs on the writer thread of :class:`SendQueue <quotexapi.ws.sender.SendQueue>`,
+        the only thread writing to the socket.
+
+        :param list messages: The websocket messages.
+        """
+        sock = self.wss.sock
+        if not sock or not sock.connected:
+            raise WebSocketConnectionClosedException("socket is already closed.")
+        for message in messages:
+            sock.send(message)
+
+    def send(self, message):
+        """Queue a message without blocking.
+
+        :param str message: The websocket message.
+        :returns: The instance of :class:`concurrent.futures.Future`
+            resolved once the message is written.
+        """
+        return self.outbox.put((message,))
+
+    def send_many(self, messages):
+        """Queue messages that must be written together."""
+        return self.outbox.put(tuple(messages))
+
+    def send_ping(self, probe=None):
+        """Queue an Engine.IO ping.
+
+        The server answers pings in order, so every ping sent is queued in
+        :attr:`pings` and each pong is matched with the oldest one. A pong
+        answering a ``probe`` resolves the ``pong`` waiter of that key;
+        keepalive pongs resolve nothing.
+
+        :param probe: (optional) The key of the ``pong`` waiter to resolve.
+        """
+        with self.pings_lock:
+            self.pings.append(probe)
+            return self.outbox.put((PING,))
+
+    def on_pong_message(self):
+        with self.pings_lock:
+            probe = self.pings.popleft() if self.pings else None
+        if probe is not None:
+            self.api.pending.resolve("pong", probe, True, fallback=False)
+
+    def close(self):
+        """Close the connection and stop the outbound writer."""
+        self.wss.close()
+        self.outbox.stop()
+
     def on_message(self, wss, message):
         """Method to process websocket messages."""
-        global_value.ssl_Mutual_exclusion = True
-        current_time = time.localtime()
-        if current_time.tm_sec in [0, 5, 10, 15, 20, 30, 40, 50]:
-            self.wss.send('42["tick"]')
+        tracer = self.api.tick_tracer
+        if tracer is not None:
+            tracer.receive()
+        now = int(time.time())
+        if now != self.last_second:
+            self.last_second = now
+            if time.localtime(now).tm_sec in TICK_SECONDS:
+                self.send('42["tick"]')
         try:
-            if "authorization/reject" in str(message):
-                print("Token rejected, making automatic reconnection.")
-                logger.debug("Token rejected, making automatic reconnection.")
-                global_value.check_rejected_connection = 1
-            elif "s_authorization" in str(message):
-                global_value.check_accepted_connection = 1
-                global_value.check_rejected_connection = 0
-            elif "instruments/list" in str(message):
-                global_value.started_listen_instruments = True
+            if message == DISCONNECT:
+                logger.info("Disconnection event triggered by the platform, causing automatic reconnection.")
+                self.api.state.check_websocket_if_connect = 0
+            elif message == PONG:
+                self.on_pong_message()
+            else:
+                event, payload, is_binary = self.dispatcher.parse(message)
+                if tracer is not None:
+                    tracer.decoded()
+                if metrics.enabled:
+                    metrics.inc("ws_frames_total", event=event or ("binary" if is_binary else "control"))
+                if is_binary:
+                    logger.debug(payload)
+                    self.api.wss_message = payload
+                if event is not None or is_binary:
+                    self.dispatcher.dispatch(event, payload, is_binary)
+        except Exception:
+            metrics.inc("ws_decode_errors_total")
+            logger.debug("Failed to process websocket message.", exc_info=True)
 
+    def register_handlers(self):
+        """Fill the dispatcher table with the default handlers."""
+        handlers = {
+            "authorization/reject": self.on_authorization_reject,
+            "s_authorization": self.on_authorization,
+            "instruments/list": self.on_instruments,
+            "settings/list": self.on_settings,
+            "history/list/v2": self.on_history_list,
+            "signals": self.on_signals,
+            "balance": self.on_balance,
+            "position": self.on_position,
+            "profit": self.on_profit,
+            "history/load": self.on_history,
+            "pending/create": self.on_pending,
+            "orders/open": self.on_buy,
+            "orders/cancel": self.on_sell,
+            "deals": self.on_deals,
+            "demo/refill": self.on_training_balance,
+            "error": self.on_server_error,
+            "quotes/stream": self.on_quotes,
+            "sentiment": self.on_sentiment,
+        }
+        for event, handler in handlers.items():
+            self.dispatcher.register(event, handler)
+        for event, handlers in self.api.event_handlers.items():
+            for handler in handlers:
+                self.dispatcher.register(event, handler)
+
+    def on_authorization_reject(self, payload):
+        print("Token rejected, making automatic reconnection.")
+        logger.debug("Token rejected, making automatic reconnection.")
+        self.api.state.check_rejected_connection = 1
+        self.api.pending.resolve_all("authorization", False)
+        self.api.pending.resolve_all("connection")
+
+    def on_authorization(self, payload):
+        self.api.state.check_accepted_connection = 1
+        self.api.state.check_rejected_connection = 0
+        self.api.pending.resolve_all("authorization", True)
+
+    def on_instruments(self, payload):
+        self.api.state.started_listen_instruments = True
+        self.api.instrument_catalog.update(payload)
+        self.api.instruments = payload
+        self.api.pending.resolve_all("instruments/list", payload)
+
+    def on_settings(self, payload):
+        self.api.settings_list = payload
+
+    def on_history_list(self, payload):
+        if payload.get("asset") == self.api.current_asset:
+            self.api.candles.candles_data = payload["history"]
+        self.api.candle_v2_data[payload["asset"]] = payload
+        self.api.candle_v2_data[payload["asset"]]["candles"] = [{
+            "time": candle[0],
+            "open": candle[1],
+            "close": candle[2],
+            "high": candle[3],
+            "low": candle[4],
+            "ticks": candle[5]
+        } for candle in payload["candles"]]
+        self.api.pending.resolve("history/list/v2", payload["asset"], payload, fallback=False)
+
+    def on_signals(self, payload):
+        time_in = payload.get("time")
+        for i in payload["signals"]:
             try:
-                message = message[1:].decode()
-                logger.debug(message)
-                message = json.loads(message)
-                self.api.wss_message = message
-                if "call" in str(message) or 'put' in str(message):
-                    self.api.instruments = message
-                if isinstance(message, dict):
-                    if message.get("signals"):
-                        time_in = message.get("time")
-                        for i in message["signals"]:
-                            try:
-                                self.api.signal_data[i[0]] = {}
-                                self.api.signal_data[i[0]][i[2]] = {}
-                                self.api.signal_data[i[0]][i[2]]["dir"] = i[1][0]["signal"]
-                                self.api.signal_data[i[0]][i[2]]["duration"] = i[1][0]["timeFrame"]
-                            except:
-                                self.api.signal_data[i[0]] = {}
-                                self.api.signal_data[i[0]][time_in] = {}
-                                self.api.signal_data[i[0]][time_in]["dir"] = i[1][0][1]
-                                self.api.signal_data[i[0]][time_in]["duration"] = i[1][0][0]
-                    elif message.get("liveBalance") or message.get("demoBalance"):
-                        self.api.account_balance = message
-                    elif message.get("position"):
-                        self.api.top_list_leader = message
-                    elif len(message) == 1 and message.get("profit", -1) > -1:
-                        self.api.profit_today = message
-                    elif message.get("index"):
-                        self.api.historical_candles = message
-                        self.api.timesync.server_timestamp = message.get("closeTimestamp")
-                    if message.get("pending"):
-                        self.api.pending_successful = message
-                        self.api.pending_id = message["pending"]["ticket"]
-                    elif message.get("id") and not message.get("ticket"):
-                        self.api.buy_successful = message
-                        self.api.buy_id = message["id"]
-                        self.api.timesync.server_timestamp = message.get("closeTimestamp")
-                    elif message.get("ticket") and not message.get("id"):
-                        self.api.sold_options_respond = message
-                    elif message.get("deals"):
-                        for get_m in message["deals"]:
-                            self.api.profit_in_operation = get_m["profit"]
-                            get_m["win"] = True if message["profit"] > 0 else False
-                            get_m["game_state"] = 1
-                            self.api.listinfodata.set(
-                                get_m["win"],
-                                get_m["game_state"],
-                                get_m["id"]
-                            )
-                    elif message.get("isDemo") and message.get("balance"):
-                        self.api.training_balance_edit_request = message
-                    elif message.get("error"):
-                        global_value.websocket_error_reason = message.get("error")
-                        global_value.check_websocket_if_error = True
-                        if global_value.websocket_error_reason == "not_money":
-                            self.api.account_balance = {"liveBalance": 0}
-                    elif not message.get("list") == []:
-                        self.api.wss_message = message
-            except:
-                pass
-
-            if str(message) == "41":
-                logger.info("Disconnection event triggered by the platform, causing automatic reconnection.")
-                global_value.check_websocket_if_connect = 0
-            if "51-" in str(message):
-                self.api._temp_status = str(message)
-            elif self.api._temp_status == """451-["settings/list",{"_placeholder":true,"num":0}]""":
-                self.api.settings_list = message
-                self.api._temp_status = ""
-            elif self.api._temp_status == """451-["history/list/v2",{"_placeholder":true,"num":0}]""":
-                if message.get("asset") == self.api.current_asset:
-                    self.api.candles.candles_data = message["history"]
-                    self.api.candle_v2_data[message["asset"]] = message
-                    self.api.candle_v2_data[message["asset"]]["candles"] = [{
-                        "time": candle[0],
-                        "open": candle[1],
-                        "close": candle[2],
-                        "high": candle[3],
-                        "low": candle[4],
-                        "ticks": candle[5]
-                    } for candle in message["candles"]]
-            elif len(message[0]) == 4:
-                result = {
-                    "time": message[0][1],
-                    "price": message[0][2]
+                self.api.signal_data[i[0]] = {}
+                self.api.signal_data[i[0]][i[2]] = {}
+                self.api.signal_data[i[0]][i[2]]["dir"] = i[1][0]["signal"]
+                self.api.signal_data[i[0]][i[2]]["duration"] = i[1][0]["timeFrame"]
+            except (IndexError, KeyError, TypeError):
+                self.api.signal_data[i[0]] = {}
+                self.api.signal_data[i[0]][time_in] = {}
+                self.api.signal_data[i[0]][time_in]["dir"] = i[1][0][1]
+                self.api.signal_data[i[0]][time_in]["duration"] = i[1][0][0]
+
+    def on_balance(self, payload):
+        self.api.account_balance = payload
+        self.api.pending.resolve_all("balance", payload)
+
+    def on_position(self, payload):
+        self.api.top_list_leader = payload
+
+    def on_profit(self, payload):
+        self.api.profit_today = payload
+
+    def on_history(self, payload):
+        self.api.historical_candles = payload
+        self.api.pending.resolve("history/load", payload["index"], payload)
+        self.api.timesync.server_timestamp = payload.get("closeTimestamp")
+
+    def on_pending(self, payload):
+        self.api.pending_successful = payload
+        self.api.pending_id = payload["pending"]["ticket"]
+        self.api.pending.resolve("pending/create", value=payload)
+
+    def on_buy(self, payload):
+        self.api.buy_successful = payload
+        self.api.buy_id = payload["id"]
+        self.api.pending.resolve("orders/open", payload.get("requestId"), payload)
+        self.api.timesync.server_timestamp = payload.get("closeTimestamp")
+
+    def on_sell(self, payload):
+        self.api.sold_options_respond = payload
+        self.api.pending.resolve("orders/cancel", payload["ticket"], payload)
+
+    def on_deals(self, payload):
+        for get_m in payload["deals"]:
+            self.api.profit_in_operation = get_m["profit"]
+            get_m["win"] = True if payload["profit"] > 0 else False
+            get_m["game_state"] = 1
+            self.api.listinfodata.set(
+                get_m["win"],
+                get_m["game_state"],
+                get_m["id"]
+            )
+            self.api.pending.resolve("deals", get_m["id"], get_m, fallback=False)
+
+    def on_training_balance(self, payload):
+        self.api.training_balance_edit_request = payload
+        self.api.pending.resolve("demo/refill", value=payload)
+
+    def on_server_error(self, payload):
+        self.api.state.websocket_error_reason = payload.get("error")
+        self.api.state.check_websocket_if_error = True
+        if self.api.state.websocket_error_reason == "not_money":
+            self.api.account_balance = {"liveBalance": 0}
+        # An error answers a single request: the order echoing its
+        # requestId, otherwise the oldest order or pending order waiting.
+        if not self.api.pending.resolve("orders/open", payload.get("requestId")):
+            self.api.pending.resolve("pending/create")
+
+    def on_quotes(self, payload):
+        tracer = self.api.tick_tracer
+        if tracer is not None:
+            tracer.dispatched()
+        tick_buffer = self.api.tick_buffer
+        aggregate = self.api.candle_aggregator.update
+        for tick in payload:
+            tick_buffer(tick[0]).append(tick[1], tick[2])
+            aggregate(tick[0], tick[1], tick[2])
+        if tracer is not None:
+            tracer.stored(payload)
+        tick = payload[0]
+        self.api.realtime_candles = tick
+        self.api.pending.resolve("quotes/stream", tick[0], tick, fallback=False)
+
+    def on_sentiment(self, payload):
+        for i in payload:
+            result = {
+                "sentiment": {
+                    "sell": 100 - int(i[1]),
+                    "buy": int(i[1])
                 }
-                self.api.realtime_price[message[0][0]].append(result)
-                self.api.realtime_candles = message[0]
-            elif len(message[0]) == 2:
-                for i in message:
-                    result = {
-                        "sentiment": {
-                            "sell": 100 - int(i[1]),
-                            "buy": int(i[1])
-                        }
-                    }
-                    self.api.realtime_sentiment[i[0]] = result
-        except:
-            pass
-        global_value.ssl_Mutual_exclusion = False
+            }
+            self.api.realtime_sentiment[i[0]] = result
+            self.api.pending.resolve("sentiment", i[0], result, fallback=False)
 
     def on_error(self, wss, error):
         """Method to process websocket errors."""
         logger.error(error)
-        global_value.websocket_error_reason = str(error)
-        global_value.check_websocket_if_error = True
+        metrics.inc("ws_errors_total")
+        self.api.state.websocket_error_reason = str(error)
+        self.api.state.check_websocket_if_error = True
+        self.api.pending.resolve_all("connection")
 
     def on_open(self, wss):
         """Method to process websocket open."""
         logger.info("Websocket client connected.")
-        global_value.check_websocket_if_connect = 1
+        with self.pings_lock:
+            self.pings.clear()
+        metrics.inc("ws_connections_total")
+        self.api.state.check_websocket_if_connect = 1
+        self.dispatcher.reset()
+        self.api.pending.resolve_all("connection")
         asset_name = self.api.current_asset
         period = self.api.current_period
-        self.wss.send('42["tick"]')
-        self.wss.send('42["indicator/list"]')
-        self.wss.send('42["drawing/load"]')
-        self.wss.send('42["pending/list"]')
-        self.wss.send('42["instruments/update",{"asset":"%s","period":%d}]' % (asset_name, period))
-        self.wss.send('42["depth/follow","%s"]' % asset_name)
-        self.wss.send('42["chart_notification/get"]')
-        self.wss.send('42["tick"]')
+        self.send_many((
+            '42["tick"]',
+            '42["indicator/list"]',
+            '42["drawing/load"]',
+            '42["pending/list"]',
+            '42["instruments/update",{"asset":"%s","period":%d}]' % (asset_name, period),
+            '42["depth/follow","%s"]' % asset_name,
+            '42["chart_notification/get"]',
+            '42["tick"]',
+        ))
 
     def on_close(self, wss, close_status_code, close_msg):
         """Method to process websocket close."""
         logger.info("Websocket connection closed.")
-        global_value.check_websocket_if_connect = 0
+        metrics.inc("ws_disconnections_total")
+        self.api.state.check_websocket_if_connect = 0
+        self.api.state.reset_subscriptions()
+        self.api.pending.resolve_all("connection")
 
     def on_ping(self, wss, ping_msg):
         pass
 
     def on_pong(self, wss, pong_msg):
-        self.wss.send("2")
+        self.send_ping()
@@ -0,0 +1,157 @@
+"""Module for Quotex websocket message dispatching."""
+import json
+import logging
+from collections import defaultdict
+from .latency import request_key
+from ..metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+decode = json.JSONDecoder().decode
+
+# Control frames of the Engine.IO/Socket.IO protocol.
+PING = "2"
+PONG = "3"
+CONNECT = "40"
+DISCONNECT = "41"
+
+# Events whose payload is identified by the name announced in the
+# preceding ``451-`` header; every other payload is routed by its shape.
+NAMED_EVENTS = frozenset((
+    "authorization/reject",
+    "s_authorization",
+    "instruments/list",
+    "settings/list",
+    "history/list/v2",
+))
+
+
+def classify(payload):
+    """Return the events a decoded payload belongs to, judging by its shape.
+
+    Quotex answers most requests with an anonymous binary attachment, so the
+    routing mirrors the keys the server puts in each kind of response.
+
+    :param payload: The decoded json payload.
+    :returns: A tuple with the event names.
+    """
+    if isinstance(payload, dict):
+        events = []
+        if payload.get("signals"):
+            events.append("signals")
+        elif payload.get("liveBalance") or payload.get("demoBalance"):
+            events.append("balance")
+        elif payload.get("position"):
+            events.append("position")
+        elif len(payload) == 1 and isinstance(payload.get("profit"), (int, float)) and payload["profit"] > -1:
+            events.append("profit")
+        elif payload.get("index"):
+            events.append("history/load")
+
+        if payload.get("pending"):
+            events.append("pending/create")
+        elif payload.get("id") and not payload.get("ticket"):
+            events.append("orders/open")
+        elif payload.get("ticket") and not payload.get("id"):
+            events.append("orders/cancel")
+        elif payload.get("deals"):
+            events.append("deals")
+        elif payload.get("isDemo") and payload.get("balance"):
+            events.append("demo/refill")
+        elif payload.get("error"):
+            events.append("error")
+        return tuple(events)
+
+    if isinstance(payload, list) and payload and isinstance(payload[0], list):
+        if len(payload[0]) == 4:
+            return "quotes/stream",
+        if len(payload[0]) == 2:
+            return "sentiment",
+
+    return ()
+
+
+class Dispatcher(object):
+    """Class to route Socket.IO frames through a table of handlers."""
+
+    def __init__(self, latency=None):
+        """
+        :param latency: (optional) The instance of :class:`LatencyTracker
+            <quotexapi.ws.latency.LatencyTracker>` told about every response.
+        """
+        self.handlers = defaultdict(list)
+        self.placeholder = None
+        self.latency = latency
+
+    def register(self, event, handler):
+        """Add a handler for an event.
+
+        :param str event: The event name, e.g. ``quotes/stream``.
+        :param handler: A callable receiving the decoded payload.
+        """
+        self.handlers[event].append(handler)
+
+    def unregister(self, event, handler):
+        """Remove a handler previously added with :meth:`register`."""
+        handlers = self.handlers.get(event)
+        if handlers and handler in handlers:
+            handlers.remove(handler)
+
+    def reset(self):
+        """Forget a pending ``451-`` header, e.g. after a reconnection."""
+        self.placeholder = None
+
+    def parse(self, message):
+        """Parse a raw frame once.
+
+        Binary attachments inherit the event name announced by the last
+        ``451-`` header. Headers themselves carry no payload yet.
+
+        :param message: The raw websocket frame, ``str`` or ``bytes``.
+        :returns: A tuple ``(event, payload, is_binary)``. ``event`` is None
+            for frames that carry nothing to dispatch.
+        """
+        if isinstance(message, (bytes, bytearray)):
+            event, self.placeholder = self.placeholder, None
+            return event, decode(message[1:].decode()), True
+
+        if message.startswith("42"):
+            packet = decode(message[2:])
+            return packet[0], packet[1] if len(packet) > 1 else None, False
+
+        if message.startswith("45"):
+            # 451-["event",{"_placeholder":true,"num":0}]
+            start = message.index("-") + 3
+            self.placeholder = message[start:message.index('"', start)]
+
+        return None, None, False
+
+    def dispatch(self, event, payload, is_binary=True):
+        """Call the handlers registered for a parsed frame.
+
+        :param str event: The event name found by :meth:`parse`.
+        :param payload: The decoded payload.
+        :param bool is_binary: Whether the payload came as an attachment.
+        """
+        handlers = self.handlers
+        latency = self.latency
+        key = request_key(payload) if latency is not None else None
+        if event is not None:
+            if latency is not None:
+                latency.answered(event, key)
+            self.__call_handlers(handlers.get(event, ()), event, payload)
+        if is_binary and event not in NAMED_EVENTS:
+            for shape in classify(payload):
+                if shape != event:
+                    if latency is not None:
+                        latency.answered(shape, key)
+                    self.__call_handlers(handlers.get(shape, ()), shape, payload)
+
+    @staticmethod
+    def __call_handlers(handlers, event, payload):
+        for handler in handlers:
+            try:
+                handler(payload)
+            except Exception:
+                metrics.inc("ws_handler_errors_total", event=event)
+                logger.debug(f"Handler {handler!r} failed on '{event}'.", exc_info=True)
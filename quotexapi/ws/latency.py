@@ -0,0 +1,207 @@
+"""Module for Quotex websocket request latency tracking."""
+import math
+import time
+import threading
+from collections import deque, OrderedDict
+
+MIN_LATENCY = 0.000001
+MAX_LATENCY = 120.0
+PRECISION = 0.02
+PERCENTILES = (50, 95, 99)
+MAX_OUTSTANDING = 256
+
+
+class LatencyHistogram(object):
+    """Class for a streaming histogram of latencies.
+
+    Latencies fall into log-spaced buckets, ``PRECISION`` wide relative to
+    their value, so percentiles keep that relative error whatever the
+    number of samples while memory stays fixed.
+    """
+
+    def __init__(self, precision=PRECISION, min_latency=MIN_LATENCY, max_latency=MAX_LATENCY):
+        """
+        :param float precision: Relative width of a bucket.
+        :param float min_latency: Latencies below it share the first bucket.
+        :param float max_latency: Latencies above it share the last bucket.
+        """
+        self.min_latency = min_latency
+        self.factor = math.log1p(precision)
+        self.counts = [0] * (self.bucket(max_latency) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.timeouts = 0
+
+    def bucket(self, latency):
+        if latency <= self.min_latency:
+            return 0
+        return int(math.log(latency / self.min_latency) / self.factor) + 1
+
+    def record(self, latency):
+        index = min(self.bucket(latency), len(self.counts) - 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += latency
+        if latency > self.max:
+            self.max = latency
+
+    def percentile(self, percent):
+        """Return the latency below which ``percent`` of the samples fall."""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(self.count * percent / 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                if index == 0:
+                    return self.min_latency
+                # Midpoint of the bucket, bounded by the largest sample
+                upper = self.min_latency * math.exp(self.factor * index)
+                return min(self.max, upper * (1 + math.exp(-self.factor)) / 2)
+        return self.max
+
+    def stats(self):
+        stats = {
+            "count": self.count,
+            "timeouts": self.timeouts,
+            "mean": self.total / self.count if self.count else None,
+            "max": self.max if self.count else None
+        }
+        for percent in PERCENTILES:
+            stats[f"p{percent}"] = self.percentile(percent)
+        return stats
+
+
+def request_key(payload):
+    """Return the ``requestId`` or ``index`` correlating a request with its
+    response, or None when the payload carries neither."""
+    if isinstance(payload, dict):
+        key = payload.get("requestId", payload.get("index"))
+        if isinstance(key, (int, str)):
+            return key
+    return None
+
+
+class LatencyTracker(object):
+    """Class for the send to acknowledgement latencies of each event.
+
+    The outbound queues call :meth:`sent` for every request right before
+    writing it to the socket, and the :class:`Dispatcher
+    <quotexapi.ws.dispatcher.Dispatcher>` calls :meth:`answered` for every
+    response. Requests carrying a ``requestId`` or ``index`` are matched
+    with the response echoing it; the others with the oldest unanswered
+    request of the same event, since the server answers those in order.
+    :class:`PendingRequests <quotexapi.ws.pending.PendingRequests>` records
+    a timeout when the waiter of a correlated request gives up. Requests
+    never answered keep at most ``MAX_OUTSTANDING`` stamps per event.
+    """
+
+    def __init__(self, precision=PRECISION):
+        """
+        :param float precision: Relative width of the histogram buckets.
+        """
+        self.precision = precision
+        self.histograms = {}
+        self.outstanding = {}
+        self.correlated = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def histogram(self, event):
+        histogram = self.histograms.get(event)
+        if histogram is None:
+            histogram = self.histograms.setdefault(event, LatencyHistogram(self.precision))
+        return histogram
+
+    def record(self, event, latency):
+        with self.__lock:
+            self.histogram(event).record(latency)
+
+    def sent(self, event, key=None):
+        """Stamp a request of ``event`` about to be written to the socket.
+
+        :param str event: The outbound event name.
+        :param key: (optional) The ``requestId`` or ``index`` of the request.
+        :returns: The stamp, to hand back to :meth:`unsent` if the write fails.
+        """
+        now = time.perf_counter()
+        with self.__lock:
+            if key is not None:
+                self.correlated[key] = (event, now)
+                if len(self.correlated) > MAX_OUTSTANDING:
+                    self.correlated.popitem(last=False)
+            else:
+                stamps = self.outstanding.get(event)
+                if stamps is None:
+                    stamps = self.outstanding[event] = deque(maxlen=MAX_OUTSTANDING)
+                stamps.append(now)
+        return event, key, now
+
+    def unsent(self, stamp):
+        """Forget the stamp of a request whose write failed."""
+        event, key, now = stamp
+        with self.__lock:
+            if key is not None:
+                if self.correlated.get(key) == (event, now):
+                    del self.correlated[key]
+                return
+            stamps = self.outstanding.get(event)
+            if stamps and now in stamps:
+                stamps.remove(now)
+
+    def answered(self, event, key=None):
+        """Record the latency of the request a response of ``event`` answers.
+
+        :param str event: The inbound event name.
+        :param key: (optional) The ``requestId`` or ``index`` echoed by the response.
+        """
+        if key is not None:
+            if key not in self.correlated:
+                return
+        elif not self.outstanding.get(event):
+            return
+        now = time.perf_counter()
+        with self.__lock:
+            if key is not None:
+                request = self.correlated.pop(key, None)
+                if request is not None:
+                    # Recorded under the request event, e.g. history/load/line
+                    self.histogram(request[0]).record(now - request[1])
+                return
+            stamps = self.outstanding.get(event)
+            if stamps:
+                self.histogram(event).record(now - stamps.popleft())
+
+    def timeout(self, key):
+        """Count a timeout for the correlated request of ``key``, if it was sent."""
+        with self.__lock:
+            request = self.correlated.pop(key, None)
+            if request is not None:
+                self.histogram(request[0]).timeouts += 1
+
+    def stats(self, event=None):
+        """Return the stats of an event, or of every event by name."""
+        with self.__lock:
+            if event is not None:
+                return self.histogram(event).stats()
+            return {name: histogram.stats() for name, histogram in sorted(self.histograms.items())}
+
+    def reset(self):
+        with self.__lock:
+            self.histograms.clear()
+            self.outstanding.clear()
+            self.correlated.clear()
+
+    def summary(self):
+        """One line with the count and percentiles of every event, in ms."""
+        parts = []
+        for event, stats in self.stats().items():
+            if not stats["count"]:
+                parts.append(f"{event} timeouts={stats['timeouts']}")
+                continue
+            percentiles = " ".join(
+                f"p{percent}={stats[f'p{percent}'] * 1000:.3f}" for percent in PERCENTILES
+            )
+            parts.append(f"{event} n={stats['count']} {percentiles} timeouts={stats['timeouts']}")
+        return "; ".join(parts)
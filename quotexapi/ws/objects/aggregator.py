@@ -0,0 +1,193 @@
+"""Module for Quotex realtime candles websocket object."""
+import logging
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+TIMEFRAMES = (5, 10, 15, 30, 60, 120, 300, 600, 900, 1800, 3600, 7200, 14400, 86400)
+DEFAULT_HISTORY = 500
+
+
+class CandleSeries(object):
+    """Class for the candles of one asset and timeframe built tick by tick.
+
+    Candles use the ``process_tick`` layout plus ``ticks``, the number of
+    ticks folded into the candle, which is the only volume Quotex reports.
+    """
+
+    def __init__(self, asset, timeframe, history=DEFAULT_HISTORY):
+        """
+        :param str asset: The asset name.
+        :param int timeframe: The candle size in seconds.
+        :param int history: Number of closed candles kept.
+        """
+        self.asset = asset
+        self.timeframe = timeframe
+        self.current = None
+        self.history = deque(maxlen=history)
+
+    def update(self, timestamp, price):
+        """Fold a tick into the series.
+
+        :returns: The candle closed by this tick, or None.
+        """
+        start = int(timestamp // self.timeframe * self.timeframe)
+        candle = self.current
+        if candle is not None and start == candle["timestamp"]:
+            candle["close"] = price
+            if price > candle["high"]:
+                candle["high"] = price
+            elif price < candle["low"]:
+                candle["low"] = price
+            candle["ticks"] += 1
+            return None
+        if candle is not None and start < candle["timestamp"]:
+            # Late tick of a candle already closed.
+            return None
+        self.current = {
+            "symbol": self.asset,
+            "open": price,
+            "close": price,
+            "high": price,
+            "low": price,
+            "timestamp": start,
+            "ticks": 1
+        }
+        if candle is not None:
+            self.history.append(candle)
+        return candle
+
+    def candles(self, include_current=True):
+        """Return the closed candles, oldest first, and the one in progress."""
+        candles = list(self.history)
+        if include_current and self.current is not None:
+            candles.append(self.current)
+        return candles
+
+
+class CandleAggregator(object):
+    """Class to build candles of several timeframes from the tick stream.
+
+    Each tick is consumed once and updates every timeframe subscribed for
+    its asset. Listeners added with :meth:`add_listener` are called as
+    ``listener(asset, timeframe, candle)`` whenever a candle closes, update
+    listeners after every tick with the candle in progress.
+    """
+
+    def __init__(self, history=DEFAULT_HISTORY):
+        """
+        :param int history: Number of closed candles kept per timeframe.
+        """
+        self.history = history
+        self.series = {}
+        self.users = {}
+        self.listeners = []
+        self.update_listeners = []
+        self.__lock = threading.Lock()
+
+    def subscribe(self, asset, timeframes=TIMEFRAMES):
+        """Build candles of ``timeframes`` for an asset.
+
+        Every call counts as one user of each timeframe until :meth:`release`.
+
+        :param str asset: The asset name.
+        :param timeframes: An iterable of candle sizes in seconds, or one size.
+        """
+        if isinstance(timeframes, int):
+            timeframes = (timeframes,)
+        with self.__lock:
+            series = dict(self.series.get(asset, {}))
+            for timeframe in timeframes:
+                if timeframe not in series:
+                    series[timeframe] = CandleSeries(asset, timeframe, self.history)
+                key = (asset, timeframe)
+                self.users[key] = self.users.get(key, 0) + 1
+            self.series[asset] = series
+
+    def release(self, asset, timeframes=TIMEFRAMES):
+        """Undo one :meth:`subscribe`, dropping the timeframes nobody else uses."""
+        if isinstance(timeframes, int):
+            timeframes = (timeframes,)
+        unused = []
+        with self.__lock:
+            for timeframe in timeframes:
+                key = (asset, timeframe)
+                users = self.users.get(key, 0) - 1
+                if users > 0:
+                    self.users[key] = users
+                else:
+                    self.users.pop(key, None)
+                    unused.append(timeframe)
+        if unused:
+            self.unsubscribe(asset, unused)
+
+    def unsubscribe(self, asset, timeframes=None):
+        """Stop building candles of ``timeframes``, all of them by default,
+        whatever the number of users."""
+        with self.__lock:
+            if timeframes is None:
+                self.series.pop(asset, None)
+                self.users = {key: users for key, users in self.users.items() if key[0] != asset}
+                return
+            if isinstance(timeframes, int):
+                timeframes = (timeframes,)
+            for timeframe in timeframes:
+                self.users.pop((asset, timeframe), None)
+            series = {
+                timeframe: candles for timeframe, candles in self.series.get(asset, {}).items()
+                if timeframe not in timeframes
+            }
+            if series:
+                self.series[asset] = series
+            else:
+                self.series.pop(asset, None)
+
+    def timeframes(self, asset):
+        return sorted(self.series.get(asset, ()))
+
+    def update(self, asset, timestamp, price):
+        """Fold a tick into every timeframe subscribed for its asset."""
+        series = self.series.get(asset)
+        if not series:
+            return
+        for candles in series.values():
+            closed = candles.update(timestamp, price)
+            if closed is not None and self.listeners:
+                self.__notify(self.listeners, asset, candles.timeframe, closed)
+            if self.update_listeners:
+                self.__notify(self.update_listeners, asset, candles.timeframe, candles.current)
+
+    @staticmethod
+    def __notify(listeners, asset, timeframe, candle):
+        for listener in tuple(listeners):
+            try:
+                listener(asset, timeframe, candle)
+            except Exception:
+                logger.debug(f"Candle listener {listener!r} failed.", exc_info=True)
+
+    def current(self, asset, timeframe):
+        """Return the candle in progress, or None."""
+        series = self.series.get(asset, {}).get(timeframe)
+        return series.current if series else None
+
+    def candles(self, asset, timeframe, include_current=True):
+        """Return the candles of an asset and timeframe, oldest first."""
+        series = self.series.get(asset, {}).get(timeframe)
+        return series.candles(include_current) if series else []
+
+    def add_listener(self, listener):
+        """Call ``listener(asset, timeframe, candle)`` when a candle closes."""
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def add_update_listener(self, listener):
+        """Call ``listener(asset, timeframe, candle)`` after every tick."""
+        self.update_listeners.append(listener)
+
+    def remove_update_listener(self, listener):
+        if listener in self.update_listeners:
+            self.update_listeners.remove(listener)
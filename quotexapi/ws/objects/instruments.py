@@ -0,0 +1,85 @@
+"""Module for Quotex instruments websocket object."""
+import threading
+from quotexapi.ws.objects.base import Base
+
+
+class Instrument(object):
+    """Class for one row of ``instruments/list``.
+
+    The row is kept in ``raw``; the fields used by the client are read
+    once, with the name already cleaned of line breaks.
+    """
+
+    __slots__ = ("id", "symbol", "name", "payment", "turbo_payment", "is_open", "profit", "raw")
+
+    def __init__(self, row):
+        """
+        :param list row: The instrument as sent by the server.
+        """
+        self.id = row[0]
+        self.symbol = row[1]
+        self.name = str(row[2]).replace("\n", "")
+        self.payment = row[5]
+        self.is_open = row[14]
+        self.turbo_payment = row[18]
+        self.profit = {
+            "24H": row[-10],
+            "1M": row[-9],
+            "5M": row[-8]
+        }
+        self.raw = row
+
+    def __repr__(self):
+        return f"Instrument({self.symbol!r}, id={self.id!r}, open={self.is_open!r})"
+
+
+class InstrumentCatalog(Base):
+    """Class for the instruments indexed by symbol and by id.
+
+    Rebuilt as a whole on every ``instruments/list`` message, so lookups
+    never see a half updated catalog.
+    """
+
+    def __init__(self):
+        super(InstrumentCatalog, self).__init__()
+        self.__name = "instruments"
+        self.instruments = ()
+        self.symbols = {}
+        self.ids = {}
+        self.__lock = threading.Lock()
+
+    def update(self, rows):
+        """Rebuild the catalog from an ``instruments/list`` payload."""
+        instruments = tuple(Instrument(row) for row in rows or () if len(row) > 18)
+        symbols = {}
+        ids = {}
+        for instrument in instruments:
+            # The first row wins, as in the linear search
+            symbols.setdefault(instrument.symbol, instrument)
+            if instrument.id != "":
+                ids[instrument.id] = instrument
+        with self.__lock:
+            self.instruments = instruments
+            self.symbols = symbols
+            self.ids = ids
+
+    def get(self, symbol):
+        """Return the :class:`Instrument` of a symbol, or None."""
+        return self.symbols.get(symbol)
+
+    def by_id(self, instrument_id):
+        """Return the :class:`Instrument` of a numeric id, or None."""
+        return self.ids.get(instrument_id)
+
+    def codes(self):
+        """Return the ids by symbol of the instruments with an id."""
+        return {instrument.symbol: instrument.id for instrument in self.ids.values()}
+
+    def __iter__(self):
+        return iter(self.instruments)
+
+    def __len__(self):
+        return len(self.instruments)
+
+    def __contains__(self, symbol):
+        return symbol in self.symbols
@@ -0,0 +1,145 @@
+"""Module for Quotex realtime ticks websocket object."""
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DEFAULT_CAPACITY = 10000
+
+
+class TickBuffer(object):
+    """Class for a fixed-capacity ring buffer of realtime ticks.
+
+    Timestamps and prices live in two preallocated ``array('d')`` columns,
+    so appending never allocates and the oldest ticks are overwritten once
+    the buffer is full. Ticks older than ``max_age`` seconds, relative to
+    the newest one, are dropped as well.
+
+    Indexing keeps the list-of-dicts interface of ``realtime_price``:
+    ``buffer[-1]`` returns ``{"time": ..., "price": ...}``. Column reads
+    (:meth:`last`, :meth:`between`) return NumPy arrays when NumPy is
+    installed and ``array('d')`` otherwise. Contiguous NumPy results are
+    views over the live storage, copy them to keep them past later appends.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, max_age=None):
+        """
+        :param int capacity: Maximum number of ticks kept.
+        :param float max_age: (optional) Maximum age in seconds of the ticks kept.
+        """
+        if capacity < 1:
+            raise ValueError("The capacity must be positive.")
+        self.capacity = capacity
+        self.max_age = max_age
+        self.times = array("d", bytes(8 * capacity))
+        self.prices = array("d", bytes(8 * capacity))
+        self.start = 0
+        self.size = 0
+
+    def append(self, timestamp, price):
+        """Add a tick, overwriting the oldest one when full.
+
+        :param float timestamp: The tick timestamp in seconds.
+        :param float price: The tick price.
+        """
+        capacity = self.capacity
+        if self.size == capacity:
+            end = self.start
+            self.start = (self.start + 1) % capacity
+        else:
+            end = (self.start + self.size) % capacity
+            self.size += 1
+        self.times[end] = timestamp
+        self.prices[end] = price
+        if self.max_age is not None:
+            self.__expire(timestamp - self.max_age)
+
+    def __expire(self, oldest):
+        times = self.times
+        while self.size > 1 and times[self.start] < oldest:
+            self.start = (self.start + 1) % self.capacity
+            self.size -= 1
+
+    def clear(self):
+        self.start = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __position(self, index):
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("tick index out of range")
+        return (self.start + index) % self.capacity
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.size))]
+        position = self.__position(index)
+        return {
+            "time": self.times[position],
+            "price": self.prices[position]
+        }
+
+    def __iter__(self):
+        times, prices, capacity = self.times, self.prices, self.capacity
+        for i in range(self.size):
+            position = (self.start + i) % capacity
+            yield {"time": times[position], "price": prices[position]}
+
+    def __repr__(self):
+        return f"<TickBuffer size={self.size} capacity={self.capacity}>"
+
+    @property
+    def latest(self):
+        """The newest tick as a dict, or None when empty."""
+        return self[-1] if self.size else None
+
+    def last(self, count=None):
+        """Return the newest ``count`` ticks as ``(times, prices)`` columns.
+
+        :param int count: (optional) Number of ticks, all of them by default.
+        """
+        count = self.size if count is None else max(0, min(count, self.size))
+        return self.__columns(self.size - count, self.size)
+
+    def between(self, start=None, end=None):
+        """Return the ticks with ``start <= time <= end`` as ``(times, prices)``.
+
+        :param float start: (optional) The first timestamp included.
+        :param float end: (optional) The last timestamp included.
+        """
+        first = 0 if start is None else self.__bisect(start, False)
+        last = self.size if end is None else self.__bisect(end, True)
+        return self.__columns(first, max(first, last))
+
+    def __bisect(self, timestamp, right):
+        times, capacity, start = self.times, self.capacity, self.start
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            value = times[(start + middle) % capacity]
+            if value < timestamp or (right and value == timestamp):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def __columns(self, first, last):
+        return self.__column(self.times, first, last), self.__column(self.prices, first, last)
+
+    def __column(self, column, first, last):
+        begin = (self.start + first) % self.capacity
+        count = last - first
+        if np is not None:
+            data = np.frombuffer(column, dtype=np.float64)
+            if begin + count <= self.capacity:
+                return data[begin:begin + count]
+            return np.concatenate((data[begin:], data[:begin + count - self.capacity]))
+        if begin + count <= self.capacity:
+            return column[begin:begin + count]
+        return column[begin:] + column[:begin + count - self.capacity]
@@ -0,0 +1,139 @@
+"""Module for Quotex websocket request/response correlation."""
+import asyncio
+import threading
+from collections import OrderedDict
+
+
+class PendingRequests(object):
+    """Class to correlate websocket responses with the coroutines awaiting them.
+
+    Waiters are grouped by event name (the outbound event, e.g. ``orders/open``)
+    and keyed by whatever the server echoes back (``requestId``, ticket, asset,
+    index...). Responses that carry no usable key resolve the oldest waiter of
+    the event, which matches the order the server answers requests in.
+
+    With a ``latency`` tracker, waiters keyed on a request that was sent
+    and that give up are counted as timeouts of its event; the latencies
+    themselves are stamped when the request is written and when its
+    response is dispatched, see :class:`LatencyTracker
+    <quotexapi.ws.latency.LatencyTracker>`.
+    """
+
+    def __init__(self, latency=None):
+        """
+        :param latency: (optional) The instance of :class:`LatencyTracker
+            <quotexapi.ws.latency.LatencyTracker>`.
+        """
+        self.latency = latency
+        self.__waiters = {}
+        self.__lock = threading.Lock()
+
+    def create(self, event, key=None):
+        """Register a waiter for a response.
+
+        Must be called from the event loop, before the request is sent.
+
+        :param str event: The event name the response belongs to.
+        :param key: (optional) The correlation key echoed by the server.
+        :returns: The instance of :class:`asyncio.Future`.
+        """
+        future = asyncio.get_running_loop().create_future()
+        with self.__lock:
+            waiters = self.__waiters.setdefault(event, OrderedDict())
+            waiters.setdefault(key, []).append(future)
+        return future
+
+    def discard(self, event, future):
+        """Forget a waiter, e.g. after it timed out.
+
+        :returns: The key the waiter was registered under, or None.
+        """
+        with self.__lock:
+            waiters = self.__waiters.get(event, {})
+            for key, futures in list(waiters.items()):
+                if future in futures:
+                    futures.remove(future)
+                    if not futures:
+                        del waiters[key]
+                    return key
+        return None
+
+    def resolve(self, event, key=None, value=None, fallback=True):
+        """Resolve the waiters of an event registered under ``key``.
+
+        Safe to call from the websocket thread.
+
+        :param str event: The event name the response belongs to.
+        :param key: (optional) The correlation key found in the response.
+        :param value: The response to hand over to the waiters.
+        :param bool fallback: Resolve the oldest waiter when ``key`` is unknown.
+        :returns: True if at least one waiter was resolved.
+        """
+        if not self.__waiters.get(event):
+            return False
+        with self.__lock:
+            waiters = self.__waiters.get(event)
+            if not waiters:
+                return False
+            if key in waiters:
+                futures = waiters.pop(key)
+            elif fallback:
+                _, futures = waiters.popitem(last=False)
+            else:
+                return False
+        for future in futures:
+            self.__set_result(future, value)
+        return bool(futures)
+
+    def resolve_all(self, event, value=None):
+        """Resolve every waiter of an event with the same value."""
+        with self.__lock:
+            waiters = self.__waiters.pop(event, {})
+        for futures in waiters.values():
+            for future in futures:
+                self.__set_result(future, value)
+        return bool(waiters)
+
+    def has_waiters(self, event):
+        return bool(self.__waiters.get(event))
+
+    def __len__(self):
+        with self.__lock:
+            return sum(len(futures) for waiters in self.__waiters.values() for futures in waiters.values())
+
+    async def wait(self, event, future, timeout=None):
+        """Wait for a waiter created with :meth:`create`.
+
+        :param str event: The event name used to create the waiter.
+        :param future: The instance of :class:`asyncio.Future`.
+        :param timeout: (optional) Seconds to wait before giving up.
+        :returns: The response value.
+        :raises asyncio.TimeoutError: If no response arrived in time.
+        """
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            key = self.discard(event, future)
+            if self.latency is not None and key is not None:
+                self.latency.timeout(key)
+            raise
+        finally:
+            self.discard(event, future)
+
+    @staticmethod
+    def __set_result(future, value):
+        def set_result():
+            if not future.done():
+                future.set_result(value)
+
+        loop = future.get_loop()
+        if loop.is_closed():
+            return
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is loop:
+            set_result()
+        else:
+            loop.call_soon_threadsafe(set_result)
@@ -0,0 +1,205 @@
+"""Module for Quotex websocket outbound queues."""
+import queue
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future
+from .latency import request_key
+from .dispatcher import decode
+from ..metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH = 64
+
+
+def complete(batch, error=None):
+    """Resolve the futures of a flushed batch."""
+    for _, future in batch:
+        if future.done():
+            continue
+        if error is None:
+            future.set_result(True)
+        else:
+            future.set_exception(error)
+
+
+def written(batch):
+    """Count a successful socket write."""
+    if metrics.enabled:
+        metrics.inc("ws_writes_total")
+        metrics.inc("ws_messages_sent_total", sum(len(messages) for messages, _ in batch))
+
+
+def stamp(batch, latency):
+    """Stamp the requests of a batch right before it is written.
+
+    :returns: The stamps, to forget with ``latency.unsent`` if the write fails.
+    """
+    if latency is None:
+        return ()
+    stamps = []
+    for messages, _ in batch:
+        for message in messages:
+            request = outbound_request(message)
+            if request is not None:
+                stamps.append(latency.sent(*request))
+    return stamps
+
+
+def outbound_request(message):
+    """Return the event name and correlation key of a ``42["event",...]``
+    message, or None for anything else."""
+    if not isinstance(message, str) or not message.startswith('42["'):
+        return None
+    try:
+        packet = decode(message[2:])
+    except ValueError:
+        return None
+    return packet[0], request_key(packet[1] if len(packet) > 1 else None)
+
+
+def unstamp(stamps, latency):
+    for request in stamps:
+        latency.unsent(request)
+
+
+class SendQueue(object):
+    """Class for the outbound queue of the threaded websocket transport.
+
+    Callers enqueue without blocking; a single writer thread drains every
+    message queued meanwhile and hands them to ``write`` as one batch, so
+    bursts go out back to back without a wakeup per message.
+    """
+
+    def __init__(self, write, max_batch=MAX_BATCH, latency=None):
+        """
+        :param write: A callable receiving a list of messages to write.
+        :param int max_batch: Maximum number of queued items per write.
+        :param latency: (optional) The instance of :class:`LatencyTracker
+            <quotexapi.ws.latency.LatencyTracker>` stamping each request before it is written.
+        """
+        self.write = write
+        self.max_batch = max_batch
+        self.latency = latency
+        self.queue = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    @property
+    def depth(self):
+        """Number of items waiting to be written."""
+        return self.queue.qsize()
+
+    def put(self, messages):
+        """Enqueue messages to be written together.
+
+        :param list messages: The websocket messages.
+        :returns: The instance of :class:`concurrent.futures.Future`
+            resolved once the messages are flushed to the socket.
+        """
+        future = Future()
+        self.queue.put((messages, future))
+        return future
+
+    def stop(self):
+        """Stop the writer once the queued messages are flushed."""
+        self.queue.put(None)
+
+    def run(self):
+        stopping = False
+        while not stopping:
+            item = self.queue.get()
+            if item is None:
+                break
+            batch = [item]
+            while len(batch) < self.max_batch:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            stamps = stamp(batch, self.latency)
+            try:
+                self.write([message for messages, _ in batch for message in messages])
+            except Exception as error:
+                logger.debug(f"Failed to send websocket messages: {error}")
+                metrics.inc("ws_write_errors_total")
+                unstamp(stamps, self.latency)
+                complete(batch, error)
+            else:
+                complete(batch)
+                written(batch)
+
+
+class AsyncSendQueue(object):
+    """Class for the outbound queue of the asyncio websocket transport.
+
+    Messages queued during one iteration of the event loop are written
+    together by a single flush scheduled on the loop.
+    """
+
+    def __init__(self, write, loop, latency=None):
+        """
+        :param write: A callable receiving a list of messages to write.
+        :param loop: The event loop owning the connection.
+        :param latency: (optional) The instance of :class:`LatencyTracker
+            <quotexapi.ws.latency.LatencyTracker>` stamping each request before it is written.
+        """
+        self.write = write
+        self.loop = loop
+        self.latency = latency
+        self.items = deque()
+        self.scheduled = False
+        self.__thread_id = threading.get_ident()
+
+    @property
+    def depth(self):
+        """Number of items waiting to be written."""
+        return len(self.items)
+
+    def put(self, messages):
+        """Enqueue messages to be written together. Safe from any thread.
+
+        :param list messages: The websocket messages.
+        :returns: The instance of :class:`concurrent.futures.Future`
+            resolved once the messages are flushed to the transport.
+        """
+        future = Future()
+        self.items.append((messages, future))
+        if threading.get_ident() == self.__thread_id:
+            self.schedule()
+        else:
+            self.loop.call_soon_threadsafe(self.schedule)
+        return future
+
+    def stop(self):
+        if self.items:
+            self.flush()
+
+    def schedule(self):
+        if not self.scheduled:
+            self.scheduled = True
+            self.loop.call_soon(self.flush)
+
+    def flush(self):
+        self.scheduled = False
+        batch = []
+        while self.items:
+            batch.append(self.items.popleft())
+        if not batch:
+            return
+        stamps = stamp(batch, self.latency)
+        try:
+            self.write([message for messages, _ in batch for message in messages])
+        except Exception as error:
+            logger.debug(f"Failed to send websocket messages: {error}")
+            metrics.inc("ws_write_errors_total")
+            unstamp(stamps, self.latency)
+            complete(batch, error)
+        else:
+            complete(batch)
+            written(batch)
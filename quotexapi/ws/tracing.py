@@ -0,0 +1,76 @@
+"""Module for Quotex realtime ticks latency tracing."""
+import time
+from .latency import LatencyTracker
+
+STAGES = ("server", "decode", "dispatch", "store", "delivery")
+
+
+class TickTracer(object):
+    """Class to time each stage a tick goes through until it is consumed.
+
+    The websocket client marks every frame when it is received and
+    decoded; the ``quotes/stream`` handler marks when the handler starts
+    and once the ticks are stored. Only tick frames are recorded:
+
+    - ``server``: local receive time minus the tick timestamp, which also
+      includes the clock offset with the server.
+    - ``decode``: parsing the frame.
+    - ``dispatch``: routing the frame to the handler.
+    - ``store``: updating the tick buffers and candle aggregator.
+    - ``delivery``: from receive until a consumer calls :meth:`delivered`
+      for the asset, counted once per frame.
+    """
+
+    def __init__(self, precision=None):
+        """
+        :param float precision: (optional) Relative width of the histogram buckets.
+        """
+        self.latency = LatencyTracker() if precision is None else LatencyTracker(precision)
+        self.received = {}
+        self.frame = None
+        self.decode = None
+        self.dispatch = None
+        self.wall = None
+
+    def receive(self):
+        """Mark a frame received, on the websocket thread."""
+        self.frame = time.perf_counter()
+        self.wall = time.time()
+
+    def decoded(self):
+        self.decode = time.perf_counter()
+
+    def dispatched(self):
+        self.dispatch = time.perf_counter()
+
+    def stored(self, ticks):
+        """Record the stages of a ``quotes/stream`` frame once its ticks are stored."""
+        now = time.perf_counter()
+        frame = self.frame
+        if frame is None or self.decode is None or self.dispatch is None:
+            return
+        record = self.latency.record
+        record("decode", self.decode - frame)
+        record("dispatch", self.dispatch - self.decode)
+        record("store", now - self.dispatch)
+        for tick in ticks:
+            record("server", self.wall - tick[1])
+            self.received[tick[0]] = frame
+        self.frame = self.decode = self.dispatch = None
+
+    def delivered(self, asset):
+        """Mark the last frame of an asset observed by a consumer."""
+        frame = self.received.pop(asset, None)
+        if frame is not None:
+            self.latency.record("delivery", time.perf_counter() - frame)
+
+    def stats(self, stage=None):
+        """Return the stats of a stage, or of every stage by name, in seconds."""
+        return self.latency.stats(stage)
+
+    def summary(self):
+        return self.latency.summary()
+
+    def reset(self):
+        self.latency.reset()
+        self.received.clear()